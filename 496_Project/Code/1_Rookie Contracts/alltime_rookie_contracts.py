@@ -7,28 +7,46 @@ Description:
 This script fetches NBA rookie contract extension data for all-time from the Spotrac website
 (https://www.spotrac.com/nba/contracts/extensions/_/year/all-time/sort/type) and parses the relevant information
 from the HTML. It outputs the data to the console with color formatting for contract types and creates a CSV file
-('rooks_all_time.csv') with the gathered data.
+('rooks_all_time.csv') with the gathered data, plus a typed Parquet copy ('rooks_all_time.parquet') for the analysis scripts.
 
 Instructions:
-- This script requires the 'requests' and 'beautifulsoup4' libraries.
+- This script requires the 'requests', 'beautifulsoup4', 'lxml', 'pandas' and 'pyarrow' libraries.
 - You can install them using:
     pip install requests
     pip install beautifulsoup4
+    pip install lxml
+    pip install pandas
+    pip install pyarrow
+- It imports the shared Spotrac helpers (fetching, draft years, console colors and the CSV writer) from
+  spotrac_client.py, which must stay in the same directory.
 """
 
 import requests
-import time
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
-import csv
+from spotrac_client import (TABLE_STRAINER, conditional_get, store_cache_entry, scrape_draft_year_from_spotrac,
+                            format_contract_with_color, open_csv_sink)
+import pandas as pd
 
+# Number of player pages fetched concurrently (the overall request rate is limited in spotrac_client.py)
+MAX_WORKERS = 8
 
-def fetch_all_time_extension_data(delay=2):
+# Number of scraped rows collected before they are written to the console in one call
+OUTPUT_BATCH = 64
+
+# Translation table that deletes currency symbols and thousands separators in one C-level pass
+MONEY_CHARS = str.maketrans('', '', '$,')
+
+def fetch_all_time_extension_data(max_workers=MAX_WORKERS, write_row=None):
     """
     Fetches NBA rookie contract extension data for all-time from Spotrac, including headers, and appends the data to a list.
-    Also, scrapes the player's draft year (YR_1) from each player's hyperlink in Spotrac.
+    Also, scrapes the player's draft year (YR_1) from each player's hyperlink in Spotrac. Player pages are fetched
+    concurrently through a thread pool, with the shared rate limiter keeping the overall request rate polite.
 
     Args:
-    - delay (int): Time to wait (in seconds) between requests to avoid being blocked.
+    - max_workers (int): Number of player pages to fetch concurrently.
+    - write_row (function): Optional CSV sink (see open_csv_sink) that each row is streamed to as soon as it is complete.
 
     Returns:
     - contract_data (list): A list of lists, each containing player contract data for all-time.
@@ -37,12 +55,20 @@ def fetch_all_time_extension_data(delay=2):
     contract_data = []
 
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-
+        # Reuse the cached table HTML when Spotrac reports the page has not changed since the last run
+        response, cached = conditional_get(url)
+        if response.status_code == 304 and cached:
+            html = cached['value']
+        else:
+            response.raise_for_status()
+            html = response.text
+            store_cache_entry(url, response, html)
+
+        soup = BeautifulSoup(html, 'lxml', parse_only=TABLE_STRAINER)
+
+        # Only rows carrying a contract-type cell hold contract data
         table = soup.find('table')
-        rows = table.find_all('tr') if table else []
+        rows = table.select('tr:has(> td.contract-type)') if table else []
 
         print("--- All-Time Rookie Contract Extensions ---\n")
 
@@ -51,31 +77,51 @@ def fetch_all_time_extension_data(delay=2):
         print(headers)
         print()  # Add a blank line before data starts printing
 
-        if rows:
-            for row in rows:
-                contract_type_cell = row.find('td', class_='contract-type')
-                if contract_type_cell and 'rookie' in contract_type_cell.get_text().lower():
-                    columns = row.find_all('td')
-                    data = [col.get_text(strip=True) for col in columns]
-
-                    player_link = row.find('a', class_='link')
-                    if player_link:
-                        player_url = player_link['href']
-                        if player_url.startswith('/'):
-                            full_player_url = f'https://www.spotrac.com{player_url}'
-                        else:
-                            full_player_url = player_url
-
-                        draft_year = scrape_draft_year_from_spotrac(full_player_url)
-                        data.insert(0, draft_year if draft_year else "N/A")
-
-                    contract_data.append(data)
-
-                    # Print contract with appropriate color formatting
-                    print_contract_with_color(data, contract_type_cell.get_text().strip().lower())
-
-                    # Sleep between requests to avoid overloading Spotrac's server
-                    time.sleep(delay)
+        # Collect the rookie rows and their player URLs first so the player pages can be fetched concurrently
+        rookie_rows = []
+        player_urls = []
+        for row in rows:
+            contract_type_cell = row.select_one('td.contract-type')
+            if contract_type_cell and 'rookie' in contract_type_cell.get_text().lower():
+                columns = row.find_all('td')
+                data = [col.get_text(strip=True) for col in columns]
+                contract_type = contract_type_cell.get_text().strip().lower()
+                rookie_rows.append((data, contract_type))
+
+                player_link = row.select_one('a.link')
+                if player_link:
+                    player_url = player_link['href']
+                    if player_url.startswith('/'):
+                        player_urls.append(f'https://www.spotrac.com{player_url}')
+                    else:
+                        player_urls.append(player_url)
+                else:
+                    player_urls.append(None)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            draft_years = executor.map(
+                lambda player_url: scrape_draft_year_from_spotrac(player_url) if player_url else None,
+                player_urls
+            )
+
+            # Stitch the draft years back onto their rows in the original table order as they arrive
+            out_buf = []
+            for (data, contract_type), player_url, draft_year in zip(rookie_rows, player_urls, draft_years):
+                if player_url:
+                    data.insert(0, draft_year if draft_year else "N/A")
+
+                contract_data.append(data)
+                if write_row:
+                    write_row(data)
+
+                # Queue the contract with appropriate color formatting, writing the console output in batches
+                out_buf.append(format_contract_with_color(data, contract_type))
+                if len(out_buf) >= OUTPUT_BATCH:
+                    sys.stdout.write('\n'.join(out_buf) + '\n')
+                    out_buf.clear()
+
+            if out_buf:
+                sys.stdout.write('\n'.join(out_buf) + '\n')
 
         if not contract_data:
             print("No rookie contract extensions found for the all-time period.")
@@ -85,71 +131,56 @@ def fetch_all_time_extension_data(delay=2):
 
     return contract_data
 
-def scrape_draft_year_from_spotrac(player_url):
+def create_csv(data, filename='rooks_all_time.csv'):
     """
-    Scrapes the player's draft year from their Spotrac page.
+    Writes the fetched contract data to a CSV file.
 
     Args:
-    - player_url (str): The URL of the player's Spotrac page.
+    - data (list): The contract data to write to the CSV.
+    - filename (str): The name of the CSV file.
 
     Returns:
-    - draft_year (str): The draft year extracted from the player's page, or None if not found.
-    """
-    try:
-        player_response = requests.get(player_url)
-        player_response.raise_for_status()
-        player_soup = BeautifulSoup(player_response.text, 'html.parser')
-
-        divs = player_soup.find_all('div', class_='col-md-12 text-white')
-
-        for div in divs:
-            if 'Drafted:' in div.get_text():
-                draft_span = div.find('span', class_='text-yellow')
-                if draft_span:
-                    draft_info = draft_span.get_text(strip=True)
-                    draft_year = draft_info.split(',')[-1].strip()
-                    return draft_year
-        return None
-
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching player data from URL: {e}")
-        return None
-
-def print_contract_with_color(data, contract_type):
+    - None
     """
-    Prints contract data with color formatting based on the type of contract.
+    with open_csv_sink(filename) as write_row:
+        for row in data:
+            write_row(row)
 
-    Args:
-    - data (list): A list of contract data.
-    - contract_type (str): The type of contract (used for color-coding).
-    """
-    if 'rookie maximum extension' in contract_type.replace('-', ' '):
-        print(f"\033[92m{data}\033[0m")  # Green for Rookie Maximum Extension
-    elif 'designated rookie extension' in contract_type:
-        print(f"\033[93m{data}\033[0m")  # Yellow for Designated Rookie Extension
-    elif 'rookie extension' in contract_type:
-        print(f"\033[91m{data}\033[0m")  # Red for Rookie Extension
-    else:
-        print(data)  # Default print for other contract types
+# Strings pd.read_csv treats as missing by default
+CSV_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>',
+                 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
 
-def create_csv(data, filename='rooks_all_time.csv'):
+def create_parquet(data, filename='rooks_all_time.parquet'):
     """
-    Writes the fetched contract data to a CSV file.
+    Writes the fetched contract data to a Parquet file with the money columns already converted to numbers,
+    so the analysis scripts can load a typed frame instead of re-parsing the CSV and its currency strings.
 
     Args:
-    - data (list): The contract data to write to the CSV.
-    - filename (str): The name of the CSV file.
+    - data (list): The contract data to write to the Parquet file.
+    - filename (str): The name of the Parquet file.
 
     Returns:
     - None
     """
     headers = ['YR_1', 'Rank', 'Player', 'Pos', 'Team Signed With', 'Age At Signing', 'Yrs', 'Value', 'AAV', 'Practical GTD', 'Type']
+    df = pd.DataFrame(data, columns=headers)
 
-    with open(filename, mode='w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(headers)
-        writer.writerows(data)
+    for column in ['Value', 'AAV', 'Practical GTD']:
+        df[column] = pd.to_numeric(df[column].str.translate(MONEY_CHARS), errors='coerce')
+
+    # Give the remaining columns the same types pd.read_csv would infer: placeholders such as the "N/A" written for an
+    # unknown draft year become NaN (a float column, as in the CSV) instead of leaving the whole column as text
+    for column in ['YR_1', 'Age At Signing', 'Yrs']:
+        df[column] = pd.to_numeric(df[column], errors='coerce')
+
+    # 'Rank' stays text when it has ties like 'T5', just as read_csv leaves it; only its missing markers become NaN
+    rank = df['Rank'].mask(df['Rank'].isin(CSV_NA_VALUES))
+    try:
+        df['Rank'] = pd.to_numeric(rank)
+    except (ValueError, TypeError):
+        df['Rank'] = rank
 
+    df.to_parquet(filename, compression='zstd')
     print(f"Data has been written to {filename}")
 
 def main():
@@ -157,11 +188,12 @@ def main():
     Main function to fetch NBA rookie contract extension data for the all-time period
     and create a CSV file. It also prints the data with color formatting to the console.
     """
-    # Fetch all-time rookie extension data
-    all_data = fetch_all_time_extension_data()
+    # Fetch all-time rookie extension data, streaming each row into the CSV file as it is scraped
+    with open_csv_sink('rooks_all_time.csv') as write_row:
+        all_data = fetch_all_time_extension_data(write_row=write_row)
 
-    # Create the CSV file with the fetched data
-    create_csv(all_data)
+    # Save a typed copy for the analysis scripts
+    create_parquet(all_data)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -16,19 +16,36 @@ import matplotlib
 # Use a non-interactive backend to ensure plots are saved as images
 matplotlib.use('Agg')
 
+# Translation table that deletes currency symbols and thousands separators in one C-level pass
+MONEY_CHARS = str.maketrans('', '', '$,')
+
+# Numeric columns of the rookie contract schema ('Rank' can be text when a file has ties such as 'T5')
+NUMERIC_COLS = ('YR_1', 'Rank', 'Age At Signing', 'Yrs', 'Value', 'AAV', 'Practical GTD')
+
+def _strip_money(series):
+    """Strip '$' and ',' from a money column and convert it to numeric values, forcing errors to NaN."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    return pd.to_numeric(series.astype(str).str.translate(MONEY_CHARS), errors='coerce')
+
 def clean_currency_columns(data, columns):
     """Convert currency columns from strings to numeric values, ignoring non-numeric entries."""
     for column in columns:
         if column in data.columns:
-            data[column] = data[column].replace(r'[\$,]', '', regex=True)
-            # Convert to numeric, forcing errors to NaN
-            data[column] = pd.to_numeric(data[column], errors='coerce')
+            data[column] = _strip_money(data[column])
     return data
 
 def load_data(file_path):
-    """Load rookie contract data from a CSV file."""
+    """
+    Load rookie contract data, preferring the typed Parquet copy when it is at least as new as the CSV.
+    Columns are Arrow-backed so text columns like 'Pos' and 'Type' sort and count without boxing Python strings.
+    """
+    parquet_path = os.path.splitext(file_path)[0] + '.parquet'
     try:
-        data = pd.read_csv(file_path)
+        if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path):
+            data = pd.read_parquet(parquet_path, dtype_backend='pyarrow')
+        else:
+            data = pd.read_csv(file_path, engine='pyarrow', dtype_backend='pyarrow')
         print(f"Data loaded successfully. {len(data)} rows and {len(data.columns)} columns.")
         print(f"Columns in dataset: {data.columns}")  # Debug print
         return data
@@ -44,32 +61,46 @@ def top_values(data, column, top_n=10):
     top_data = data.sort_values(by=column, ascending=False).head(top_n)
     return top_data
 
-def plot_metric_distribution(data, metric, output_dir, top_n=10):
-    """Plot the distribution of a specific metric, display top values, and save the plot."""
+def plot_metric_distribution(data, metric, output_dir, top_n=10, ax=None):
+    """
+    Plot the distribution of a specific metric, display top values, and save the plot into output_dir, which must
+    already exist. If an Axes is given it is cleared and reused instead of creating a new Figure.
+    """
     if metric not in data.columns:
         print(f"Metric '{metric}' not found in data.")
         return
 
+    # Skip columns with nothing to plot (e.g. scraped 'N/A' strings that all coerced to NaN)
+    values = data[metric].dropna()
+    if len(values) < 2:
+        print(f"Skipping {metric}: insufficient data")
+        return
+
     # Display top N rows for the metric
     top_data = top_values(data, metric, top_n)
     print(f"\nTop {top_n} values for {metric}:")
     if top_data is not None:
         print(top_data[[metric]])
 
-    # Ensure the output directory exists
-    os.makedirs(output_dir, exist_ok=True)
-
     # Plot the metric distribution
     try:
-        plt.figure(figsize=(8, 6))
-        data[metric].dropna().plot(kind='hist', bins=20, title=f"Distribution of {metric}")
-        plt.xlabel(metric)
-        plt.ylabel("Frequency")
-        plt.title(f"Distribution of {metric}")
-        plt.grid(axis='y', alpha=0.75)
-        plt.savefig(f"{output_dir}/{metric}_distribution.png")  # Save the plot
+        own_figure = ax is None
+        if own_figure:
+            fig, ax = plt.subplots(figsize=(8, 6))
+        else:
+            fig = ax.figure
+            ax.clear()
+
+        values.plot(kind='hist', bins=20, ax=ax)
+        ax.set_xlabel(metric)
+        ax.set_ylabel("Frequency")
+        ax.set_title(f"Distribution of {metric}")
+        ax.grid(axis='y', alpha=0.75)
+        fig.savefig(f"{output_dir}/{metric}_distribution.png")  # Save the plot
         print(f"Distribution plot for {metric} saved to {output_dir}/{metric}_distribution.png")
-        plt.close()
+
+        if own_figure:
+            plt.close(fig)
     except Exception as e:
         print(f"Error while plotting metric distribution for {metric}: {e}")
 
@@ -79,43 +110,55 @@ def plot_positional_distribution(data, position_column, output_dir):
         print(f"Position column '{position_column}' not found in data.")
         return
 
+    if data[position_column].count() < 2:
+        print(f"Skipping {position_column}: insufficient data")
+        return
+
     # Print positional statistics
     position_counts = data[position_column].value_counts()
     print("\nPositional Distribution:")
     print(position_counts)
 
-    # Ensure the output directory exists
-    os.makedirs(output_dir, exist_ok=True)
+    # Both charts are drawn on the same Figure, which is resized and cleared between them
+    fig, ax = plt.subplots(figsize=(8, 6))
 
     # Plot the positional distribution as a bar chart
     try:
-        plt.figure(figsize=(8, 6))
-        position_counts.plot(kind='bar', color='lightblue', edgecolor='black', title="Positional Distribution (Bar Chart)")
-        plt.xlabel("Position")
-        plt.ylabel("Count")
-        plt.grid(axis='y', alpha=0.75)
-        plt.savefig(f"{output_dir}/positional_distribution_bar.png")  # Save the bar chart
+        position_counts.plot(kind='bar', color='lightblue', edgecolor='black', title="Positional Distribution (Bar Chart)", ax=ax)
+        ax.set_xlabel("Position")
+        ax.set_ylabel("Count")
+        ax.grid(axis='y', alpha=0.75)
+        fig.savefig(f"{output_dir}/positional_distribution_bar.png")  # Save the bar chart
         print(f"Positional distribution bar chart saved to {output_dir}/positional_distribution_bar.png")
-        plt.close()
     except Exception as e:
         print(f"Error while plotting positional distribution as a bar chart: {e}")
 
     # Plot the positional distribution as a pie chart
     try:
-        plt.figure(figsize=(8, 8))
-        position_counts.plot(kind='pie', autopct='%1.1f%%', startangle=90, colormap="tab20", title="Positional Distribution (Pie Chart)")
-        plt.ylabel('')  # Hide the y-label for better aesthetics
-        plt.title("Positional Distribution (Pie Chart)", fontsize=16)
-        plt.savefig(f"{output_dir}/positional_distribution_pie.png")  # Save the pie chart
+        ax.clear()
+        fig.set_size_inches(8, 8)
+        position_counts.plot(kind='pie', autopct='%1.1f%%', startangle=90, colormap="tab20", ax=ax)
+        ax.set_ylabel('')  # Hide the y-label for better aesthetics
+        ax.set_title("Positional Distribution (Pie Chart)", fontsize=16)
+        fig.savefig(f"{output_dir}/positional_distribution_pie.png")  # Save the pie chart
         print(f"Positional distribution pie chart saved to {output_dir}/positional_distribution_pie.png")
-        plt.close()
     except Exception as e:
         print(f"Error while plotting positional distribution as a pie chart: {e}")
+    finally:
+        plt.close(fig)
 
 def analyze_all_features(data, numeric_columns, output_dir, top_n=10):
-    """Analyze all numeric features in the dataset."""
-    for metric in numeric_columns:
-        plot_metric_distribution(data, metric, output_dir, top_n)
+    """Analyze all numeric features in the dataset, reusing a single Figure for every histogram."""
+    if len(numeric_columns) == 0:
+        print("No numeric columns to analyze.")
+        return
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+    try:
+        for metric in numeric_columns:
+            plot_metric_distribution(data, metric, output_dir, top_n, ax=ax)
+    finally:
+        plt.close(fig)
 
 if __name__ == "__main__":
     input_file = "rooks_all_time.csv"
@@ -130,10 +173,14 @@ if __name__ == "__main__":
         currency_columns = ["Value", "AAV", "Practical GTD"]
         data = clean_currency_columns(data, currency_columns)
 
-        # Identify numeric columns
-        numeric_columns = data.select_dtypes(include=["float64", "int64"]).columns
+        # Identify numeric columns from the known schema instead of scanning every column's dtype
+        numeric_columns = [column for column in NUMERIC_COLS
+                           if column in data.columns and pd.api.types.is_numeric_dtype(data[column])]
         print(f"Numeric columns identified: {list(numeric_columns)}")
 
+        # Create the output directory once for every plot below
+        os.makedirs(output_directory, exist_ok=True)
+
         # Analyze all numeric features
         analyze_all_features(data, numeric_columns, output_dir=output_directory, top_n=10)
 
@@ -15,6 +15,8 @@ Instructions:
 """
 
 import os
+import sys
+import numpy as np
 import pandas as pd
 
 # Set pandas display options
@@ -24,6 +26,12 @@ pd.set_option('display.width', 1000)
 pd.set_option('display.colheader_justify', 'center')
 pd.set_option('display.max_colwidth', None)
 
+# Translation table that deletes currency symbols and thousands separators in one C-level pass
+MONEY_CHARS = str.maketrans('', '', '$,')
+
+# Columns holding dollar amounts, which are cleaned to numbers before sorting
+MONEY_COLUMNS = ('Value', 'AAV', 'Practical GTD')
+
 def display_key():
     """
     Display a numbered key for the headers for easier access, with notes about special money formats.
@@ -45,12 +53,21 @@ def display_key():
 
     return headers
 
+def _strip_money(series):
+    """
+    Strip '$' and ',' from a money column with str.translate and convert it to numeric values.
+    Columns that are already numeric are returned unchanged.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    return pd.to_numeric(series.astype(str).str.translate(MONEY_CHARS), errors='coerce')
+
 def clean_money_columns(df, column_name):
     """
     Clean columns that represent monetary values (e.g., 'Value', 'AAV', 'Practical GTD') by
     removing dollar signs and commas, and converting the column to numeric values.
     """
-    df[column_name] = pd.to_numeric(df[column_name].replace(r'[\$,]', '', regex=True), errors='coerce')
+    df[column_name] = _strip_money(df[column_name])
 
 def print_sorted_table_with_highlight(df, highlight_column):
     # Define the column order with 'Player' as the first column
@@ -71,27 +88,29 @@ def print_sorted_table_with_highlight(df, highlight_column):
         'Type': 30
     }
 
-    # Print the headers
-    headers = []
+    # Build one format template per call; the highlighted column gets the yellow escape codes baked in
+    header_fields = []
+    row_fields = []
     for col in column_order:
-        headers.append(f"{col:<{column_widths[col]}}")
-    print('   '.join(headers))
+        field = f"{{!s:<{column_widths[col]}}}"
+        header_fields.append(field)
+        row_fields.append(f"\033[93m{field}\033[0m" if col == highlight_column else field)
+    header_template = '   '.join(header_fields)
+    row_template = '   '.join(row_fields)
+
+    # Print the headers
+    lines = [header_template.format(*column_order)]
 
     # Print a separator
-    print('-' * (sum(column_widths.values()) + (len(column_widths) - 1) * 3))
-
-    # Print the rows
-    for index, row in df.iterrows():
-        row_data = []
-        for col in column_order:
-            # Highlight the chosen column in yellow
-            if col == highlight_column:
-                row_data.append(f"\033[93m{str(row[col]):<{column_widths[col]}}\033[0m")
-            else:
-                row_data.append(f"{str(row[col]):<{column_widths[col]}}")
-        print('   '.join(row_data))
+    lines.append('-' * (sum(column_widths.values()) + (len(column_widths) - 1) * 3))
+
+    # Print the rows, highlighting the chosen column in yellow
+    for row in df[column_order].itertuples(index=False, name=None):
+        lines.append(row_template.format(*row))
 
-def sort_and_categorize_players_by_column(df, column_number):
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def sort_and_categorize_players_by_column(df, column_number, counts_cache=None, cleaned_columns=None):
     """
     Sorts and categorizes players based on the chosen column (selected by the user).
     Handles monetary and non-monetary columns appropriately.
@@ -99,7 +118,14 @@ def sort_and_categorize_players_by_column(df, column_number):
     Args:
     - df (pandas.DataFrame): The dataframe containing player data.
     - column_number (int): The number corresponding to the selected column.
+    - counts_cache (dict): Value counts already computed for 'Pos', 'Age At Signing' and 'Yrs', reused across calls.
+    - cleaned_columns (set): Money columns of df that have already been converted to numbers.
     """
+    if counts_cache is None:
+        counts_cache = {}
+    if cleaned_columns is None:
+        cleaned_columns = set()
+
     # Map column numbers to column names in the DataFrame
     headers = {
         1: 'YR_1',
@@ -119,21 +145,32 @@ def sort_and_categorize_players_by_column(df, column_number):
         print("Invalid column number. Please try again.")
         return
 
-    # Check if the selected column is a monetary one
-    if column_name in ['Value', 'AAV', 'Practical GTD']:
+    # Check if the selected column is a monetary one that hasn't been cleaned yet this session
+    if column_name in MONEY_COLUMNS and column_name not in cleaned_columns:
         # Clean the monetary columns to remove currency symbols and convert to numeric values
         clean_money_columns(df, column_name)
+        cleaned_columns.add(column_name)
 
-    # Sort the dataframe by the selected column
-    df = df.sort_values(by=[column_name])
+    # Sort the dataframe by the selected column with a stable argsort on the underlying array
+    try:
+        order = np.argsort(df[column_name].to_numpy(), kind='stable')
+    except TypeError:
+        # Text columns with missing entries mix str and float, which NumPy cannot compare
+        order = np.argsort(df[column_name].astype(str).to_numpy(), kind='stable')
+    df = df.take(order)
 
     # Print the table sorted by the chosen column with 'Player' as the first column
     print_sorted_table_with_highlight(df, column_name)
 
+    # The counts only depend on the column, so compute them once per column and reuse them afterwards
+    if column_name in ('Pos', 'Age At Signing', 'Yrs') and column_name not in counts_cache:
+        counts = df[column_name].value_counts()
+        counts_cache[column_name] = counts if column_name == 'Pos' else counts.sort_index()
+
     # If sorting by 'Pos', calculate and display position counts with aligned output
     if column_name == 'Pos':
         print("\nPosition Counts:")
-        position_counts = df['Pos'].value_counts()
+        position_counts = counts_cache['Pos']
 
         # Find the longest position string for alignment purposes
         max_pos_length = max(len(pos) for pos in position_counts.index)
@@ -145,7 +182,7 @@ def sort_and_categorize_players_by_column(df, column_number):
     # If sorting by 'Age At Signing', calculate and display age counts with aligned output
     elif column_name == 'Age At Signing':
         print("\nAge At Signing Counts:")
-        age_counts = df['Age At Signing'].value_counts().sort_index()
+        age_counts = counts_cache['Age At Signing']
 
         # Find the longest age string for alignment purposes (in case of non-integer values)
         max_age_length = max(len(str(age)) for age in age_counts.index)
@@ -157,7 +194,7 @@ def sort_and_categorize_players_by_column(df, column_number):
     # If sorting by 'Yrs', calculate and display years counts with aligned output
     elif column_name == 'Yrs':
         print("\nYears (Yrs) Counts:")
-        yrs_counts = df['Yrs'].value_counts().sort_index()
+        yrs_counts = counts_cache['Yrs']
 
         # Find the longest year string for alignment purposes (in case of non-integer values)
         max_yrs_length = max(len(str(yrs)) for yrs in yrs_counts.index)
@@ -209,7 +246,12 @@ def main():
     # Read the selected CSV file
     script_dir = os.path.dirname(os.path.realpath(__file__))
     selected_file_path = os.path.join(script_dir, selected_file)
-    df = pd.read_csv(selected_file_path)
+    # Arrow-backed columns keep the text columns in contiguous buffers, which sorts and counts much faster
+    df = pd.read_csv(selected_file_path, engine='pyarrow', dtype_backend='pyarrow')
+
+    # Category counts and cleaned money columns from earlier choices, reused when the same column is chosen again
+    counts_cache = {}
+    cleaned_columns = set()
 
     # Enter a loop to keep prompting the user for sorting options
     while True:
@@ -230,7 +272,7 @@ def main():
         try:
             column_number = int(user_input)
             if column_number in headers:
-                sort_and_categorize_players_by_column(df, column_number)
+                sort_and_categorize_players_by_column(df, column_number, counts_cache, cleaned_columns)
             else:
                 print("Invalid column number.")
         except ValueError:
@@ -0,0 +1,275 @@
+"""
+spotrac_client.py
+Author: Christopher Reid
+Date: October 2024
+
+Description:
+Shared Spotrac helpers for the rookie contract scrapers (alltime_rookie_contracts.py and year_to_year_download.py).
+Every request goes through one pooled session and one rate limiter, and pages already scraped are revalidated with a
+conditional GET against the ETag/Last-Modified validators kept in an on-disk cache. It also holds the player
+draft-year lookup, the console color formatting of contract rows and the streaming CSV writer both scrapers use.
+
+Instructions:
+- This module requires the 'requests', 'beautifulsoup4' and 'lxml' libraries.
+- You can install them using:
+    pip install requests
+    pip install beautifulsoup4
+    pip install lxml
+"""
+
+import re
+import requests
+import time
+import shelve
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Overall request rate allowed against Spotrac, and the most connections kept open at once
+# (year_to_year_download.py fetches 4 seasons with 8 player-page workers each)
+REQUESTS_PER_SECOND = 2
+MAX_CONNECTIONS = 32
+
+# Shared session so every request reuses pooled keep-alive connections instead of a fresh TCP/TLS handshake
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONNECTIONS))
+
+# On-disk cache of ETag/Last-Modified validators (and the parsed result) for every Spotrac URL already scraped
+CACHE_FILE = 'spotrac_cache'
+CACHE_LOCK = threading.Lock()
+
+# Console color for each rookie contract type, matched in one regex search over the normalized type text
+COLOR_RE = re.compile(r'(rookie maximum extension|designated rookie extension|rookie extension)')
+COLORS = {
+    'rookie maximum extension': '\033[92m',  # Green for Rookie Maximum Extension
+    'designated rookie extension': '\033[93m',  # Yellow for Designated Rookie Extension
+    'rookie extension': '\033[91m',  # Red for Rookie Extension
+}
+_HYPHEN_TO_SPACE = str.maketrans('-', ' ')
+
+# Draft year at the end of the 'Drafted:' text (e.g. 'Drafted: <span class="text-yellow">1st Round (#27), 2016</span>'),
+# matched against the raw response bytes so the player page does not need to be decoded or parsed
+DRAFT_RE = re.compile(rb'Drafted:\s*(?:<[^>]+>\s*)*[^<]*?,\s*(\d{4})')
+
+# Only the parts of each page that are actually read get built into a tree
+TABLE_STRAINER = SoupStrainer('table')
+DRAFT_STRAINER = SoupStrainer('div', class_='col-md-12 text-white')
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter shared across worker threads so concurrent requests stay under Spotrac's rate limit.
+
+    Args:
+    - rate (float): Number of requests allowed per second.
+    - burst (int): Maximum number of requests that may be issued back-to-back.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """
+        Blocks until a token is available, then consumes it.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+
+RATE_LIMITER = RateLimiter(REQUESTS_PER_SECOND)
+
+
+def rate_limited_get(url, max_retries=5, **kwargs):
+    """
+    Performs a GET through the shared session, waiting on the rate limiter first and backing off
+    exponentially when Spotrac answers with HTTP 429 (Too Many Requests).
+
+    Args:
+    - url (str): The URL to fetch.
+    - max_retries (int): Number of attempts before giving up on a rate-limited URL.
+
+    Returns:
+    - response (requests.Response): The last response received.
+    """
+    for attempt in range(max_retries):
+        RATE_LIMITER.wait()
+        response = SESSION.get(url, **kwargs)
+
+        retry_after = response.headers.get('Retry-After')
+        backoff = float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt
+
+        if response.status_code != 429:
+            # Pause before the next request if the server reports the rate limit window is exhausted
+            if response.headers.get('X-RateLimit-Remaining') == '0':
+                time.sleep(backoff)
+            return response
+
+        time.sleep(backoff)
+
+    return response
+
+def conditional_get(url):
+    """
+    Performs a conditional GET using the ETag/Last-Modified validators cached from a previous run, so pages that
+    have not changed come back as an empty 304 (Not Modified) response instead of the full HTML.
+
+    Args:
+    - url (str): The URL to fetch.
+
+    Returns:
+    - response (requests.Response): The response received (status 304 when the cached entry is still valid).
+    - cached (dict): The cached entry for the URL, or None if it has not been seen before.
+    """
+    with CACHE_LOCK, shelve.open(CACHE_FILE) as cache:
+        cached = cache.get(url)
+
+    headers = {}
+    if cached:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    return rate_limited_get(url, headers=headers), cached
+
+
+def store_cache_entry(url, response, value):
+    """
+    Stores the validators of a fresh response together with the value parsed from it.
+
+    Args:
+    - url (str): The URL that was fetched.
+    - response (requests.Response): The 200 response for the URL.
+    - value: The parsed result to return the next time the server answers 304.
+    """
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+
+    # Without a validator the server can never answer 304, so there is nothing worth caching
+    if not etag and not last_modified:
+        return
+
+    with CACHE_LOCK, shelve.open(CACHE_FILE) as cache:
+        cache[url] = {'etag': etag, 'last_modified': last_modified, 'value': value}
+
+
+@lru_cache(maxsize=None)
+def _fetch_draft_year(player_url):
+    """
+    Fetches and parses the player's draft year. Memoized per URL for the life of the process, so a player who
+    appears in several rows or seasons is only looked up once. Request errors propagate, so they are never cached.
+
+    Args:
+    - player_url (str): The URL of the player's Spotrac page.
+
+    Returns:
+    - draft_year (str): The draft year extracted from the player's page, or None if not found.
+    """
+    player_response, cached = conditional_get(player_url)
+    if player_response.status_code == 304 and cached:
+        return cached['value']
+
+    player_response.raise_for_status()
+
+    # Pull the year straight out of the raw bytes, and only build a tree if the page layout doesn't match
+    match = DRAFT_RE.search(player_response.content)
+    if match:
+        draft_year = match.group(1).decode()
+    else:
+        player_soup = BeautifulSoup(player_response.text, 'lxml', parse_only=DRAFT_STRAINER)
+
+        # Go straight to the highlighted span inside the 'Drafted:' block instead of scanning every div
+        draft_span = player_soup.select_one('div.col-md-12.text-white:-soup-contains("Drafted:") span.text-yellow')
+
+        draft_year = None
+        if draft_span:
+            draft_info = draft_span.get_text(strip=True)
+            draft_year = draft_info.split(',')[-1].strip()
+
+    store_cache_entry(player_url, player_response, draft_year)
+    return draft_year
+
+def scrape_draft_year_from_spotrac(player_url):
+    """
+    Scrapes the player's draft year from their Spotrac page. A player's draft year never changes, so when the
+    page is unchanged since the last run (HTTP 304) the cached year is returned without re-downloading or re-parsing.
+
+    Args:
+    - player_url (str): The URL of the player's Spotrac page.
+
+    Returns:
+    - draft_year (str): The draft year extracted from the player's page, or None if not found.
+    """
+    try:
+        return _fetch_draft_year(player_url)
+
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching player data from URL: {e}")
+        return None
+
+def format_contract_with_color(data, contract_type):
+    """
+    Formats contract data as a line of console text with color formatting based on the type of contract.
+
+    Args:
+    - data (list): A list of contract data.
+    - contract_type (str): The type of contract (used for color-coding).
+
+    Returns:
+    - line (str): The formatted line, without a trailing newline.
+    """
+    match = COLOR_RE.search(contract_type.translate(_HYPHEN_TO_SPACE))
+    if match:
+        return f"{COLORS[match.group(1)]}{data}\033[0m"
+    return str(data)  # Default format for other contract types
+
+def _quote(cell):
+    """
+    Formats a CSV cell the same way csv.writer's minimal quoting does: None becomes an empty cell, and the text is
+    quoted only when it contains a comma, quote or line break (e.g. the '$' amounts with thousands separators).
+
+    Args:
+    - cell: The cell value to write.
+
+    Returns:
+    - cell (str): The cell text, quoted if needed.
+    """
+    cell = '' if cell is None else str(cell)
+    if ',' in cell or '"' in cell or '\n' in cell or '\r' in cell:
+        return '"' + cell.replace('"', '""') + '"'
+    return cell
+
+@contextmanager
+def open_csv_sink(filename):
+    """
+    Opens the output CSV once through a 1 MiB write buffer and writes the header row, then yields a function that
+    writes a single row as soon as it is scraped. Rows are never flushed individually; the buffer is written out
+    in large blocks and a final time when the file is closed.
+
+    Args:
+    - filename (str): The name of the CSV file.
+
+    Yields:
+    - write_row (function): Writes one row of contract data to the CSV.
+    """
+    headers = ['YR_1', 'Rank', 'Player', 'Pos', 'Team Signed With', 'Age At Signing', 'Yrs', 'Value', 'AAV', 'Practical GTD', 'Type']
+
+    with open(filename, mode='w', newline='', buffering=1 << 20) as file:
+        file.write(','.join(headers) + '\r\n')
+        yield lambda row: file.write(','.join(_quote(cell) for cell in row) + '\r\n')
+
+    print(f"Data has been written to {filename}")
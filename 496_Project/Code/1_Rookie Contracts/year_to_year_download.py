@@ -10,26 +10,36 @@ It outputs the data to the console with color formatting for contract types and
 ('rooks[start_year]-[end_year].csv') with the gathered data.
 
 Instructions:
-- This script requires the 'requests' and 'beautifulsoup4' libraries.
+- This script requires the 'requests', 'beautifulsoup4' and 'lxml' libraries.
 - You can install them using:
     pip install requests
     pip install beautifulsoup4
+    pip install lxml
+- It imports the shared Spotrac helpers (fetching, draft years, console colors and the CSV writer) from
+  spotrac_client.py, which must stay in the same directory.
 """
 
 import requests
-import time
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
-import csv
+from spotrac_client import (TABLE_STRAINER, conditional_get, store_cache_entry, scrape_draft_year_from_spotrac,
+                            format_contract_with_color, open_csv_sink)
 
+# Number of seasons and player pages fetched concurrently (the overall request rate is limited in spotrac_client.py)
+YEAR_WORKERS = 4
+MAX_WORKERS = 8
 
-def fetch_extension_data(year, delay=2):
+def fetch_extension_data(year, max_workers=MAX_WORKERS):
     """
     Fetches NBA contract extension data for a given year from Spotrac, including headers, and appends the data to a list.
-    Also, scrapes the player's draft year (YR_1) from each player's hyperlink in Spotrac.
+    Also, scrapes the player's draft year (YR_1) from each player's hyperlink in Spotrac. Player pages are fetched
+    concurrently through a thread pool, with the shared rate limiter keeping the overall request rate polite.
+    Nothing is printed here (besides errors) so several seasons can be fetched at once; see print_season_data.
 
     Args:
     - year (int): The NBA season start year for which to fetch data (e.g., 2020 for the 2020-21 season).
-    - delay (int): Time to wait (in seconds) between requests to avoid being blocked.
+    - max_workers (int): Number of player pages to fetch concurrently.
 
     Returns:
     - contract_data (list): A list of lists, each containing player contract data for that year.
@@ -38,101 +48,87 @@ def fetch_extension_data(year, delay=2):
     contract_data = []
 
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        table = soup.find('table')
-        rows = table.find_all('tr') if table else []
+        # Reuse the cached table HTML when Spotrac reports the page has not changed since the last run
+        response, cached = conditional_get(url)
+        if response.status_code == 304 and cached:
+            html = cached['value']
+        else:
+            response.raise_for_status()
+            html = response.text
+            store_cache_entry(url, response, html)
 
-        # Print heading for the season after the separator
-        print(f"--- Rookie Contract Extensions for {year}-{year + 1} Season ---")
+        soup = BeautifulSoup(html, 'lxml', parse_only=TABLE_STRAINER)
 
-        # Print the column headers after the separator
-        headers = ['YR_1', 'Rank', 'Player', 'Pos', 'Team Signed With', 'Age At Signing', 'Yrs', 'Value', 'AAV', 'Practical GTD', 'Type']
-        print(headers)
+        # Only rows carrying a contract-type cell hold contract data
+        table = soup.find('table')
+        rows = table.select('tr:has(> td.contract-type)') if table else []
 
         if rows:
+            # Collect the rookie rows and their player URLs first so the player pages can be fetched concurrently
+            rookie_rows = []
+            player_urls = []
             for row in rows:
-                contract_type_cell = row.find('td', class_='contract-type')
+                contract_type_cell = row.select_one('td.contract-type')
                 if contract_type_cell and 'rookie' in contract_type_cell.get_text().lower():
                     columns = row.find_all('td')
                     data = [col.get_text(strip=True) for col in columns]
+                    rookie_rows.append(data)
 
-                    player_link = row.find('a', class_='link')
+                    player_link = row.select_one('a.link')
                     if player_link:
                         player_url = player_link['href']
                         if player_url.startswith('/'):
-                            full_player_url = f'https://www.spotrac.com{player_url}'
+                            player_urls.append(f'https://www.spotrac.com{player_url}')
                         else:
-                            full_player_url = player_url
-
-                        draft_year = scrape_draft_year_from_spotrac(full_player_url)
-                        data.insert(0, draft_year if draft_year else "N/A")
+                            player_urls.append(player_url)
+                    else:
+                        player_urls.append(None)
 
-                    contract_data.append(data)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                draft_years = list(executor.map(
+                    lambda player_url: scrape_draft_year_from_spotrac(player_url) if player_url else None,
+                    player_urls
+                ))
 
-                    # Print contract with appropriate color formatting
-                    contract_type = contract_type_cell.get_text().strip().lower()
-                    print_contract_with_color(data, contract_type)
-        else:
-            print(f"No rookie contract extensions for {year}-{year + 1} season.")
+            # Stitch the draft years back onto their rows in the original table order
+            for data, player_url, draft_year in zip(rookie_rows, player_urls, draft_years):
+                if player_url:
+                    data.insert(0, draft_year if draft_year else "N/A")
 
-        # Ensure there's a blank line after each year
-        print()
-        time.sleep(delay)
+                contract_data.append(data)
 
     except requests.exceptions.RequestException as e:
         print(f"Error fetching data from URL: {e}")
 
     return contract_data
 
-def scrape_draft_year_from_spotrac(player_url):
+def print_season_data(year, contract_data):
     """
-    Scrapes the player's draft year from their Spotrac page.
+    Prints a season's contract data under its heading, with color formatting based on the contract type.
+    The whole season is written to the console in a single call.
 
     Args:
-    - player_url (str): The URL of the player's Spotrac page.
-
-    Returns:
-    - draft_year (str): The draft year extracted from the player's page, or None if not found.
+    - year (int): The NBA season start year of the data.
+    - contract_data (list): The contract data fetched for that season.
     """
-    try:
-        player_response = requests.get(player_url)
-        player_response.raise_for_status()
-        player_soup = BeautifulSoup(player_response.text, 'html.parser')
+    # Heading for the season after the separator
+    lines = [f"--- Rookie Contract Extensions for {year}-{year + 1} Season ---"]
 
-        divs = player_soup.find_all('div', class_='col-md-12 text-white')
-
-        for div in divs:
-            if 'Drafted:' in div.get_text():
-                draft_span = div.find('span', class_='text-yellow')
-                if draft_span:
-                    draft_info = draft_span.get_text(strip=True)
-                    draft_year = draft_info.split(',')[-1].strip()
-                    return draft_year
-        return None
+    # Column headers after the separator
+    headers = ['YR_1', 'Rank', 'Player', 'Pos', 'Team Signed With', 'Age At Signing', 'Yrs', 'Value', 'AAV', 'Practical GTD', 'Type']
+    lines.append(str(headers))
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching player data from URL: {e}")
-        return None
+    if contract_data:
+        for data in contract_data:
+            # The last column holds the contract type text
+            lines.append(format_contract_with_color(data, data[-1].lower()))
+    else:
+        lines.append(f"No rookie contract extensions for {year}-{year + 1} season.")
 
-def print_contract_with_color(data, contract_type):
-    """
-    Prints contract data with color formatting based on the type of contract.
+    # Ensure there's a blank line after each year
+    lines.append('')
 
-    Args:
-    - data (list): A list of contract data.
-    - contract_type (str): The type of contract (used for color-coding).
-    """
-    if 'rookie maximum extension' in contract_type.replace('-', ' '):
-        print(f"\033[92m{data}\033[0m")  # Green for Rookie Maximum Extension
-    elif 'designated rookie extension' in contract_type:
-        print(f"\033[93m{data}\033[0m")  # Yellow for Designated Rookie Extension
-    elif 'rookie extension' in contract_type:
-        print(f"\033[91m{data}\033[0m")  # Red for Rookie Extension
-    else:
-        print(data)  # Default print for other contract types
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 def create_csv(data, start_year, end_year):
     """
@@ -147,14 +143,9 @@ def create_csv(data, start_year, end_year):
     - None
     """
     filename = f'rooks{start_year}-{end_year}.csv'
-    headers = ['YR_1', 'Rank', 'Player', 'Pos', 'Team Signed With', 'Age At Signing', 'Yrs', 'Value', 'AAV', 'Practical GTD', 'Type']
-
-    with open(filename, mode='w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(headers)
-        writer.writerows(data)
-
-    print(f"Data has been written to {filename}")
+    with open_csv_sink(filename) as write_row:
+        for row in data:
+            write_row(row)
 
 def main():
     """
@@ -177,16 +168,15 @@ def main():
     # Add a blank line after the user inputs
     print()
 
-    all_data = []
-
-    # Fetch data for the range of years
-    for year in range(start_year, end_year + 1):
-        year_data = fetch_extension_data(year, delay=2)
-        if year_data:
-            all_data.extend(year_data)
-
-    # Create the CSV file
-    create_csv(all_data, start_year, end_year)
+    # Fetch the seasons concurrently; the shared rate limiter keeps the combined request rate polite
+    years = range(start_year, end_year + 1)
+    with ThreadPoolExecutor(max_workers=YEAR_WORKERS) as executor, \
+            open_csv_sink(f'rooks{start_year}-{end_year}.csv') as write_row:
+        # Print and write each season in order as soon as it is ready, without holding the whole range in memory
+        for year, year_data in zip(years, executor.map(fetch_extension_data, years)):
+            print_season_data(year, year_data)
+            for row in year_data:
+                write_row(row)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -14,9 +14,18 @@ import matplotlib.pyplot as plt
 
 
 def load_data(file_path):
-    """Load player stats data from a CSV file."""
+    """
+    Load player stats data from a CSV file into Arrow-backed columns. The parsed frame is cached as Parquet
+    next to the CSV, and later runs read that cache instead while it is at least as new as the CSV.
+    """
+    parquet_path = os.path.splitext(file_path)[0] + '.parquet'
     try:
-        data = pd.read_csv(file_path)
+        if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path):
+            data = pd.read_parquet(parquet_path, dtype_backend='pyarrow')
+        else:
+            # The scraper can append short rows, which only the default C parser pads out
+            data = pd.read_csv(file_path, dtype_backend='pyarrow')
+            data.to_parquet(parquet_path, compression='zstd')
         print(f"Data loaded successfully. {len(data)} rows and {len(data.columns)} columns.")
         return data
     except FileNotFoundError:
@@ -33,34 +42,57 @@ def top_performers(data, metric, top_n=10):
     return top[['Player', metric]]
 
 
-def plot_metric_distribution(data, metric, output_dir="plots"):
-    """Plot the distribution of a specific metric and save the plot."""
+def plot_metric_distribution(data, metric, output_dir="plots", ax=None):
+    """
+    Plot the distribution of a specific metric and save the plot into output_dir, which must already exist.
+    If an Axes is given it is cleared and reused instead of creating a new Figure.
+    """
     if metric not in data.columns:
         print(f"Metric '{metric}' not found in data.")
         return
 
-    # Ensure the output directory exists
-    os.makedirs(output_dir, exist_ok=True)
+    # Skip columns with nothing to plot (e.g. stats that are missing for every player)
+    values = data[metric].dropna()
+    if len(values) < 2:
+        print(f"Skipping {metric}: insufficient data")
+        return
+
+    own_figure = ax is None
+    if own_figure:
+        fig, ax = plt.subplots()
+    else:
+        fig = ax.figure
+        ax.clear()
 
     # Plot the metric distribution
-    data[metric].dropna().plot(kind='hist', bins=20, title=f"Distribution of {metric}")
-    plt.xlabel(metric)
-    plt.ylabel("Frequency")
-    plt.title(f"Distribution of {metric}")
-    plt.savefig(f"{output_dir}/{metric}_distribution.png")  # Save the plot
+    values.plot(kind='hist', bins=20, ax=ax)
+    ax.set_xlabel(metric)
+    ax.set_ylabel("Frequency")
+    ax.set_title(f"Distribution of {metric}")
+    fig.savefig(f"{output_dir}/{metric}_distribution.png")  # Save the plot
     print(f"Distribution plot for {metric} saved to {output_dir}/{metric}_distribution.png")
-    plt.close()
+
+    if own_figure:
+        plt.close(fig)
 
 
 def analyze_all_metrics(data, numeric_columns, top_n=10, output_dir="plots"):
-    """Analyze all numeric metrics in the dataset."""
-    for metric in numeric_columns:
-        print(f"\nAnalyzing {metric}...")
-        print(f"Top {top_n} performers for {metric}:")
-        top_performers_list = top_performers(data, metric, top_n)
-        if top_performers_list is not None:
-            print(top_performers_list)
-        plot_metric_distribution(data, metric, output_dir)
+    """Analyze all numeric metrics in the dataset, reusing a single Figure for every histogram."""
+    if len(numeric_columns) == 0:
+        print("No numeric columns to analyze.")
+        return
+
+    fig, ax = plt.subplots()
+    try:
+        for metric in numeric_columns:
+            print(f"\nAnalyzing {metric}...")
+            print(f"Top {top_n} performers for {metric}:")
+            top_performers_list = top_performers(data, metric, top_n)
+            if top_performers_list is not None:
+                print(top_performers_list)
+            plot_metric_distribution(data, metric, output_dir, ax=ax)
+    finally:
+        plt.close(fig)
 
 
 if __name__ == "__main__":
@@ -71,8 +103,11 @@ if __name__ == "__main__":
     data = load_data(input_file)
     if data is not None:
         # Identify numeric columns
-        numeric_columns = data.select_dtypes(include=["float64", "int64"]).columns
+        numeric_columns = data.select_dtypes(include=["number"]).columns
         print(f"Numeric columns identified: {list(numeric_columns)}")
 
+        # Create the output directory once for every plot below
+        os.makedirs(output_directory, exist_ok=True)
+
         # Analyze all numeric metrics
         analyze_all_metrics(data, numeric_columns, top_n=10, output_dir=output_directory)
\ No newline at end of file
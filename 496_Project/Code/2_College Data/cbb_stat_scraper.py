@@ -1,64 +1,99 @@
 import requests
-from bs4 import BeautifulSoup
+from lxml import html
 import pandas as pd
 import time
 import os
 import random
+import csv
+import shelve
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+
+# Number of player pages fetched at once; kept small to stay polite to Sports-Reference
+MAX_WORKERS = 4
+
+# Shared session so every request reuses pooled keep-alive connections instead of a fresh TCP/TLS handshake
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': 'Mozilla/5.0 (compatible; SportsAnalytics/1.0)'})
+SESSION.mount('https://www.sports-reference.com', HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS, max_retries=3))
+
+# Disk cache of fetched pages so a re-run doesn't download the letter indexes and profiles again
+CACHE_FILE = 'sr_cache'
+CACHE_LOCK = threading.Lock()
+CACHE_EXPIRE_AFTER = 7 * 24 * 60 * 60  # Seconds a cached page is served without asking the server
+
+# Header row of player_stats.csv (no redundant 'Pos' column)
+PLAYER_STATS_HEADERS = ['Player', 'Seasons Played', 'Position', 'G', 'GS', 'MP', 'FG', 'FGA', 'FG%', '3P', '3PA', '3P%',
+                        '2P', '2PA', '2P%', 'eFG%', 'FT', 'FTA', 'FT%', 'ORB', 'DRB', 'TRB', 'AST', 'STL', 'BLK', 'TOV',
+                        'PF', 'PTS']
+
+# Links whose lowercased href, or lowercased text without periods, contains both names; evaluated inside libxml2
+_LOWER = "'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'"
+_LOWER_NO_DOTS = "'ABCDEFGHIJKLMNOPQRSTUVWXYZ.', 'abcdefghijklmnopqrstuvwxyz'"
+PROFILE_LINK_XPATH = (
+    f"//a[(contains(translate(@href, {_LOWER}), $last) and contains(translate(@href, {_LOWER}), $first))"
+    f" or (contains(translate(string(.), {_LOWER_NO_DOTS}), $last) and contains(translate(string(.), {_LOWER_NO_DOTS}), $first))]"
+)
+
+# Players whose profile URL can't be found from the letter index
+SPECIAL_PROFILES = {
+    "Larry Nance": "https://www.sports-reference.com/cbb/players/larry-nance-2.html",
+}
 
 # Function to search for a player's profile link on the corresponding alphabet page
-def search_player_profile(soup, first_name, last_name):
+def search_player_profile(tree, first_name, last_name):
     first_name = first_name.lower().replace('.', '').strip()
     last_name = last_name.lower().replace('.', '').strip()
 
-    for link in soup.find_all('a'):
-        href = link.get('href', '').lower()
-        text = link.get_text().lower().replace('.', '').strip()
+    links = tree.xpath(PROFILE_LINK_XPATH, first=first_name, last=last_name)
 
-        if (last_name in href and first_name in href) or (last_name in text and first_name in text):
-            profile_url = f"https://www.sports-reference.com{link.get('href')}"
-            print(f"\033[92mFound profile for {first_name.capitalize()} {last_name.capitalize()}: {profile_url}\033[0m")
-            return profile_url
+    if links:
+        profile_url = f"https://www.sports-reference.com{links[0].get('href')}"
+        print(f"\033[92mFound profile for {first_name.capitalize()} {last_name.capitalize()}: {profile_url}\033[0m")
+        return profile_url
 
     print(f"\033[91mProfile for {first_name.capitalize()} {last_name.capitalize()} not found.\033[0m")
     return None
 
 # Function to count the number of seasons played by a player
-def extract_position_and_seasons(soup):
-    players_per_game_div = soup.find('div', id='all_players_per_game')
+def extract_position_and_seasons(tree):
+    players_per_game_div = tree.xpath("//div[@id='all_players_per_game']")
 
     if not players_per_game_div:
         print("Player stats div not found.")
         return "Unknown", 0
 
-    rows = players_per_game_div.find_all('tr', id=lambda value: value and value.startswith("players_per_game.") and "Career" not in value and "conf" not in value)
+    rows = players_per_game_div[0].xpath(".//tr[starts-with(@id, 'players_per_game.') and not(contains(@id, 'Career')) and not(contains(@id, 'conf'))]")
 
     if not rows:
         print("No rows found for player stats.")
         return "Unknown", 0
 
-    position = rows[0].find('td', {'data-stat': 'pos'}).get_text() if rows[0].find('td', {'data-stat': 'pos'}) else "Unknown"
+    pos_cell = rows[0].xpath("td[@data-stat='pos']")
+    position = pos_cell[0].text_content() if pos_cell else "Unknown"
     seasons_played = len(rows)
 
     return position, seasons_played
 
 # Function to extract career stats and handle the absence of 3P% column
-def extract_career_stats(soup):
-    table = soup.find('table', id='players_per_game')
+def extract_career_stats(tree):
+    table = tree.xpath("//table[@id='players_per_game']")
 
-    if table is None:
+    if not table:
         print("Per-game stats table not found.")
         return None
 
-    headers = [th.get('data-stat') for th in table.find('thead').find_all('th')]
-    has_3p_pct = 'fg3_pct' in headers
+    has_3p_pct = bool(table[0].xpath("thead//th[@data-stat='fg3_pct']"))
 
-    career_row = table.find('tr', id='players_per_game.Career')
+    career_row = table[0].xpath(".//tr[@id='players_per_game.Career']")
 
     if not career_row:
         print("Career row not found in the table.")
         return None
 
-    career_stats = [td.get_text() for td in career_row.find_all('td')]
+    career_stats = [td.text_content() for td in career_row[0].xpath('.//td')]
 
     # If the table does not include 3P%, insert NaN after the 3PA column
     if not has_3p_pct:
@@ -69,47 +104,126 @@ def extract_career_stats(soup):
 
     return career_stats
 
-# Function to save player data to a CSV file
-def save_player_data(player_name, seasons_played, position, career_stats, output_csv, first_player=False):
+# Function to write one player's row through the open player_stats.csv writer
+def save_player_data(writer, player_name, seasons_played, position, career_stats):
     # Set a default value for position if it's missing
     if position.strip() == "":
         position = "Unknown"
 
-    # Remove any 'N/A' values from the player's extracted data to avoid empty spaces
-    player_data = [player_name, seasons_played, position] + [stat for stat in career_stats if stat != 'N/A']
+    # Keep the 'N/A' placeholders so every row lines up with the header columns
+    writer.writerow([player_name, seasons_played, position, *career_stats])
 
-    if first_player:
-        # Headers with no redundant 'Pos' column
-        headers = ['Player', 'Seasons Played', 'Position', 'G', 'GS', 'MP', 'FG', 'FGA', 'FG%', '3P', '3PA', '3P%',
-                   '2P', '2PA', '2P%', 'eFG%', 'FT', 'FTA', 'FT%', 'ORB', 'DRB', 'TRB', 'AST', 'STL', 'BLK', 'TOV',
-                   'PF', 'PTS']
-        with open(output_csv, 'w') as f:
-            pd.DataFrame([headers]).to_csv(f, header=False, index=False)
+# Function to load the names of already-processed players once, up front
+def load_processed_players(processed_players_csv):
+    if os.path.exists(processed_players_csv):
+        try:
+            # The multi-threaded Arrow reader only has to parse the one column we need
+            players = pd.read_csv(processed_players_csv, engine='pyarrow', usecols=['Player'])['Player']
+        except KeyError:
+            # Ensure the file has the 'Player' column, otherwise create it with headers
+            pd.DataFrame(columns=['Player']).to_csv(processed_players_csv, index=False)
+            return set()
+        return set(players.tolist())
+    return set()
+
+# Function to mark a player as processed by saving their name through the open processed_players.csv writer
+def mark_player_processed(writer, processed, player_name):
+    writer.writerow([player_name])
+    processed.add(player_name)
+
+# Function to GET a page through the disk cache; returns (status code, content, whether it came from the cache)
+def cached_get(url):
+    with CACHE_LOCK, shelve.open(CACHE_FILE) as cache:
+        cached = cache.get(url)
+
+    if cached and time.time() - cached['fetched'] < CACHE_EXPIRE_AFTER:
+        return 200, cached['content'], True
+
+    # Revalidate an expired entry so an unchanged page comes back as an empty 304
+    headers = {}
+    if cached:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    try:
+        response = SESSION.get(url, headers=headers)
+    except requests.RequestException:
+        if cached:
+            return 200, cached['content'], True  # Serve the stale copy rather than fail
+        raise
+
+    if response.status_code == 304 and cached:
+        content = cached['content']
+    elif response.status_code == 200:
+        content = response.content
+    elif cached:
+        return 200, cached['content'], True  # Serve the stale copy rather than fail
+    else:
+        return response.status_code, None, False
+
+    entry = {'content': content, 'fetched': time.time(),
+             'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+    with CACHE_LOCK, shelve.open(CACHE_FILE) as cache:
+        cache[url] = entry
+    return 200, content, response.status_code == 304
+
+# Function to fetch and parse a letter index page once per run; raises so failures are not cached
+@lru_cache(maxsize=26)
+def _load_letter_index(first_letter):
+    url = f"https://www.sports-reference.com/cbb/players/{first_letter}-index.html"
+    status_code, content, _ = cached_get(url)
+
+    if status_code != 200:
+        raise requests.HTTPError(f"Failed to navigate to {url}. Status code: {status_code}")
+
+    print(f"Successfully navigated to {url}")
+    return html.fromstring(content)
+
+# Function to get the letter index page that lists every player with that last-name initial
+def fetch_letter_index(first_letter):
+    try:
+        return _load_letter_index(first_letter)
+    except requests.HTTPError as e:
+        print(e)
+        return None
 
-    with open(output_csv, 'a') as f:
-        df = pd.DataFrame([player_data])
-        df.to_csv(f, header=False, index=False)
+# Function to find, download and parse a single player's profile; returns None on failure
+def process_player(first_name, last_name, index_tree):
+    player_name = f"{first_name} {last_name}"
 
-# Function to check if a player has already been processed
-def is_player_processed(player_name, processed_players_csv):
-    if os.path.exists(processed_players_csv):
-        df = pd.read_csv(processed_players_csv)
-        # Ensure the file has the 'Player' column, otherwise create it with headers
-        if 'Player' not in df.columns:
-            df = pd.DataFrame(columns=['Player'])
-            df.to_csv(processed_players_csv, index=False)
-        return player_name in df['Player'].values
-    return False
-
-# Function to mark a player as processed by saving their name
-def mark_player_processed(player_name, processed_players_csv):
-    if not os.path.exists(processed_players_csv):
-        # Create the file with a header if it doesn't exist
-        pd.DataFrame(columns=['Player']).to_csv(processed_players_csv, index=False)
-
-    # Append the processed player's name
-    with open(processed_players_csv, 'a') as f:
-        pd.DataFrame([[player_name]], columns=['Player']).to_csv(f, header=False, index=False)
+    if player_name in SPECIAL_PROFILES:
+        profile_url = SPECIAL_PROFILES[player_name]
+        print(f"\033[92mFound special case for {player_name}: {profile_url}\033[0m")
+    elif index_tree is None:
+        return None
+    else:
+        profile_url = search_player_profile(index_tree, first_name, last_name)
+
+    if not profile_url:
+        print(f"\033[91mProfile for {first_name} {last_name} not found.\033[0m")
+        return None
+
+    result = None
+    status_code, content, from_cache = cached_get(profile_url)
+    if status_code == 200:
+        profile_tree = html.fromstring(content)
+
+        position, seasons_played = extract_position_and_seasons(profile_tree)
+        career_stats = extract_career_stats(profile_tree)
+
+        if career_stats is not None:
+            result = (seasons_played, position, career_stats)
+        else:
+            print(f"Could not extract career stats for {first_name} {last_name}")
+    else:
+        print(f"Failed to retrieve profile page for {first_name} {last_name}. Status code: {status_code}")
+
+    # Concurrency does most of the pacing now, so each worker only waits briefly; cached pages need no pause
+    if not from_cache:
+        time.sleep(random.uniform(1, 2))
+    return result
 
 # Main function to read the CSV and search for player profiles
 def main():
@@ -123,76 +237,53 @@ def main():
 
     df = pd.read_csv(input_csv)
 
-    first_player = True if not os.path.exists(output_csv) else False
-    current_letter = ''
-
-    for index, row in df.iterrows():
-        first_name = row['First Name']
-        last_name = row['Last Name']
-        player_name = f"{first_name} {last_name}"
-
-        # Special case for Larry Nance
-        if player_name == "Larry Nance":
-            profile_url = "https://www.sports-reference.com/cbb/players/larry-nance-2.html"
-            print(f"\033[92mFound special case for Larry Nance: {profile_url}\033[0m")
-
-            profile_response = requests.get(profile_url)
-            if profile_response.status_code == 200:
-                profile_soup = BeautifulSoup(profile_response.content, 'html.parser')
-
-                position, seasons_played = extract_position_and_seasons(profile_soup)
-                career_stats = extract_career_stats(profile_soup)
-
-                if career_stats is not None:
-                    save_player_data(player_name, seasons_played, position, career_stats, output_csv, first_player)
-                    mark_player_processed(player_name, processed_players_csv)
-                    first_player = False
-                else:
-                    print(f"Could not extract career stats for Larry Nance.")
-            else:
-                print(f"Failed to retrieve profile page for Larry Nance. Status code: {profile_response.status_code}")
-            continue  # Skip the rest of the loop for Larry Nance
-
-        if is_player_processed(player_name, processed_players_csv):
-            print(f"Skipping {player_name}, already processed.")
-            continue
-
-        first_letter = last_name[0].lower()
-
-        if first_letter != current_letter:
-            url = f"https://www.sports-reference.com/cbb/players/{first_letter}-index.html"
-            response = requests.get(url)
-
-            if response.status_code == 200:
-                print(f"Successfully navigated to {url}")
-                soup = BeautifulSoup(response.content, 'html.parser')
-                current_letter = first_letter
-            else:
-                print(f"Failed to navigate to {url}. Status code: {response.status_code}")
+    first_letters = df['Last Name'].str[0].str.lower()
+    new_output = not os.path.exists(output_csv)
+    new_processed = not os.path.exists(processed_players_csv)
+    processed = load_processed_players(processed_players_csv)
+
+    # Both CSVs stay open for the whole run instead of being reopened for every player
+    with open(output_csv, 'a', newline='', buffering=1 << 16) as stats_file, \
+            open(processed_players_csv, 'a', newline='') as processed_file, \
+            ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        stats_writer = csv.writer(stats_file, lineterminator='\n')
+        processed_writer = csv.writer(processed_file, lineterminator='\n')
+        if new_output:
+            stats_writer.writerow(PLAYER_STATS_HEADERS)
+        if new_processed:
+            processed_writer.writerow(['Player'])
+
+        # Fetch each letter index once, then pull that letter's profiles concurrently
+        for first_letter, group in df.groupby(first_letters, sort=False):
+            pending = []
+            for first_name, last_name in zip(group['First Name'], group['Last Name']):
+                player_name = f"{first_name} {last_name}"
+                if player_name not in SPECIAL_PROFILES and player_name in processed:
+                    print(f"Skipping {player_name}, already processed.")
+                    continue
+                pending.append((first_name, last_name))
+
+            if not pending:
                 continue
 
-        profile_url = search_player_profile(soup, first_name, last_name)
-
-        if profile_url:
-            profile_response = requests.get(profile_url)
-            if profile_response.status_code == 200:
-                profile_soup = BeautifulSoup(profile_response.content, 'html.parser')
+            index_tree = None
+            if any(f"{first_name} {last_name}" not in SPECIAL_PROFILES for first_name, last_name in pending):
+                index_tree = fetch_letter_index(first_letter)
 
-                position, seasons_played = extract_position_and_seasons(profile_soup)
-                career_stats = extract_career_stats(profile_soup)
+            results = executor.map(lambda name: process_player(name[0], name[1], index_tree), pending)
 
-                if career_stats is not None:
-                    save_player_data(player_name, seasons_played, position, career_stats, output_csv, first_player)
-                    mark_player_processed(player_name, processed_players_csv)
-                    first_player = False
-                else:
-                    print(f"Could not extract career stats for {first_name} {last_name}")
-            else:
-                print(f"Failed to retrieve profile page for {first_name} {last_name}. Status code: {profile_response.status_code}")
-        else:
-            print(f"\033[91mProfile for {first_name} {last_name} not found.\033[0m")
+            # Results come back in input order, so rows are written from this thread only
+            for (first_name, last_name), result in zip(pending, results):
+                if result is None:
+                    continue
+                seasons_played, position, career_stats = result
+                player_name = f"{first_name} {last_name}"
+                save_player_data(stats_writer, player_name, seasons_played, position, career_stats)
+                mark_player_processed(processed_writer, processed, player_name)
 
-        time.sleep(random.uniform(5, 10))
+            # Flush once per letter so an interrupted run keeps both files in step
+            stats_file.flush()
+            processed_file.flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
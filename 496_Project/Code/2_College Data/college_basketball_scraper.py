@@ -10,11 +10,18 @@ and prints the information.
 Requirements:
 - requests
 - BeautifulSoup
+- lxml
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
+# Shared session so every request reuses pooled keep-alive connections instead of a fresh TCP/TLS handshake
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': 'Mozilla/5.0 (compatible; SportsAnalytics/1.0)'})
+SESSION.mount('https://www.sports-reference.com', HTTPAdapter(max_retries=3))
+
 # Function to scrape player information from the given URL
 def scrape_player_info():
     """
@@ -23,13 +30,13 @@ def scrape_player_info():
     url = "https://www.sports-reference.com/cbb/players/"
 
     # Send a GET request to the website
-    response = requests.get(url)
+    response = SESSION.get(url)
 
     if response.status_code == 200:
         print("Successfully connected to the site!")
 
         # Parse the HTML content of the page
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml', from_encoding='utf-8')
 
         # Find the table containing the player data
         player_table = soup.find('table', {'id': 'players'})
@@ -1,77 +1,83 @@
 """
 combineAgility.py
 
-This script navigates to NBA draft combine strength and agility data pages for all available seasons,
-extracts all rows containing player data, and saves all seasons' data into a single CSV file.
+This script requests NBA draft combine strength and agility data for all available seasons
+from the stats.nba.com JSON endpoint that backs the combine pages, and saves all seasons'
+data into a single CSV file.
 
 Requirements:
-    - Selenium and ChromeDriver
-    - BeautifulSoup from bs4 library
+    - requests
     - pandas (optional, for CSV export)
-    - Internet connection to access NBA's stats pages
+    - Internet connection to access NBA's stats API
 
 """
 
-from selenium import webdriver
-from bs4 import BeautifulSoup
+import requests
 import pandas as pd
 import time
 
 TIMEOUT = 10  # Set timeout in seconds
 
-# Global DataFrame to hold all season data
-all_data = pd.DataFrame()
+URL = "https://stats.nba.com/stats/draftcombinedrillresults"
 
-# Function to navigate to the combine data page for a specific season and extract all table rows
-def scrape_all_rows(season_year):
-    global all_data
-    url = f"https://www.nba.com/stats/draft/combine-strength-agility?SeasonYear={season_year}"
+# Shared session so all seasons reuse one keep-alive connection; stats.nba.com rejects requests without these headers
+SESSION = requests.Session()
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+    'Referer': 'https://www.nba.com/',
+    'Origin': 'https://www.nba.com',
+    'Accept': 'application/json',
+})
+
+COLUMNS = ["Player Name", "Position", "Lane Agility", "Shuttle Run", "Three Quarter Sprint", "Standing Vertical", "Max Vertical", "Bench Press", "Season Year"]
 
-    # Set up Selenium WebDriver (adjust the path if needed)
-    driver = webdriver.Chrome()  # or specify path to chromedriver if required
-    driver.get(url)
+# API result-set header for each CSV column (Season Year is added from the request)
+API_FIELDS = ["PLAYER_NAME", "POSITION", "LANE_AGILITY_TIME", "SHUTTLE_RUN", "THREE_QUARTER_SPRINT", "STANDING_VERTICAL_LEAP", "MAX_VERTICAL_LEAP", "BENCH_PRESS"]
 
-    # Allow time for the page to load content fully
-    time.sleep(TIMEOUT)
+# Global list of row lists for all seasons, turned into a DataFrame once at the end
+all_rows_global = []
 
-    # Parse the page source with BeautifulSoup
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-    driver.quit()
+# Function to render one API value the way the combine table showed it, with "-" for missing values
+def format_value(value):
+    text = "" if value is None else str(value).strip()
+    return text if text else "-"
 
-    # Find the table containing player data
-    table = soup.find('table', class_='Crom_table__p1iZz')
-    if not table:
-        print(f"Player data table not found for season {season_year}.")
-        return
+# Function to request the combine data for a specific season and extract all player rows
+def scrape_all_rows(season_year):
+    print(f"Scraping season: {season_year}")
+    try:
+        response = SESSION.get(URL, params={'SeasonYear': season_year, 'LeagueID': '00'}, timeout=TIMEOUT)
+        response.raise_for_status()
+        result_set = response.json()['resultSets'][0]
+    except (requests.RequestException, ValueError, KeyError, IndexError) as e:
+        print(f"Player data not found for season {season_year}: {e}")
+        return []
+
+    # Locate each wanted field in the result set; fields the API doesn't report stay as "-"
+    positions = {header: i for i, header in enumerate(result_set['headers'])}
+    indices = [positions.get(field) for field in API_FIELDS]
 
-    # Extract all rows in the table
     all_rows = []
-    rows = table.find('tbody').find_all('tr')
-    for row in rows:
-        columns = row.find_all('td')
-        row_data = [col.text.strip() if col.text.strip() else "-" for col in columns]
+    for api_row in result_set['rowSet']:
+        row_data = [format_value(api_row[i]) if i is not None else "-" for i in indices]
         row_data.append(season_year)  # Add season year as a new column
         all_rows.append(row_data)
 
-    # Convert rows to DataFrame
-    df = pd.DataFrame(all_rows, columns=["Player Name", "Position", "Lane Agility", "Shuttle Run", "Three Quarter Sprint", "Standing Vertical", "Max Vertical", "Bench Press", "Season Year"])
-
-    # Append to global DataFrame
-    all_data = pd.concat([all_data, df], ignore_index=True)
     print(f"Data for season {season_year} added.")
+    return all_rows
 
 # Main function to iterate through all seasons
 def scrape_all_seasons(start_year, end_year):
     for year in range(start_year, end_year + 1):
         season_year = f"{year}-{str(year + 1)[-2:]}"
-        print(f"Scraping season: {season_year}")
-        scrape_all_rows(season_year)
+        all_rows_global.extend(scrape_all_rows(season_year))
         time.sleep(1)  # Brief pause between requests to avoid overwhelming the server
 
-    # Save the combined data to a single CSV file
+    # Build the combined DataFrame once and save it to a single CSV file
+    all_data = pd.DataFrame(all_rows_global, columns=COLUMNS)
     all_data.to_csv("combine_agility_all_seasons.csv", index=False)
     print("All seasons' data saved to combine_agility_all_seasons.csv.")
 
 # Example usage: scrape from 2000-01 to 2024-25
 if __name__ == '__main__':
-    scrape_all_seasons(2000, 2024)
\ No newline at end of file
+    scrape_all_seasons(2000, 2024)
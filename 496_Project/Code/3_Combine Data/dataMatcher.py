@@ -16,35 +16,36 @@ Requirements:
 import pandas as pd
 
 # Load draft history data
-draft_data = pd.read_csv("nba_draft_history.csv")
+draft_data = pd.read_csv("nba_draft_history.csv", dtype={"Player": "string[pyarrow]"})
 
 # Load combined agility data
-combine_data = pd.read_csv("combine_agility_all_seasons.csv")
+combine_data = pd.read_csv("combine_agility_all_seasons.csv", dtype={"Player Name": "string[pyarrow]", "Season Year": "string[pyarrow]"})
 
-# Initialize a DataFrame to store matched data
-matched_data = pd.DataFrame()
+# Build the combine "Season Year" key (e.g. 2019 -> "2019-20") for every draft pick at once
+season_year = (draft_data["Draft Year"].astype(str) + "-" + (draft_data["Draft Year"] + 1).astype(str).str[-2:]).astype("string[pyarrow]")
 
 # Counter for matches found
 total_lottery_picks = len(draft_data)
-matched_lottery_picks = 0
-
-# Loop over each draft pick in the history file
-for _, draft_row in draft_data.iterrows():
-    draft_year = draft_row["Draft Year"]
-    player_name = draft_row["Player"]
-
-    # Check if the player's name and draft year match in the combine data
-    player_data = combine_data[(combine_data["Player Name"] == player_name) & (combine_data["Season Year"] == f"{draft_year}-{str(draft_year + 1)[-2:]}")]
-
-    # If a match is found, add the data
-    if not player_data.empty:
-        combined_row = pd.concat([draft_row, player_data.iloc[0]], axis=0)
-        matched_data = matched_data.append(combined_row, ignore_index=True)
-        matched_lottery_picks += 1  # Increment match count
-        print(f"Found data for {player_name} in season {draft_year}-{str(draft_year + 1)[-2:]}")
+
+# Join each draft pick to its combine row in one hash join, keeping the first combine row per player/season
+merged = draft_data.merge(
+    combine_data.drop_duplicates(subset=["Player Name", "Season Year"]),
+    how="left",
+    left_on=["Player", season_year],
+    right_on=["Player Name", "Season Year"],
+    indicator=True,
+)
+found = (merged.pop("_merge") == "both").to_numpy()
+
+for player_name, draft_year, season, is_found in zip(draft_data["Player"], draft_data["Draft Year"], season_year, found):
+    if is_found:
+        print(f"Found data for {player_name} in season {season}")
     else:
         print(f"No combine data found for {player_name} in draft year {draft_year}")
 
+matched_data = merged[found]
+matched_lottery_picks = len(matched_data)
+
 # Calculate the match percentage
 match_percentage = (matched_lottery_picks / total_lottery_picks) * 100
 print(f"\nPercentage of lottery picks captured in combine agility data: {match_percentage:.2f}%")
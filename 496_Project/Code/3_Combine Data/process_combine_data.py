@@ -22,15 +22,15 @@ def load_data(file_path):
         return None
 
 
+NUMERIC_COLUMNS = ['Lane Agility', 'Shuttle Run', 'Three Quarter Sprint', 'Standing Vertical', 'Max Vertical',
+                   'Bench Press']
+
+
 def clean_data(data):
     """Clean the combine data by handling missing values and standardizing formats."""
-    data.fillna("-", inplace=True)  # Replace NaN values with "-"
-    data['Lane Agility'] = pd.to_numeric(data['Lane Agility'], errors='coerce')  # Convert to numeric
-    data['Shuttle Run'] = pd.to_numeric(data['Shuttle Run'], errors='coerce')
-    data['Three Quarter Sprint'] = pd.to_numeric(data['Three Quarter Sprint'], errors='coerce')
-    data['Standing Vertical'] = pd.to_numeric(data['Standing Vertical'], errors='coerce')
-    data['Max Vertical'] = pd.to_numeric(data['Max Vertical'], errors='coerce')
-    data['Bench Press'] = pd.to_numeric(data['Bench Press'], errors='coerce')
+    data[NUMERIC_COLUMNS] = data[NUMERIC_COLUMNS].apply(pd.to_numeric, errors='coerce')  # Convert to numeric
+    text_columns = data.columns.difference(NUMERIC_COLUMNS, sort=False)
+    data[text_columns] = data[text_columns].fillna("-")  # Replace NaN values with "-"
     return data
 
 
@@ -6,11 +6,15 @@ Author: Christopher Reid
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
+from sklearn.compose import ColumnTransformer
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.impute import SimpleImputer
 from sklearn.metrics import classification_report, accuracy_score
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import OneHotEncoder
 from imblearn.over_sampling import SMOTE
+from imblearn.pipeline import Pipeline
 from collections import Counter
-import matplotlib.pyplot as plt
 
 # Define file paths
 combine_agility_path = "./combine_agility_all_seasons.csv"
@@ -32,9 +36,6 @@ all_players = pd.merge(player_stats_df, draft_history_df, on='Player', how='left
     .merge(rooks_df[['Player', 'Second Contract']], on='Player', how='left')
 all_players['Second Contract'] = all_players['Second Contract'].fillna(0)  # Fill NaN for players without a second contract
 
-# Drop rows with missing values in key features
-all_players = all_players.dropna()
-
 # Define features and target
 features = all_players.drop(columns=['Player', 'Second Contract'])  # Drop non-feature columns
 target = all_players['Second Contract']
@@ -42,50 +43,71 @@ target = all_players['Second Contract']
 # Ensure target is numeric
 target = target.astype(int)
 
-# Identify and encode categorical columns in features
-categorical_cols = features.select_dtypes(include=['object']).columns
+# Split columns by type; missing values are imputed in the pipeline instead of dropping whole rows
+numerical_cols = features.select_dtypes(include=['number']).columns
+categorical_cols = features.columns.difference(numerical_cols, sort=False)
 print("Categorical columns:", categorical_cols)
 
-# Apply one-hot encoding to categorical columns
-features = pd.get_dummies(features, columns=categorical_cols, drop_first=True)
+# Impute numeric columns and one-hot encode categorical columns into a sparse matrix
+preprocess = ColumnTransformer([
+    ('num', SimpleImputer(strategy='median'), numerical_cols),
+    ('cat', OneHotEncoder(handle_unknown='ignore', sparse_output=True, drop='first'), categorical_cols),
+], verbose_feature_names_out=False)
 
-# Debugging: Check transformed features
-print("Transformed features shape:", features.shape)
-print("First few rows of features after encoding:")
-print(features.head())
+# Import pyplot on first use with the headless Agg backend, so training never waits on a GUI window
+def get_pyplot():
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
 
 # Visualize class distribution before SMOTE
-def plot_class_distribution(target, title="Class Distribution Before SMOTE"):
+def plot_class_distribution(target, title="Class Distribution Before SMOTE",
+                            output_path="class_distribution_before_smote.png"):
+    plt = get_pyplot()
     class_counts = Counter(target)
-    plt.bar(class_counts.keys(), class_counts.values(), color=['blue', 'orange'])
-    plt.title(title)
-    plt.xlabel('Class')
-    plt.ylabel('Count')
-    plt.xticks([0, 1], ['No Second Contract', 'Second Contract'])
-    plt.show()
+    fig, ax = plt.subplots()
+    ax.bar(class_counts.keys(), class_counts.values(), color=['blue', 'orange'])
+    ax.set_title(title)
+    ax.set_xlabel('Class')
+    ax.set_ylabel('Count')
+    ax.set_xticks([0, 1], ['No Second Contract', 'Second Contract'])
+    fig.savefig(output_path, dpi=120, bbox_inches='tight')
+    plt.close(fig)
 
 plot_class_distribution(target)
 
+# Split the data into train and test sets; SMOTE only resamples the training rows inside the pipeline
+X_train, X_test, y_train, y_test = train_test_split(features, target, test_size=0.2, random_state=42)
+
 # Handle class imbalance with conditional SMOTE
-class_counts = Counter(target)
+class_counts = Counter(y_train)
 print("Class distribution before SMOTE:", class_counts)
 
 if class_counts[0] < 2:  # If minority class has fewer than 2 samples
     print("Skipping SMOTE due to insufficient minority class samples.")
-    X_resampled, y_resampled = features, target
+    smote = 'passthrough'
 else:
-    smote = SMOTE(random_state=42, k_neighbors=min(1, class_counts[0] - 1))
-    X_resampled, y_resampled = smote.fit_resample(features, target)
-    print("Class distribution after SMOTE:", Counter(y_resampled))
-    plot_class_distribution(y_resampled, title="Class Distribution After SMOTE")
-
-# Split the resampled data into train and test sets
-X_train, X_test, y_train, y_test = train_test_split(X_resampled, y_resampled, test_size=0.2, random_state=42)
-
-# Train a Random Forest classifier
-model = RandomForestClassifier(random_state=42)
+    # Exact k-d tree neighbor search over the imputed numeric + one-hot features (self counts as one neighbor)
+    neighbors = NearestNeighbors(n_neighbors=min(1, class_counts[0] - 1) + 1, algorithm='kd_tree')
+    smote = SMOTE(random_state=42, k_neighbors=neighbors)
+
+# Preprocess, resample and train a Random Forest classifier in one pipeline
+model = Pipeline([
+    ('prep', preprocess),
+    ('smote', smote),
+    ('rf', RandomForestClassifier(random_state=42, n_jobs=-1)),
+])
 model.fit(X_train, y_train)
 
+# Report the class counts SMOTE actually produced, resampling the preprocessed training rows the same way the
+# pipeline did (same random_state)
+if smote != 'passthrough':
+    _, y_resampled = smote.fit_resample(model.named_steps['prep'].transform(X_train), y_train)
+    print("Class distribution after SMOTE:", Counter(y_resampled))
+    plot_class_distribution(y_resampled, title="Class Distribution After SMOTE",
+                            output_path="class_distribution_after_smote.png")
+
 # Make predictions
 y_pred = model.predict(X_test)
 
@@ -96,9 +118,9 @@ print("Classification Report:")
 print(classification_report(y_test, y_pred))
 
 # Determine feature importances
-importances = model.feature_importances_
+importances = model.named_steps['rf'].feature_importances_
 importance_df = pd.DataFrame({
-    'Feature': features.columns,
+    'Feature': model.named_steps['prep'].get_feature_names_out(),
     'Importance': importances
 }).sort_values(by='Importance', ascending=False)
 
@@ -106,13 +128,15 @@ print("Feature Importances:")
 print(importance_df)
 
 # Visualize top feature importances
-def plot_feature_importances(importance_df, top_n=10):
+def plot_feature_importances(importance_df, top_n=10, output_path="feature_importances.png"):
+    plt = get_pyplot()
     top_features = importance_df.head(top_n)
-    plt.figure(figsize=(10, 6))
-    plt.barh(top_features['Feature'], top_features['Importance'], color='teal')
-    plt.title('Top Feature Importances')
-    plt.xlabel('Importance')
-    plt.gca().invert_yaxis()  # To display the most important feature on top
-    plt.show()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.barh(top_features['Feature'], top_features['Importance'], color='teal')
+    ax.set_title('Top Feature Importances')
+    ax.set_xlabel('Importance')
+    ax.invert_yaxis()  # To display the most important feature on top
+    fig.savefig(output_path, dpi=120, bbox_inches='tight')
+    plt.close(fig)
 
 plot_feature_importances(importance_df)
\ No newline at end of file
@@ -9,29 +9,37 @@ Purpose: This script merges college player stats with rookie contract extension
 import os
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import train_test_split, StratifiedKFold, cross_validate
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report, roc_curve, auc
 from sklearn.preprocessing import StandardScaler
 from sklearn.feature_selection import RFE
-import matplotlib.pyplot as plt
 
 # Define relative file paths based on the current script directory
 base_dir = os.path.dirname(__file__)
 player_stats_path = os.path.join(base_dir, "player_stats.csv")
 rookie_contracts_path = os.path.join(base_dir, "rooks_all_time.csv")
 
-# Load the datasets
+# Features for the model
+features = [
+    "Seasons Played", "G", "GS", "MP", "FG", "FGA", "FG%", "3P", "3PA", "3P%", "2P", "2PA",
+    "2P%", "eFG%", "FT", "FTA", "FT%", "ORB", "DRB", "TRB", "AST", "STL", "BLK", "TOV", "PF", "PTS"
+]
+
+# Load the datasets, parsing only the columns used below with their types given up front
 print("Loading datasets...")
-player_stats = pd.read_csv(player_stats_path)
-rookie_contracts = pd.read_csv(rookie_contracts_path)
+# The multi-threaded Arrow reader handles the contracts file; player_stats.csv has ragged rows it rejects
+player_stats = pd.read_csv(player_stats_path, usecols=['Player'] + features,
+                           dtype={'Player': 'string', **dict.fromkeys(features, 'float64')})
+rookie_contracts = pd.read_csv(rookie_contracts_path, engine='pyarrow', usecols=['Player', 'Value'])
 
 # Clean up the `Value` column in rookie_contracts
 print("Cleaning contract values...")
 rookie_contracts['Value'] = (
     rookie_contracts['Value']
-    .replace(r'[\$,]', '', regex=True)
-    .astype(float)
+    .astype('string[pyarrow]')  # Arrow-backed strings run the regex replace in C over the whole column
+    .str.replace(r'[\$,]', '', regex=True)
+    .astype('float64')
 )
 
 # Merge datasets on Player name
@@ -52,12 +60,6 @@ print(merged_data['Earned_Second_Contract'].value_counts())
 if merged_data['Earned_Second_Contract'].nunique() < 2:
     raise ValueError("The dataset must include samples from both classes (0 and 1).")
 
-# Features for the model
-features = [
-    "Seasons Played", "G", "GS", "MP", "FG", "FGA", "FG%", "3P", "3PA", "3P%", "2P", "2PA",
-    "2P%", "eFG%", "FT", "FTA", "FT%", "ORB", "DRB", "TRB", "AST", "STL", "BLK", "TOV", "PF", "PTS"
-]
-
 # Drop rows with missing data in features
 merged_data = merged_data.dropna(subset=features)
 
@@ -68,21 +70,25 @@ y = merged_data['Earned_Second_Contract']
 scaler = StandardScaler()
 X_scaled = scaler.fit_transform(X)
 
-# Train-test split
-X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, test_size=0.2, random_state=42, stratify=y)
+# Train-test split (on row indices, so the holdout fit can share a parallel batch with the CV folds)
+train_idx, test_idx = train_test_split(np.arange(len(y)), test_size=0.2, random_state=42, stratify=y)
+X_train, X_test, y_train, y_test = X_scaled[train_idx], X_scaled[test_idx], y.iloc[train_idx], y.iloc[test_idx]
 
-# Build logistic regression model
+# Build logistic regression model, fitting it on the training split together with the
+# 5 cross-validation folds in one parallel cross_validate call
 print("\nTraining logistic regression model...")
-logistic_model = LogisticRegression(random_state=42, max_iter=1000)
-logistic_model.fit(X_train, y_train)
+splits = [(train_idx, test_idx), *StratifiedKFold(n_splits=5).split(X_scaled, y)]
+cv_results = cross_validate(LogisticRegression(random_state=42, max_iter=1000), X_scaled, y, cv=splits,
+                            scoring='accuracy', n_jobs=-1, return_estimator=True)
+logistic_model = cv_results['estimator'][0]
 
 # Predictions and evaluation
 y_pred = logistic_model.predict(X_test)
 print("\nClassification Report:")
 print(classification_report(y_test, y_pred))
 
-# Cross-validation
-cv_scores = cross_val_score(logistic_model, X_scaled, y, cv=5, scoring='accuracy')
+# Cross-validation (the first split is the holdout fit, not a fold)
+cv_scores = cv_results['test_score'][1:]
 print(f"\nCross-Validation Accuracy: {np.mean(cv_scores):.2f} ± {np.std(cv_scores):.2f}")
 
 # Feature importance
@@ -108,6 +114,11 @@ y_prob = logistic_model.predict_proba(X_test)[:, 1]
 fpr, tpr, thresholds = roc_curve(y_test, y_prob)
 roc_auc = auc(fpr, tpr)
 
+# Plotting is only needed here, so matplotlib is imported late with the headless Agg backend
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
 plt.figure(figsize=(8, 6))
 plt.plot(fpr, tpr, color='blue', lw=2, label=f"ROC Curve (AUC = {roc_auc:.2f})")
 plt.plot([0, 1], [0, 1], color='gray', lw=2, linestyle='--')
@@ -116,4 +127,5 @@ plt.ylabel("True Positive Rate")
 plt.title("ROC Curve")
 plt.legend(loc="lower right")
 plt.grid()
-plt.show()
\ No newline at end of file
+plt.savefig(os.path.join(base_dir, "roc_curve.png"), dpi=120, bbox_inches='tight')
+plt.close()
\ No newline at end of file
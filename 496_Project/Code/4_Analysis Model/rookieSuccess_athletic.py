@@ -14,9 +14,11 @@ Supporting Data files:
 
 import os
 import pandas as pd
+import numpy as np
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report
+from sklearn.neighbors import NearestNeighbors
 from sklearn.preprocessing import StandardScaler
 from imblearn.over_sampling import SMOTE
 
@@ -26,25 +28,46 @@ player_stats_path = os.path.join(base_dir, "player_stats.csv")
 rookie_contracts_path = os.path.join(base_dir, "rooks_all_time.csv")
 combine_agility_path = os.path.join(base_dir, "combine_agility_all_seasons.csv")
 
-# Load the datasets
+# College stats and combine drills used as model features
+stat_columns = [
+    "Seasons Played", "G", "GS", "MP", "FG", "FGA", "FG%", "3P", "3PA", "3P%",
+    "2P", "2PA", "2P%", "eFG%", "FT", "FTA", "FT%", "ORB", "DRB", "TRB", "AST",
+    "STL", "BLK", "TOV", "PF", "PTS"
+]
+athletic_columns = [
+    "Lane Agility", "Shuttle Run", "Three Quarter Sprint",
+    "Standing Vertical", "Max Vertical", "Bench Press"
+]
+
+# Load the datasets, parsing only the columns used below
 print("Loading datasets...")
-player_stats = pd.read_csv(player_stats_path)
-rookie_contracts = pd.read_csv(rookie_contracts_path)
-combine_agility = pd.read_csv(combine_agility_path)
+player_stats = pd.read_csv(player_stats_path, usecols=['Player'] + stat_columns,
+                           dtype={'Player': 'string', **dict.fromkeys(stat_columns, 'float64')})
+rookie_contracts = pd.read_csv(rookie_contracts_path, usecols=['Player', 'Value'], dtype='string')
+combine_agility = pd.read_csv(combine_agility_path, usecols=lambda column: column in {'Player', *athletic_columns},
+                              dtype={'Player': 'string'})
+
+# Factorize the Player names of all three datasets into one shared integer id, so the merges
+# and the duplicate handling below hash int32 codes instead of re-hashing the name strings
+player_ids, _ = pd.factorize(pd.concat(
+    [player_stats['Player'], rookie_contracts['Player'], combine_agility['Player']], ignore_index=True))
+player_stats['_pid'], rookie_contracts['_pid'], combine_agility['_pid'] = np.split(
+    player_ids.astype('int32'), np.cumsum([len(player_stats), len(rookie_contracts)]))
 
 # Clean up the `Value` column in rookie_contracts
 print("Cleaning contract values...")
 rookie_contracts['Value'] = (
     rookie_contracts['Value']
-    .replace(r'[\$,]', '', regex=True)
-    .astype(float)
+    .astype('string[pyarrow]')  # Arrow-backed strings run the regex replace in C over the whole column
+    .str.replace(r'[\$,]', '', regex=True)
+    .astype('float64')
 )
 
-# Merge player stats and rookie contracts on "Player"
+# Merge player stats and rookie contracts on the shared player id
 print("Combining player stats with rookie contracts...")
 threshold = 5000000  # Threshold for significant contracts
 print(f"Using contract value threshold: ${threshold}")
-player_stats = pd.merge(player_stats, rookie_contracts[['Player', 'Value']], on="Player", how="left")
+player_stats = pd.merge(player_stats, rookie_contracts[['_pid', 'Value']], on="_pid", how="left")
 player_stats['Value'] = player_stats['Value'].fillna(0)
 player_stats['Earned_Second_Contract'] = (player_stats['Value'] > threshold).astype(int)
 
@@ -52,40 +75,37 @@ player_stats['Earned_Second_Contract'] = (player_stats['Value'] > threshold).ast
 print("Class distribution for Earned_Second_Contract:")
 print(player_stats['Earned_Second_Contract'].value_counts())
 
-# Handle duplicates in combine_agility
-print("Handling duplicates in combine_agility...")
-combine_agility = combine_agility.groupby("Player", as_index=False).mean()
-
 # Add athletic metrics to player stats
-athletic_columns = [
-    "Lane Agility", "Shuttle Run", "Three Quarter Sprint",
-    "Standing Vertical", "Max Vertical", "Bench Press"
-]
 missing_columns = [col for col in athletic_columns if col not in combine_agility.columns]
 if missing_columns:
     print(f"Missing columns in combine_agility: {missing_columns}")
 else:
     print("All athletic columns present in combine_agility.")
+present_columns = [col for col in athletic_columns if col in combine_agility.columns]
+
+# Handle duplicates in combine_agility ("-" marks a drill the player skipped)
+print("Handling duplicates in combine_agility...")
+combine_agility[present_columns] = combine_agility[present_columns].apply(pd.to_numeric, errors='coerce')
+if combine_agility['_pid'].is_unique:
+    combine_agility = combine_agility[['_pid'] + present_columns]  # Nothing to average
+else:
+    combine_agility = combine_agility.groupby("_pid", as_index=False, sort=False)[present_columns].mean()
 
 print("Adding athletic metrics...")
-for column in athletic_columns:
-    if column in combine_agility.columns:
-        player_stats[column] = player_stats['Player'].map(
-            combine_agility.set_index('Player Name')[column]
-        )
-    else:
-        print(f"Skipping missing column: {column}")
+for column in missing_columns:
+    print(f"Skipping missing column: {column}")
+player_stats = player_stats.merge(combine_agility, on="_pid", how="left", validate="m:1")
 
 # Features for the model
-features = [
-    "Seasons Played", "G", "GS", "MP", "FG", "FGA", "FG%", "3P", "3PA", "3P%",
-    "2P", "2PA", "2P%", "eFG%", "FT", "FTA", "FT%", "ORB", "DRB", "TRB", "AST",
-    "STL", "BLK", "TOV", "PF", "PTS"
-] + [col for col in athletic_columns if col in player_stats.columns]
+features = stat_columns + [col for col in athletic_columns if col in player_stats.columns]
 
 # Ensure all features are numeric
 print("Converting features to numeric...")
-player_stats[features] = player_stats[features].apply(pd.to_numeric, errors='coerce')
+# The stats are parsed as float64 and the drill averages come out of the groupby as float64, so
+# only a column that somehow arrives with another dtype still needs the per-column conversion
+non_numeric = [col for col in features if not pd.api.types.is_numeric_dtype(player_stats[col])]
+if non_numeric:
+    player_stats[non_numeric] = player_stats[non_numeric].apply(pd.to_numeric, errors='coerce')
 
 # Drop rows with missing or invalid data in the features
 print("Dropping rows with missing values in features...")
@@ -102,16 +122,23 @@ X_scaled = scaler.fit_transform(X)
 # Address class imbalance
 print("Balancing the dataset...")
 try:
-    smote = SMOTE(random_state=42, k_neighbors=1)  # Adjust k_neighbors to avoid errors
+    # One neighbor per minority sample (plus the sample itself), found with an exact k-d tree
+    # instead of the brute-force search sklearn picks for this many features
+    neighbors = NearestNeighbors(n_neighbors=2, algorithm='kd_tree')
+    smote = SMOTE(random_state=42, k_neighbors=neighbors)  # Adjust k_neighbors to avoid errors
     X_balanced, y_balanced = smote.fit_resample(X_scaled, y)
 except ValueError:
     print("SMOTE failed due to extreme imbalance. Using duplication instead.")
     minority_class = player_stats[player_stats['Earned_Second_Contract'] == 0]
     majority_class = player_stats[player_stats['Earned_Second_Contract'] == 1]
-    minority_duplicated = pd.concat([minority_class] * (len(majority_class) // len(minority_class)), ignore_index=True)
-    balanced_data = pd.concat([majority_class, minority_duplicated], ignore_index=True)
-    X_balanced = balanced_data[features]
-    y_balanced = balanced_data['Earned_Second_Contract']
+    copies = len(majority_class) // max(len(minority_class), 1)
+    # Stack the majority rows and the tiled minority rows into one preallocated array
+    X_balanced = np.vstack([majority_class[features].to_numpy(),
+                            np.tile(minority_class[features].to_numpy(), (copies, 1))])
+    y_balanced = np.repeat([1, 0], [len(majority_class), copies * len(minority_class)])
+
+# Hand the solver one C-contiguous float64 array so the fit and every CV fold skip check_array's conversion copy
+X_balanced = np.ascontiguousarray(X_balanced, dtype=np.float64)
 
 # Train-test split
 print("Splitting data into training and testing sets...")
@@ -131,7 +158,7 @@ print(classification_report(y_test, y_pred))
 
 # Cross-validation
 print("\nPerforming stratified cross-validation...")
-cross_val_scores = cross_val_score(logistic_model, X_balanced, y_balanced, cv=5, scoring='accuracy')
+cross_val_scores = cross_val_score(logistic_model, X_balanced, y_balanced, cv=5, scoring='accuracy', n_jobs=-1)
 print(f"Cross-Validation Accuracy: {cross_val_scores.mean():.2f} ± {cross_val_scores.std():.2f}")
 
 # Feature importance
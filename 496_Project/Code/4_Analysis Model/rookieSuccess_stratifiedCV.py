@@ -7,29 +7,36 @@ Purpose: This script analyzes factors predicting whether a rookie earns a second
 
 import os
 import pandas as pd
-from sklearn.model_selection import train_test_split, StratifiedKFold, cross_val_score
+from sklearn.model_selection import train_test_split, StratifiedKFold, cross_validate
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report, roc_auc_score, roc_curve
 from sklearn.preprocessing import StandardScaler
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Define relative file paths based on the current script directory
 base_dir = os.path.dirname(__file__)
 player_stats_path = os.path.join(base_dir, "player_stats.csv")
 rookie_contracts_path = os.path.join(base_dir, "rooks_all_time.csv")
 
-# Load the datasets
+# Features for the model
+features = [
+    "Seasons Played", "G", "GS", "MP", "FG", "FGA", "FG%", "3P", "3PA", "3P%", "2P", "2PA",
+    "2P%", "eFG%", "FT", "FTA", "FT%", "ORB", "DRB", "TRB", "AST", "STL", "BLK", "TOV", "PF", "PTS"
+]
+
+# Load the datasets, parsing only the columns used below with their types given up front
 print("Loading datasets...")
-player_stats = pd.read_csv(player_stats_path)
-rookie_contracts = pd.read_csv(rookie_contracts_path)
+player_stats = pd.read_csv(player_stats_path, usecols=['Player'] + features,
+                           dtype={'Player': 'string', **dict.fromkeys(features, 'float64')})
+rookie_contracts = pd.read_csv(rookie_contracts_path, usecols=['Player', 'Value'], dtype='string')
 
 # Clean up the `Value` column in rookie_contracts
 print("Cleaning contract values...")
 rookie_contracts['Value'] = (
     rookie_contracts['Value']
-    .replace(r'[\$,]', '', regex=True)
-    .astype(float)
+    .astype('string[pyarrow]')  # Arrow-backed strings run the regex replace in C over the whole column
+    .str.replace(r'[\$,]', '', regex=True)
+    .astype('float64')
 )
 
 # Merge datasets on Player name
@@ -42,12 +49,6 @@ merged_data['Earned_Second_Contract'] = (merged_data['Value'] > 1000000).astype(
 print("\nClass Distribution in Earned_Second_Contract:")
 print(merged_data['Earned_Second_Contract'].value_counts())
 
-# Features for the model
-features = [
-    "Seasons Played", "G", "GS", "MP", "FG", "FGA", "FG%", "3P", "3PA", "3P%", "2P", "2PA",
-    "2P%", "eFG%", "FT", "FTA", "FT%", "ORB", "DRB", "TRB", "AST", "STL", "BLK", "TOV", "PF", "PTS"
-]
-
 # Drop rows with missing data in features
 merged_data = merged_data.dropna(subset=features)
 
@@ -58,23 +59,26 @@ y = merged_data['Earned_Second_Contract']
 scaler = StandardScaler()
 X_scaled = scaler.fit_transform(X)
 
-# Train-test split
-X_train, X_test, y_train, y_test = train_test_split(
-    X_scaled, y, test_size=0.2, random_state=42, stratify=y
-)
+# Train-test split (on row indices, so the holdout fit can share a parallel batch with the CV folds)
+train_idx, test_idx = train_test_split(np.arange(len(y)), test_size=0.2, random_state=42, stratify=y)
+X_train, X_test, y_train, y_test = X_scaled[train_idx], X_scaled[test_idx], y.iloc[train_idx], y.iloc[test_idx]
 
 # Logistic regression with class weights
 logistic_model = LogisticRegression(random_state=42, max_iter=1000, class_weight='balanced')
 
-# Stratified cross-validation
+# Stratified cross-validation; the model is also trained on the training split as the first
+# split of the same cross_validate call, so all six fits run in one parallel batch
 print("\nPerforming stratified cross-validation...")
 stratified_kfold = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-cv_scores = cross_val_score(logistic_model, X_scaled, y, cv=stratified_kfold, scoring='accuracy')
+splits = [(train_idx, test_idx), *stratified_kfold.split(X_scaled, y)]
+cv_results = cross_validate(logistic_model, X_scaled, y, cv=splits, scoring='accuracy', n_jobs=-1,
+                            return_estimator=True)
+cv_scores = cv_results['test_score'][1:]
 
 print(f"\nCross-Validation Accuracy: {np.mean(cv_scores):.2f} ± {np.std(cv_scores):.2f}")
 
-# Train logistic regression model on training data
-logistic_model.fit(X_train, y_train)
+# Logistic regression model trained on the training data
+logistic_model = cv_results['estimator'][0]
 
 # Predictions and evaluation
 y_pred = logistic_model.predict(X_test)
@@ -97,6 +101,11 @@ y_prob = logistic_model.predict_proba(X_test)[:, 1]
 roc_auc = roc_auc_score(y_test, y_prob)
 fpr, tpr, thresholds = roc_curve(y_test, y_prob)
 
+# Plotting is only needed here, so matplotlib is imported late with the headless Agg backend
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
 plt.figure()
 plt.plot(fpr, tpr, label=f"Logistic Regression (AUC = {roc_auc:.2f})")
 plt.plot([0, 1], [0, 1], 'k--')
@@ -104,4 +113,5 @@ plt.xlabel("False Positive Rate")
 plt.ylabel("True Positive Rate")
 plt.title("ROC Curve")
 plt.legend(loc="lower right")
-plt.show()
\ No newline at end of file
+plt.savefig(os.path.join(base_dir, "roc_curve.png"), dpi=120, bbox_inches='tight')
+plt.close()
\ No newline at end of file
@@ -3,39 +3,36 @@
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
 from sklearn.metrics import r2_score
-from scipy import stats
+from scipy import linalg, stats
 
 
-# Function to calculate standard errors, t-values, and p-values
-def regression_diagnostics(X, y, model):
+# Function to fit the regression and calculate standard errors, t-values, and p-values
+def regression_diagnostics(X, y):
     n = len(y)  # Number of observations
     p = X.shape[1]  # Number of predictors (including intercept)
 
-    # Make predictions
-    y_pred = model.predict(X)
+    # Least squares through the QR factorization X = QR: solving R b = Q'y gives the coefficients
+    # (intercept + predictors), and the same R supplies the standard errors below
+    X_with_intercept = np.hstack([np.ones((X.shape[0], 1)), X])  # Add intercept
+    Q, R = np.linalg.qr(X_with_intercept)
+    coefficients = linalg.solve_triangular(R, Q.T @ np.asarray(y))
 
-    # Calculate residuals
-    residuals = y - y_pred
+    # Calculate residuals directly from the design matrix and the fitted coefficients
+    residuals = np.asarray(y) - X_with_intercept @ coefficients
 
     # Estimate variance of the residuals
     residual_sum_of_squares = np.sum(residuals ** 2)
     sigma_squared = residual_sum_of_squares / (n - p)
 
-    # Calculate the variance-covariance matrix
-    X_with_intercept = np.hstack([np.ones((X.shape[0], 1)), X])  # Add intercept
-    cov_matrix = sigma_squared * np.linalg.inv(X_with_intercept.T @ X_with_intercept)
-
-    # Standard errors of the coefficients
-    std_err = np.sqrt(np.diag(cov_matrix))
-
-    # Coefficients (intercept + predictors)
-    coefficients = np.insert(model.coef_, 0, model.intercept_)  # Add intercept to coefficients
+    # Standard errors from the same factorization: (X'X)^-1 = R^-1 R^-T, so each variance is
+    # sigma^2 times a squared row norm of R^-1 and X'X is never formed or inverted
+    R_inv = linalg.solve_triangular(R, np.eye(R.shape[0]))
+    std_err = np.sqrt(sigma_squared * np.sum(R_inv ** 2, axis=1))
 
     # Calculate t-values and p-values
     t_values = coefficients / std_err
-    p_values = 2 * (1 - stats.t.cdf(np.abs(t_values), df=n - p))
+    p_values = 2.0 * stats.t.sf(np.abs(t_values), df=n - p)  # Survival function keeps precision in the tails
 
     return coefficients, std_err, t_values, p_values
 
@@ -43,19 +40,17 @@ def regression_diagnostics(X, y, model):
 # Read in the data from the CSV file
 data = pd.read_csv('NFLdata21-23.csv')
 
+# Split the games once; every model below is fit on the same training rows
+train_data, test_data = train_test_split(data, test_size=0.2, random_state=42)
+
 # Define the target variable (Margin)
-y = data['Margin']  # Target variable (net point differential)
+y_train = train_data['Margin']  # Target variable (net point differential)
 
 # --- FULL MODEL ---
-X_full = data[['PY_A', 'RY_A', 'DPY_A', 'DRY_A', 'PENDIF', 'RETTD', 'TO', 'DTO']]  # Offense and defense stats
-X_train_full, X_test_full, y_train_full, y_test_full = train_test_split(X_full, y, test_size=0.2, random_state=42)
-
-model_full = LinearRegression()
-model_full.fit(X_train_full, y_train_full)
+X_train_full = train_data[['PY_A', 'RY_A', 'DPY_A', 'DRY_A', 'PENDIF', 'RETTD', 'TO', 'DTO']]  # Offense and defense stats
 
-# Perform diagnostics for the full model
-coefficients_full, std_err_full, t_values_full, p_values_full = regression_diagnostics(X_train_full, y_train_full,
-                                                                                       model_full)
+# Fit the full model and perform its diagnostics
+coefficients_full, std_err_full, t_values_full, p_values_full = regression_diagnostics(X_train_full, y_train)
 
 # Output for full model
 print("\n--- Full Model Regression Diagnostics ---")
@@ -67,14 +62,10 @@ for var, coef, se, t_val, p_val in zip(variables_full, coefficients_full, std_er
     print(f"{var:<30}{coef:>12.4f}{se:>12.4f}{t_val:>12.4f}{p_val:>12.4f}")
 
 # --- RUN STATS ONLY ---
-X_run = data[['RY_A', 'DRY_A']]
-X_train_run, X_test_run, y_train_run, y_test_run = train_test_split(X_run, y, test_size=0.2, random_state=42)
+X_train_run = train_data[['RY_A', 'DRY_A']]
 
-model_run = LinearRegression()
-model_run.fit(X_train_run, y_train_run)
-
-# Perform diagnostics for the run stats model
-coefficients_run, std_err_run, t_values_run, p_values_run = regression_diagnostics(X_train_run, y_train_run, model_run)
+# Fit the run stats model and perform its diagnostics
+coefficients_run, std_err_run, t_values_run, p_values_run = regression_diagnostics(X_train_run, y_train)
 
 # Output for run stats model
 print("\n--- Run Stats Model Regression Diagnostics (RY_A, DRY_A) ---")
@@ -84,15 +75,10 @@ for var, coef, se, t_val, p_val in zip(variables_run, coefficients_run, std_err_
     print(f"{var:<30}{coef:>12.4f}{se:>12.4f}{t_val:>12.4f}{p_val:>12.4f}")
 
 # --- PASS STATS ONLY (PY_A and DPY_A) ---
-X_pass = data[['PY_A', 'DPY_A']]
-X_train_pass, X_test_pass, y_train_pass, y_test_pass = train_test_split(X_pass, y, test_size=0.2, random_state=42)
-
-model_pass = LinearRegression()
-model_pass.fit(X_train_pass, y_train_pass)
+X_train_pass = train_data[['PY_A', 'DPY_A']]
 
-# Perform diagnostics for the pass stats model
-coefficients_pass, std_err_pass, t_values_pass, p_values_pass = regression_diagnostics(X_train_pass, y_train_pass,
-                                                                                       model_pass)
+# Fit the pass stats model and perform its diagnostics
+coefficients_pass, std_err_pass, t_values_pass, p_values_pass = regression_diagnostics(X_train_pass, y_train)
 
 # Output for pass stats model
 print("\n--- Pass Stats Model Regression Diagnostics (PY_A, DPY_A) ---")
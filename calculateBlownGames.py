@@ -19,68 +19,73 @@ After processing, the script outputs:
 
 import os
 import sys
-import pandas as pd
-from collections import defaultdict
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+from concurrent.futures import ThreadPoolExecutor
+
+# Only these columns are parsed from each game file, with fixed types so every table concatenates cleanly;
+# posteam is dictionary-encoded (the Arrow form of a category) so the team grouping hashes integer codes
+REQUIRED_COLUMNS = ['wp', 'posteam', 'winner']
+CONVERT_OPTIONS = pacsv.ConvertOptions(
+    include_columns=REQUIRED_COLUMNS,
+    column_types={'wp': pa.float64(), 'posteam': pa.dictionary(pa.int32(), pa.string()), 'winner': pa.float64()},
+)
+
+def read_game_file(directory, filename, lower_wp_threshold, upper_wp_threshold):
+    # Parse one game's CSV with Arrow's C++ reader and keep only the plays within the thresholds,
+    # flagging the ones the offense won; returns None if the file can't be used
+    file_path = os.path.join(directory, filename)
+    try:
+        plays = pacsv.read_csv(file_path, convert_options=CONVERT_OPTIONS)
+    except KeyError:
+        print(f"Skipping {filename}: Missing required columns.")
+        return None
+    except Exception as e:
+        print(f"Error processing file {filename}: {e}")
+        return None
+
+    in_band = plays.filter(pc.and_(pc.greater_equal(plays['wp'], lower_wp_threshold),
+                                   pc.less_equal(plays['wp'], upper_wp_threshold)))
+    return in_band.append_column('won', pc.fill_null(pc.equal(in_band['winner'], 1), False))
 
 def calculate_blown_games(directory, lower_wp_threshold, upper_wp_threshold):
-    # Dictionaries to count games between thresholds and games won
-    games_between_thresholds = defaultdict(int)
-    games_won = defaultdict(int)
-
-    # Iterate through all CSV files in the specified directory
-    for filename in os.listdir(directory):
-        if filename.endswith(".csv"):
-            file_path = os.path.join(directory, filename)
-
-            try:
-                # Read the CSV file into a pandas DataFrame
-                game_data = pd.read_csv(file_path)
-
-                # Ensure required columns exist
-                required_columns = {'wp', 'posteam', 'winner'}
-                if not required_columns.issubset(game_data.columns):
-                    print(f"Skipping {filename}: Missing required columns.")
-                    continue
-
-                # Track teams that had a win probability in the threshold range during the game
-                teams_within_threshold = set()
-                teams_that_won = set()
-
-                for _, row in game_data.iterrows():
-                    team = row['posteam']
-                    win_probability = row['wp']
-                    winner = row['winner']
-
-                    # Check if the win probability is within the thresholds
-                    if lower_wp_threshold <= win_probability <= upper_wp_threshold:
-                        teams_within_threshold.add(team)
-
-                        # Check if the team ultimately won the game
-                        if winner == 1:
-                            teams_that_won.add(team)
-
-                # Update the counts for each team
-                for team in teams_within_threshold:
-                    games_between_thresholds[team] += 1
-                    if team in teams_that_won:
-                        games_won[team] += 1
-
-            except Exception as e:
-                print(f"Error processing file {filename}: {e}")
+    filenames = [filename for filename in os.listdir(directory) if filename.endswith(".csv")]
+
+    # Read and filter all CSV files in the specified directory concurrently. Arrow releases the GIL while
+    # parsing and filtering, so threads scale across cores without pickling tables between processes
+    with ThreadPoolExecutor() as executor:
+        tables = list(executor.map(
+            lambda filename: read_game_file(directory, filename, lower_wp_threshold, upper_wp_threshold), filenames))
+
+    # Tag every in-band play with the game it came from and stack all games into one table
+    games = [table.append_column('game_id', pa.array([game_id] * table.num_rows, pa.int32()))
+             for game_id, table in enumerate(tables) if table is not None]
+
+    print("Team, Games Between Thresholds, Games Won, Winning Percentage")
+    if not games:
+        return
+
+    in_band = pa.concat_tables(games).unify_dictionaries()  # One shared team dictionary across all games
+
+    # Reduce to one row per team per game, flagging whether the team ultimately won that game
+    team_games = in_band.group_by(['game_id', 'posteam'], use_threads=False).aggregate([('won', 'max')])
+
+    # Count games between thresholds and games won per team
+    counts = team_games.group_by('posteam', use_threads=False).aggregate([('won_max', 'count'), ('won_max', 'sum')])
 
     # Calculate the ratio R and prepare the results
     results = []
-    for team in games_between_thresholds:
-        between_threshold_count = games_between_thresholds[team]
-        won_count = games_won[team]
+    for team, between_threshold_count, won_count in zip(counts['posteam'].to_pylist(),
+                                                        counts['won_max_count'].to_pylist(),
+                                                        counts['won_max_sum'].to_pylist()):
         ratio_r = (won_count / between_threshold_count) * 100 if between_threshold_count > 0 else 0
         results.append((team, between_threshold_count, won_count, ratio_r))
 
     # Sort results by R in descending order
     results.sort(key=lambda x: x[3], reverse=True)
 
-    # Print the results with a header
-    print("Team, Games Between Thresholds, Games Won, Winning Percentage")
+    # Print the results
     for team, between_threshold_count, won_count, ratio_r in results:
         print(f"{team}, {between_threshold_count}, {won_count}, {ratio_r:.2f}%")
 
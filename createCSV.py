@@ -12,17 +12,36 @@ Each file includes at least the following fields:
 
 The 'winner' field is not available in the raw data and is determined based on the final score.
 The script creates an 'NFLCSV' directory if it does not exist, saving all game files there.
+Each season's download is cached as 'pbp_<season>.parquet' so later runs skip the fetch.
 
 """
 
 import os
 import pandas as pd
+import pyarrow.parquet as pq
 import nfl_data_py as nfl
 
+# Columns read from the play-by-play data (home_team/away_team are optional)
+PBP_COLUMNS = ['wp', 'posteam', 'defteam', 'posteam_score', 'defteam_score', 'score_differential_post',
+               'game_id', 'play_id', 'home_team', 'away_team']
+
+def load_season_pbp(season, columns):
+    # Read a cached season from parquet, fetching and caching the full season on the first run or whenever the
+    # cached file lacks any requested column
+    cache_file = f"pbp_{season}.parquet"
+    if os.path.exists(cache_file) and set(columns).issubset(pq.read_schema(cache_file).names):
+        # Decode only the requested columns from the cached file
+        return pd.read_parquet(cache_file, engine='pyarrow', columns=columns)
+
+    pbp_data = nfl.import_pbp_data([season])
+    pbp_data.to_parquet(cache_file, engine='pyarrow', compression='zstd', index=False)
+    return pbp_data[[column for column in columns if column in pbp_data.columns]]
+
 def create_csv_files(start_season, end_season, output_dir="NFLCSV"):
     # Fetch play-by-play data for the specified seasons
     print(f"Fetching play-by-play data for seasons {start_season}-{end_season}...")
-    pbp_data = nfl.import_pbp_data(range(start_season, end_season + 1))
+    pbp_data = pd.concat([load_season_pbp(season, PBP_COLUMNS) for season in range(start_season, end_season + 1)],
+                         ignore_index=True)
 
     # Ensure required columns exist
     required_columns = {'wp', 'posteam', 'defteam', 'posteam_score', 'defteam_score', 'game_id', 'play_id'}
@@ -32,33 +51,24 @@ def create_csv_files(start_season, end_season, output_dir="NFLCSV"):
     # Create the output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
 
-    # Group the data by game_id to process each game separately
-    for game_id, game_data in pbp_data.groupby('game_id'):
-        try:
-            # Sort game data by play order
-            game_data = game_data.sort_values(by='play_id')
+    # Sort every game's plays once, then take each game's last play in a single pass
+    pbp_data = pbp_data.sort_values(by=['game_id', 'play_id'], kind='stable')
+    last_plays = pbp_data.drop_duplicates('game_id', keep='last').set_index('game_id')
 
-            # Get the last play of the game
-            last_play = game_data.iloc[-1]
+    # Determine the winner based on the final score (1 if the offensive team on the last play won)
+    winners = (last_plays['posteam_score'] > last_plays['defteam_score']).astype('int8')
+    pbp_data['winner'] = pbp_data['game_id'].map(winners)
 
-            # Determine the winner based on the final score
-            posteam_score = last_play['posteam_score']
-            defteam_score = last_play['defteam_score']
-            posteam = last_play['posteam']
+    # Select required columns for the output
+    output_columns = ['wp', 'posteam', 'defteam', 'posteam_score', 'defteam_score', 'score_differential_post', 'winner']
 
-            if posteam_score > defteam_score:
-                winner_value = 1  # Offensive team wins
-            else:
-                winner_value = 0  # Defensive team wins
-
-            # Add the winner column to the entire game data
-            game_data['winner'] = winner_value
-
-            # Select required columns for the output
-            output_columns = ['wp', 'posteam', 'defteam', 'posteam_score', 'defteam_score', 'score_differential_post', 'winner']
+    # Group the data by game_id to save each game separately
+    for game_id, game_data in pbp_data.groupby('game_id', sort=False):
+        try:
             game_data = game_data[output_columns]
 
             # Generate a filename using the season and teams involved
+            last_play = last_plays.loc[game_id]
             season = game_data['posteam'].iloc[0]
             home_team = last_play['home_team'] if 'home_team' in last_play else 'UNK'
             away_team = last_play['away_team'] if 'away_team' in last_play else 'UNK'
@@ -4,9 +4,9 @@ Author: Christopher Reid
 
 This script generates limited play-by-play (PBP) data for NFL games from the 2014 to 2023 seasons.
 For each game, it extracts specific fields relevant to analyzing momentum and saves the data to
-separate CSV files, one per game, in a directory called 'NFLCSV'.
+separate zstd-compressed parquet files, one per game, in a directory called 'NFLCSV'.
 
-Fields included in each CSV file:
+Fields included in each parquet file:
     - play_id: Unique identifier for each play.
     - drive_play_id_started: Identifier of the first play in the drive.
     - half_seconds_remaining: Time remaining in the half (in seconds).
@@ -16,16 +16,20 @@ Fields included in each CSV file:
     - score_differential: Difference in score between the teams.
     - drive_start_transition: The event that started the drive (e.g., kickoff, turnover).
     - fixed_drive_result: Outcome of the drive (e.g., touchdown, punt, field goal).
-    - game_id: Unique identifier for each game, used to create individual CSV files.
+    - game_id: Unique identifier for each game, used to create individual parquet files.
 
 Directory Structure:
     - Output directory: 'NFLCSV' (created if it does not exist)
-    - Each game’s data is saved as a CSV file in 'NFLCSV', named in the format 'season_gameid.csv'
-      (e.g., '2014_1001.csv' for game ID 1001 in the 2014 season).
+    - Each game’s data is saved as a parquet file in 'NFLCSV', named in the format 'season_gameid.parquet'
+      (e.g., '2014_1001.parquet' for game ID 1001 in the 2014 season). Parquet skips the CSV text
+      encoding on write and the parse on read, and nomentum.py loads these files directly.
+    - Each season's full download is cached as 'pbp_season.parquet' in the working directory, so later
+      runs read the cached columns instead of fetching the season again (delete the file to refresh it).
 
 Requirements:
     - Python 3.x
     - pandas library (install with `pip install pandas`)
+    - pyarrow library for the parquet output and cache (install with `pip install pyarrow`)
     - nfl_data_py library (install with `pip install nfl_data_py`)
 
 Usage:
@@ -34,38 +38,56 @@ Usage:
 """
 
 import os
+import pandas as pd
+import pyarrow.parquet as pq
 import nfl_data_py as nfl
 
+# Fields kept for each game
+PBP_COLUMNS = [
+    'play_id', 'drive_play_id_started', 'half_seconds_remaining',
+    'yardline_100', 'down', 'ydstogo', 'score_differential',
+    'drive_start_transition', 'fixed_drive_result', 'game_id'
+]
+
 def create_output_directory(directory="NFLCSV"):
     """Creates the output directory if it doesn't exist."""
     os.makedirs(directory, exist_ok=True)
 
 
+def load_season_pbp(season, columns):
+    """Loads one season of play-by-play data, caching the full download to a local parquet file."""
+    # Refetch the season when the cached file is missing or lacks any requested column
+    cache_file = f"pbp_{season}.parquet"
+    if os.path.exists(cache_file) and set(columns).issubset(pq.read_schema(cache_file).names):
+        # Decode only the requested columns from the cached file
+        return pd.read_parquet(cache_file, engine='pyarrow', columns=columns)
+
+    pbp_data = nfl.import_pbp_data([season])
+    pbp_data.to_parquet(cache_file, engine='pyarrow', compression='zstd', index=False)
+    return pbp_data[[column for column in columns if column in pbp_data.columns]]
+
+
 def save_game_data(season, game_id, game_data, output_dir="NFLCSV"):
-    """Saves play-by-play data for a single game to a CSV file."""
-    output_file = os.path.join(output_dir, f"{season}_{game_id}.csv")
-    game_data.to_csv(output_file, index=False)
+    """Saves play-by-play data for a single game to a zstd-compressed parquet file."""
+    output_file = os.path.join(output_dir, f"{season}_{game_id}.parquet")
+    game_data.to_parquet(output_file, engine='pyarrow', compression='zstd', index=False)
     print(f"Saved {output_file}")
 
 
 def process_season(season, output_dir="NFLCSV"):
-    """Processes play-by-play data for a given season and saves each game as a separate CSV."""
-    pbp_data = nfl.import_pbp_data([season])
+    """Processes play-by-play data for a given season and saves each game as a separate parquet file."""
+    pbp_data = load_season_pbp(season, PBP_COLUMNS)
 
     # Check if 'game_id' column exists
     if 'game_id' not in pbp_data.columns:
         raise KeyError("'game_id' column is missing from the play-by-play data. Check nfl_data_py data fields.")
 
     # Filter relevant fields
-    pbp_filtered = pbp_data[[
-        'play_id', 'drive_play_id_started', 'half_seconds_remaining',
-        'yardline_100', 'down', 'ydstogo', 'score_differential',
-        'drive_start_transition', 'fixed_drive_result', 'game_id'
-    ]]
-
-    # Save each game’s data to a CSV file
-    for game_id in pbp_filtered['game_id'].unique():
-        game_data = pbp_filtered[pbp_filtered['game_id'] == game_id]
+    pbp_filtered = pbp_data[PBP_COLUMNS]
+
+    # Save each game’s data to a parquet file; one groupby pass partitions the season instead of
+    # re-scanning every play for each game (files stay flat so os.listdir readers still work)
+    for game_id, game_data in pbp_filtered.groupby('game_id', sort=False):
         save_game_data(season, game_id, game_data, output_dir)
 
 
@@ -1,5 +1,4 @@
 import nfl_data_py as nfl
-import pandas as pd
 import matplotlib.pyplot as plt
 import sys
 
@@ -13,6 +12,9 @@ wp_end = float(sys.argv[5])
 # Load 2023 NFL play-by-play data
 pbp_data = nfl.import_pbp_data([2023])
 
+# Store the repeated string columns as categoricals so the filters and the team grouping compare integer codes
+pbp_data = pbp_data.astype({'play_type': 'category', 'posteam': 'category'})
+
 # Filter data based on given conditions
 filtered_data = pbp_data[
     (pbp_data['play_type'].isin(['run', 'pass'])) &
@@ -25,13 +27,17 @@ filtered_data = pbp_data[
     (pbp_data['two_point_attempt'] == 0)
 ]
 
-# Group by team and calculate run-pass counts and EPA sums
-team_stats = filtered_data.groupby('posteam').apply(
-    lambda x: pd.Series({
-        'pass_count': (x['play_type'] == 'pass').sum(),
-        'run_count': (x['play_type'] == 'run').sum(),
-        'epa_sum': x['epa'].sum()
-    })
+# Flag run and pass plays so the per-team counts are plain column sums
+filtered_data = filtered_data.assign(
+    is_pass=filtered_data['play_type'] == 'pass',
+    is_run=filtered_data['play_type'] == 'run'
+)
+
+# Group by team and calculate run-pass counts and EPA sums with built-in aggregations
+team_stats = filtered_data.groupby('posteam', observed=True).agg(
+    pass_count=('is_pass', 'sum'),
+    run_count=('is_run', 'sum'),
+    epa_sum=('epa', 'sum')
 ).reset_index()
 
 # Calculate pass ratio and sort by descending order of pass ratio
@@ -23,15 +23,24 @@ $ python hitDistanceAnalysis.py pull2024.csv oppo2024.csv
 """
 
 import sys
+import numpy as np
 import pandas as pd
 
-# Helper function to filter only fly balls
-def filter_fly_balls(data):
-    return data[data['bb_type'] == 'fly_ball']
+# Columns read from the Statcast exports and their types
+COLUMNS = ['bb_type', 'hit_distance_sc']
+COLUMN_TYPES = {'bb_type': 'category', 'hit_distance_sc': 'float64'}
 
-# Function to calculate the average distance of fly balls
-def calculate_average_distance(data):
-    return data['hit_distance_sc'].mean() if not data.empty else 0
+# Function to count fly balls and average their distance in one pass, without building a filtered DataFrame
+def fly_ball_stats(data):
+    is_fly_ball = (data['bb_type'] == 'fly_ball').to_numpy()  # Compares category codes, not strings
+    count = int(is_fly_ball.sum())
+    if not count:
+        return 0, 0
+
+    # Like Series.mean(), skip fly balls with no recorded distance
+    distances = data['hit_distance_sc'].to_numpy()[is_fly_ball]
+    distances = distances[~np.isnan(distances)]
+    return count, distances.mean() if distances.size else np.nan
 
 # Main function to handle input and output
 def main():
@@ -44,20 +53,14 @@ def main():
     pulled_file = sys.argv[1]
     oppo_file = sys.argv[2]
 
-    # Load the data from the CSV files
-    pulled_data = pd.read_csv(pulled_file)
-    oppo_data = pd.read_csv(oppo_file)
-
-    # Filter fly balls in both datasets
-    pulled_fly_balls = filter_fly_balls(pulled_data)
-    oppo_fly_balls = filter_fly_balls(oppo_data)
+    # Load the data from the CSV files, parsing only the two columns the analysis uses
+    pulled_data = pd.read_csv(pulled_file, usecols=COLUMNS, dtype=COLUMN_TYPES)
+    oppo_data = pd.read_csv(oppo_file, usecols=COLUMNS, dtype=COLUMN_TYPES)
 
-    # Calculate required values
-    total_fly_balls = len(pulled_fly_balls) + len(oppo_fly_balls)
-    num_pulled_fly_balls = len(pulled_fly_balls)
-    avg_distance_pulled = calculate_average_distance(pulled_fly_balls)
-    num_oppo_fly_balls = len(oppo_fly_balls)
-    avg_distance_oppo = calculate_average_distance(oppo_fly_balls)
+    # Count fly balls and average their distance in both datasets
+    num_pulled_fly_balls, avg_distance_pulled = fly_ball_stats(pulled_data)
+    num_oppo_fly_balls, avg_distance_oppo = fly_ball_stats(oppo_data)
+    total_fly_balls = num_pulled_fly_balls + num_oppo_fly_balls
 
     # Output the results with better labeling
     print(f"Total number of fly balls: {total_fly_balls}")
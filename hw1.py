@@ -28,8 +28,6 @@ Example citation:
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
 
 # Define the function to perform linear regression and return the correlation coefficient
 def calculate_correlation_from_file(filename):
@@ -51,27 +49,39 @@ def calculate_correlation_from_file(filename):
     # Initialize a dictionary to store the correlation coefficients
     correlations = {}
 
+    # Load every metric and R/G into one column-major float matrix (R/G last), so each column used by the
+    # plots below is a contiguous view, and get all R² values from a single correlation matrix; for a
+    # one-variable least-squares fit, R² is the squared correlation with R/G
+    M = np.asfortranarray(data[[*independent_vars, dependent_var]].to_numpy(dtype=np.float64))
+    r2_values = np.corrcoef(M, rowvar=False)[:-1, -1] ** 2
+
+    # Closed-form least-squares slope and intercept of R/G on each metric
+    means = M.mean(axis=0)
+    centered = M - means
+    slopes = (centered[:, :-1].T @ centered[:, -1]) / (centered[:, :-1] ** 2).sum(axis=0)
+    intercepts = means[-1] - slopes * means[:-1]
+    y = M[:, -1]
+
+    # Scatter at most ~2000 points per plot (the fits above still use every row) and rasterize them,
+    # so large files don't dominate the rendering and saving time
+    stride = max(1, len(M) // 2000)
+
     # Prepare the plot - 2 rows, 3 columns (to accommodate all 5 plots + 1 empty spot)
     fig, axes = plt.subplots(nrows=2, ncols=3, figsize=(18, 12))
     fig.suptitle(f'Correlation Plots for {filename}')
 
-    # Perform linear regression for each independent variable
+    # Plot the regression for each independent variable
     for idx, (ind_var, label) in enumerate(independent_vars.items()):
-        X = data[ind_var].values.reshape(-1, 1)
-        y = data[dependent_var].values
-
-        # Create the linear regression model and fit it
-        model = LinearRegression()
-        model.fit(X, y)
-        y_pred = model.predict(X)
+        X = M[:, idx]
+        y_pred = intercepts[idx] + slopes[idx] * X
 
-        # Calculate the correlation coefficient (R^2)
-        r2 = r2_score(y, y_pred)
+        # Record the correlation coefficient (R^2)
+        r2 = r2_values[idx]
         correlations[label] = r2
 
         # Plot the data and the regression line
         ax = axes[idx // 3, idx % 3]
-        ax.scatter(X, y, color='blue')
+        ax.scatter(X[::stride], y[::stride], color='blue', rasterized=True)
         ax.plot(X, y_pred, color='red')
         ax.set_title(f'R/G vs {label} (R² = {r2:.2f})')
         ax.set_xlabel(label)
@@ -31,129 +31,142 @@ Please cite Sports Reference when using this data:
 Website: https://www.baseball-reference.com
 """
 
-import csv
+import inspect
+import os
 import numpy as np
+from joblib import Memory
 from sklearn.linear_model import LogisticRegression
 import pandas as pd
 
+memory = Memory('.cache', verbose=0)
+
 
 # Function to calculate total outs
 def calculate_total_outs(inning, outs):
-    inning_number = int(inning[1:])
-    top_of_inning = inning.startswith('t')
-    return inning_number * 3 + int(outs) - (3 if top_of_inning else 0)
+    # Work out the outs before each distinct inning label once ('t1' -> 0, 'b1' -> 3, ...),
+    # then every play is a lookup by its category code plus the outs in the inning
+    base_outs = np.array([int(label[1:]) * 3 - (3 if label.startswith('t') else 0)
+                          for label in inning.cat.categories], dtype=np.int16)
+    return pd.Series(base_outs[inning.cat.codes.to_numpy()] + outs.to_numpy(dtype=np.int16), index=inning.index)
 
 
 # Function to process base runners (1 for occupied, 0 for unoccupied)
 def process_runners(runners):
-    return (1 if '1' in runners else 0, 1 if '2' in runners else 0, 1 if '3' in runners else 0)
+    # Only a handful of distinct runner strings exist, so pack each one's bases into bits once
+    # (1st = 1, 2nd = 2, 3rd = 4) and look every play up in that table instead of scanning each string
+    codes, distinct_runners = pd.factorize(runners)
+    bases_table = np.array([('1' in r) | ('2' in r) << 1 | ('3' in r) << 2 for r in distinct_runners], dtype=np.uint8)
+    bases = bases_table[codes]
+    return tuple(pd.Series((bases >> bit) & 1, index=runners.index) for bit in range(3))
 
 
-# Function to determine the winner of the game
-def determine_winner(previous_row, first_team):
-    current_team = previous_row['Team']
-    return 'Away' if current_team == first_team else 'Home'
+# Function to determine the winner of each game (1 if the Home team won, 0 if the Away team won)
+def determine_winner(last_team, first_team):
+    return (last_team != first_team).astype('int8')
 
 
 # Process the play-by-play data to generate the logistic regression model input
 def process_play_by_play(play_by_play_data):
-    model_data = []
-    previous_row = None
-    first_team = None  # Track the "Away" team
-    end_of_game_count = 0  # Counter for the last play of each game
-
-    for idx, row in enumerate(play_by_play_data):
-        inning = row['Inning']
-        outs = row['Outs']
-
-        # Calculate run differential and assign likely winner based on the state of the game
-        run_diff = int(row['Score'].split('-')[1]) - int(row['Score'].split('-')[0])
-        likely_winner = 1 if run_diff > 0 else 0 if run_diff < 0 else None
-
-        if inning == "t1" and (previous_row is not None and previous_row['Inning'] != "t1"):
-            # This is the start of a new game; process the last play of the previous game
-            winner = determine_winner(previous_row, first_team)
-            end_of_game_count += 1
-
-            # Capture the final play details for the previous game
-            last_play = {
-                'Total Outs': calculate_total_outs(previous_row['Inning'], previous_row['Outs']),
-                'Run Diff': int(previous_row['Score'].split('-')[1]) - int(previous_row['Score'].split('-')[0]),
-                '1st Base': process_runners(previous_row['Runners'])[0],
-                '2nd Base': process_runners(previous_row['Runners'])[1],
-                '3rd Base': process_runners(previous_row['Runners'])[2],
-                'Winner': 1 if winner == 'Home' else 0,  # Override with actual game winner
-            }
-            model_data.append(last_play)
-
-            # Set the new "Away" team for the upcoming game
-            first_team = row['Team']
-
-        # Process the current play and add to model data
-        first_base, second_base, third_base = process_runners(row['Runners'])
-        total_outs = calculate_total_outs(inning, outs)
-
-        model_row = {
-            'Total Outs': total_outs,
-            'Run Diff': run_diff,
-            '1st Base': first_base,
-            '2nd Base': second_base,
-            '3rd Base': third_base,
-            'Winner': likely_winner  # Provisional likely winner
-        }
-        model_data.append(model_row)
-        previous_row = row  # Track the previous row
-
-    # Handle the final game in the file
-    if previous_row is not None:
-        winner = determine_winner(previous_row, first_team)
-        last_play = {
-            'Total Outs': calculate_total_outs(previous_row['Inning'], previous_row['Outs']),
-            'Run Diff': int(previous_row['Score'].split('-')[1]) - int(previous_row['Score'].split('-')[0]),
-            '1st Base': process_runners(previous_row['Runners'])[0],
-            '2nd Base': process_runners(previous_row['Runners'])[1],
-            '3rd Base': process_runners(previous_row['Runners'])[2],
-            'Winner': 1 if winner == 'Home' else 0,  # Final winner
-        }
-        model_data.append(last_play)
+    # Every column is derived with vectorized string ops over the whole file instead of a per-row loop
+    inning = play_by_play_data['Inning']
+    scores = play_by_play_data['Score'].str.split('-', expand=True)
+    run_diff = scores[1].astype(int) - scores[0].astype(int)
+    first_base, second_base, third_base = process_runners(play_by_play_data['Runners'])
+
+    # Assign likely winner based on the state of the game (missing for a tie). Columns use the
+    # smallest fitting types: int16 outs/differential, uint8 base flags and a nullable Int8 winner
+    model_data = pd.DataFrame({
+        'Total Outs': calculate_total_outs(inning, play_by_play_data['Outs']),
+        'Run Diff': run_diff.astype('int16'),
+        '1st Base': first_base,
+        '2nd Base': second_base,
+        '3rd Base': third_base,
+        'Winner': run_diff.gt(0).astype('Int8').where(run_diff != 0)  # Provisional likely winner
+    })
+
+    # A "t1" play that follows a different inning starts a new game and ends the previous one
+    new_game = (inning == 't1') & (inning.shift() != 't1')
+    new_game.iloc[:1] = False
+    game_number = new_game.cumsum()
+    end_of_game_count = int(new_game.sum())
+
+    # The team batting at the start of each game is its "Away" team (not tracked for the file's first game)
+    teams = play_by_play_data['Team']
+    first_team = teams.where(new_game).groupby(game_number).transform('first')
+
+    # Repeat the final play of every game with the actual game winner, right after that play
+    is_last_play = game_number.ne(game_number.shift(-1))
+    last_plays = model_data[is_last_play].copy()
+    last_plays['Winner'] = determine_winner(teams[is_last_play], first_team[is_last_play])  # Override with actual game winner
+    model_data = pd.concat([model_data, last_plays]).sort_index(kind='stable').reset_index(drop=True)
 
     return model_data, end_of_game_count
 
 
+# Source code of the processing functions above. joblib only checks load_model_data's own code, so this is
+# passed in as part of the cache key to make any edit to the helpers invalidate the cached result too
+PROCESSING_SOURCE = ''.join(inspect.getsource(function)
+                            for function in (calculate_total_outs, process_runners, determine_winner, process_play_by_play))
+
+# Read and process the play-by-play file. The result is cached on disk in '.cache', keyed on the file's
+# modification time and size and on PROCESSING_SOURCE, so rerunning the script on an unchanged file skips
+# straight to training
+@memory.cache
+def load_model_data(input_file, mtime, size, processing_source):
+    # Read only the columns the model uses with the multi-threaded Arrow parser; the repetitive
+    # inning, runner and team strings are stored as categoricals
+    play_by_play_data = pd.read_csv(input_file, engine='pyarrow', encoding='utf-8', keep_default_na=False,
+                                    usecols=['Inning', 'Score', 'Outs', 'Runners', 'Team'],
+                                    dtype={'Inning': 'category', 'Score': 'string', 'Outs': 'int8',
+                                           'Runners': 'category', 'Team': 'category'})
+    return process_play_by_play(play_by_play_data)
+
+
 # Split the data into early and late innings based on the outs
 def split_inning_data(model_data):
-    early_innings_data = [row for row in model_data if row['Total Outs'] <= 21]
-    late_innings_data = [row for row in model_data if row['Total Outs'] > 21]
+    is_early = model_data['Total Outs'].to_numpy() <= 21  # One comparison pass; late innings are its complement
+    early_innings_data = model_data[is_early]
+    late_innings_data = model_data[~is_early]
     return early_innings_data, late_innings_data
 
 
-# Train the logistic regression model
-def train_logistic_regression(data, inning_type):
-    if not isinstance(data, list) or not all(isinstance(d, dict) for d in data):
+# Clean and validate the training data for one inning group, returning the features and labels
+def prepare_training_data(data, inning_type):
+    if not isinstance(data, pd.DataFrame):
         print(f"Error: Data passed to {inning_type} is not in the correct format.")
         return None, None
 
     # Remove any rows where 'Winner' is None
-    cleaned_data = [row for row in data if row['Winner'] is not None]
+    cleaned_data = data[data['Winner'].notna()]
 
-    if not cleaned_data:
+    if cleaned_data.empty:
         print(f"Error: No valid data available for {inning_type}.")
         return None, None
 
     print(
-        f"Training logistic regression for {inning_type}. Data sample: {cleaned_data[:1]}")  # Print the first data row for debugging
+        f"Training logistic regression for {inning_type}. Data sample: {cleaned_data.head(1).to_dict('records')}")  # Print the first data row for debugging
 
-    df = pd.DataFrame(cleaned_data).dropna()
+    df = cleaned_data.dropna()
     X = df[['Total Outs', 'Run Diff', '1st Base', '2nd Base', '3rd Base']]
-    y = df['Winner']
+    y = df['Winner'].astype(int)
 
     if len(y.unique()) < 2:
         print(f"Error: Only one class found in the data for {inning_type}. Cannot train the model.")
         return None, None
 
-    model = LogisticRegression()
-    model.fit(X, y)
-    return model, X
+    return X, y
+
+
+# Train the logistic regression model
+def train_logistic_regression(X, y):
+    if X is None:
+        return None
+
+    # Fit on a C-contiguous float64 array so sklearn doesn't make its own strided copy of the
+    # column-major DataFrame block
+    model = LogisticRegression(solver='newton-cholesky', tol=1e-6)
+    model.fit(np.ascontiguousarray(X.to_numpy(dtype=np.float64)), y.to_numpy())
+    return model
 
 
 # Display the coefficients of the logistic regression model
@@ -169,35 +182,41 @@ def display_coefficients(model, X, inning_type):
 # Predict win probabilities from the hw2.examples file using correct model based on inning
 def predict_from_examples(early_model, late_model, examples_file):
     print("\nWin Probabilities for examples from hw2.examples:")
-    with open(examples_file, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            state = {k: int(v) for k, v in row.items()}
-            if state['Total Outs'] <= 21:
-                if early_model:
-                    prob = early_model.predict_proba([list(state.values())])[0][1]
-                    print(f"Predicted win probability for early state {state}: {prob:.2f}")
-            else:
-                if late_model:
-                    prob = late_model.predict_proba([list(state.values())])[0][1]
-                    print(f"Predicted win probability for late state {state}: {prob:.2f}")
+    examples = pd.read_csv(examples_file, dtype=np.int16, encoding='utf-8')
+    X = np.ascontiguousarray(examples.to_numpy(dtype=np.float64))  # The layout and dtype sklearn would copy into
+    is_early = examples['Total Outs'].to_numpy() <= 21
+
+    # Score each inning group's example states with one batched predict_proba call to its model
+    probs = np.full(len(X), np.nan)
+    for model, rows in ((early_model, is_early), (late_model, ~is_early)):
+        if model and rows.any():
+            probs[rows] = model.predict_proba(X[rows])[:, 1]
+
+    for state, early, prob in zip(examples.to_dict('records'), is_early, probs):
+        if early:
+            if early_model:
+                print(f"Predicted win probability for early state {state}: {prob:.2f}")
+        else:
+            if late_model:
+                print(f"Predicted win probability for late state {state}: {prob:.2f}")
 
 
 # Main function to create the improved model data and perform logistic regression
 def create_improved_model(input_file, examples_file):
-    with open(input_file, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        play_by_play_data = list(reader)
-
-    # Process the play-by-play data
-    model_data, _ = process_play_by_play(play_by_play_data)
+    # Load the processed play-by-play data (from the cache when the input file is unchanged)
+    model_data, _ = load_model_data(input_file, os.path.getmtime(input_file), os.path.getsize(input_file), PROCESSING_SOURCE)
 
     # Split the data into early and late innings
     early_innings_data, late_innings_data = split_inning_data(model_data)
 
-    # Train logistic regression models for early and late innings
-    early_model, early_X = train_logistic_regression(early_innings_data, "Innings 1-7")
-    late_model, late_X = train_logistic_regression(late_innings_data, "Innings 8-9")
+    # Prepare the training data for each inning group
+    early_X, early_y = prepare_training_data(early_innings_data, "Innings 1-7")
+    late_X, late_y = prepare_training_data(late_innings_data, "Innings 8-9")
+
+    # Train logistic regression models for early and late innings (each fit takes milliseconds, so they run
+    # serially; starting worker processes would cost far more than the fits themselves)
+    early_model = train_logistic_regression(early_X, early_y)
+    late_model = train_logistic_regression(late_X, late_y)
 
     # Display the coefficients of the early and late inning models
     display_coefficients(early_model, early_X, "Innings 1-7")
@@ -1,15 +1,68 @@
 import requests
-from bs4 import BeautifulSoup, Comment
+from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 import re
 import csv
 import time
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Number of game pages fetched and parsed concurrently, and the overall request rate allowed against
+# Baseball Reference (one request every 5 seconds, the same pace as the old sleep between games)
+MAX_WORKERS = 4
+REQUESTS_PER_SECOND = 0.2
+
+# Token-bucket rate limiter shared across the worker threads so concurrent requests stay under the rate limit
+class RateLimiter:
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    # Block until a token is available, then consume it
+    def wait(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+RATE_LIMITER = RateLimiter(REQUESTS_PER_SECOND)
+
+# Box score pages are served as UTF-8
+HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+# Text after the pitch count in the "Pitch Code" column
+PAREN_TAIL_RE = re.compile(r'\)(.*)')
+
+# Function to strip non-ASCII characters from a cell (the ASCII codec drops them in C, no regex scan needed)
+def strip_non_ascii(text):
+    return text.encode('ascii', 'ignore').decode('ascii')
+
+# Shared session so every page reuses pooled keep-alive connections instead of a fresh TCP/TLS handshake,
+# retrying transient connection failures with a short backoff
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'})
+SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS,
+                                      max_retries=Retry(total=3, backoff_factor=0.5)))
 
 # Function to scrape the league schedule and collect all box score URLs
 def get_game_urls(league_schedule_url):
     base_url = 'https://www.baseball-reference.com'
-    response = requests.get(league_schedule_url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+    RATE_LIMITER.wait()
+    response = SESSION.get(league_schedule_url)
+    soup = BeautifulSoup(response.content, 'lxml')
 
     # Find all the box score links
     game_links = []
@@ -20,117 +73,140 @@ def get_game_urls(league_schedule_url):
 
 # Function to scrape a single game's play-by-play data
 def scrape_single_game(url):
-    response = requests.get(url)
-    response.encoding = 'utf-8'
-    soup = BeautifulSoup(response.content, 'html.parser')
+    RATE_LIMITER.wait()
+    response = SESSION.get(url)
+    root = lxml.html.fromstring(response.content, parser=HTML_PARSER)
 
     # Extract commented-out sections that contain play-by-play data
-    comments = soup.find_all(string=lambda text: isinstance(text, Comment))
-
-    for comment in comments:
-        if 'play_by_play' in comment:
-            comment_soup = BeautifulSoup(comment, 'html.parser')
-            tables = comment_soup.find_all('table')
-            for table in tables:
-                if 'play_by_play' in table.get('id', ''):
-                    return table
+    for comment in root.iter(etree.Comment):
+        if comment.text and 'play_by_play' in comment.text:
+            # Parse the commented-out HTML directly into an lxml tree and return its play-by-play table element
+            tables = lxml.html.document_fromstring(comment.text).xpath('//table[contains(@id, "play_by_play")]')
+            if tables:
+                return tables[0]
 
 # Function to clean the "Pitch Code" column
 def clean_pitch_code(pitch_code):
     # Remove everything after the closing parenthesis
-    return re.sub(r'\)(.*)', ')', pitch_code)
+    return PAREN_TAIL_RE.sub(')', pitch_code)
 
-# Function to extract and format inning and play-by-play data into a list of dictionaries
+# Function to extract and format inning and play-by-play data into a list of row tuples (CSV_HEADERS order, minus Index)
 def extract_inning_info(table):
     inning = ""
     data = []
-    for row in table.find_all('tr'):
+    # Walk the lxml table element's rows with XPath instead of building a BeautifulSoup tag per cell
+    for row in table.xpath('.//tr'):
         # Check if the row contains inning information
-        inning_cell = row.find('th', {'data-stat': 'inning'})
-        if inning_cell:
-            inning = inning_cell.text.strip()  # Get the inning information (e.g., 't1', 'b1')
+        inning_cells = row.xpath('.//th[@data-stat="inning"]')
+        if inning_cells:
+            inning = inning_cells[0].text_content().strip()  # Get the inning information (e.g., 't1', 'b1')
 
-        cols = [td.text.strip() for td in row.find_all('td')]
+        cols = [td.text_content().strip() for td in row.xpath('.//td')]
         if len(cols) >= 10:  # Only process rows with sufficient columns
-            # Clean up special characters using regular expressions or replace()
-            cleaned_cols = [re.sub(r'[^\x00-\x7F]+', '', col) for col in cols]
+            # Clean up special characters (drop anything outside ASCII)
+            cleaned_cols = [strip_non_ascii(col) for col in cols]
 
             # Clean up the "Pitch Code" column
             cleaned_pitch_code = clean_pitch_code(cleaned_cols[3])
 
-            play = {
-                "Inning": inning,
-                "Score": cleaned_cols[0],
-                "Outs": cleaned_cols[1],
-                "Runners": cleaned_cols[2],
-                "Pitch Code": cleaned_pitch_code,
-                "Runs Scored": cleaned_cols[4],
-                "Team": cleaned_cols[5],
-                "Batter": cleaned_cols[6],
-                "Pitcher": cleaned_cols[7],
-                "Change WP": cleaned_cols[8],
-                "Current WP": cleaned_cols[9],
-                "Description": cleaned_cols[10] if len(cleaned_cols) > 10 else ""
-            }
+            # Positional row in CSV column order (after Index), written straight through csv.writer
+            play = (
+                inning,
+                cleaned_cols[0],  # Score
+                cleaned_cols[1],  # Outs
+                cleaned_cols[2],  # Runners
+                cleaned_pitch_code,
+                cleaned_cols[4],  # Runs Scored
+                cleaned_cols[5],  # Team
+                cleaned_cols[6],  # Batter
+                cleaned_cols[7],  # Pitcher
+                cleaned_cols[8],  # Change WP
+                cleaned_cols[9],  # Current WP
+                cleaned_cols[10] if len(cleaned_cols) > 10 else ""  # Description
+            )
             data.append(play)
     return data
 
-# Function to write the play-by-play data to CSV with an index column
-def write_to_csv(data, filename='play_by_play.csv'):
-    headers = ["Index", "Inning", "Score", "Outs", "Runners", "Pitch Code", "Runs Scored", "Team", "Batter", "Pitcher",
-               "Change WP", "Current WP", "Description"]
+# Function to download and parse one game's play-by-play rows (None when the page has no play-by-play table)
+def scrape_game_plays(url):
+    table = scrape_single_game(url)
+    return extract_inning_info(table) if table is not None else None
 
-    with open(filename, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.DictWriter(file, fieldnames=headers)
-        writer.writeheader()
+CSV_HEADERS = ["Index", "Inning", "Score", "Outs", "Runners", "Pitch Code", "Runs Scored", "Team", "Batter", "Pitcher",
+               "Change WP", "Current WP", "Description"]
 
-        for idx, row in enumerate(data, start=1):
-            row_with_index = {"Index": idx, **row}  # Add index to each row
-            writer.writerow(row_with_index)
+# Function to open the play-by-play CSV for appending, writing the header when the file is new and returning the
+# next free index so rows from a resumed run continue the numbering of the earlier ones
+def open_play_by_play_csv(filename='play_by_play.csv'):
+    next_idx = 1
+    if os.path.exists(filename) and os.path.getsize(filename) > 0:
+        with open(filename, mode='r', newline='', encoding='utf-8') as file:
+            for row in csv.reader(file):
+                if row and row[0].isdigit():
+                    next_idx = int(row[0]) + 1
+
+    file = open(filename, mode='a', newline='', encoding='utf-8')
+    writer = csv.writer(file)
+    if next_idx == 1 and file.tell() == 0:
+        writer.writerow(CSV_HEADERS)
+    return file, writer, next_idx
+
+# Function to append one game's play-by-play rows to the CSV with an index column, returning the next free index
+def write_game_rows(writer, data, start_idx):
+    writer.writerows((idx, *row) for idx, row in enumerate(data, start=start_idx))
+    return start_idx + len(data)
+
+# Game URLs already scraped by earlier runs, loaded once from processed_games.txt; newly scraped URLs are
+# added to the set and appended through one line-buffered handle instead of reopening the file per game
+PROCESSED_FILE = os.path.join(os.path.dirname(__file__), "processed_games.txt")
+processed_urls = set()
+try:
+    with open(PROCESSED_FILE, "r") as file:
+        processed_urls.update(file.read().splitlines())
+except FileNotFoundError:
+    pass
+processed_file_handle = open(PROCESSED_FILE, "a", buffering=1)
 
 # Function to check if the game URL has already been processed
 def is_url_processed(url):
-    processed_file = os.path.join(os.path.dirname(__file__), "processed_games.txt")
-    try:
-        with open(processed_file, "r") as file:
-            processed_urls = file.read().splitlines()
-            return url in processed_urls
-    except FileNotFoundError:
-        return False
+    return url in processed_urls
 
 # Function to mark a URL as processed
 def mark_url_as_processed(url):
-    processed_file = os.path.join(os.path.dirname(__file__), "processed_games.txt")
-    with open(processed_file, "a") as file:
-        file.write(url + "\n")
+    processed_urls.add(url)
+    processed_file_handle.write(url + "\n")
 
-# Main function to scrape all games and write the play-by-play data to a CSV
+# Main function to scrape all games, streaming each game's play-by-play rows to the CSV as soon as it is parsed
 def scrape_all_games(league_schedule_url):
     game_urls = get_game_urls(league_schedule_url)
-    all_play_data = []
 
+    # Number the games in schedule order and drop the ones already scraped by an earlier run
+    pending_games = []
     for i, game_url in enumerate(game_urls, start=1):  # Using enumerate to track the count
         if is_url_processed(game_url):
             print(f"Skipping already processed game: {game_url}")
-            continue
+        else:
+            pending_games.append((i, game_url))
 
-        print(f"{i}. Scraping play-by-play data from {game_url}")  # Added counter to the print statement
-        table = scrape_single_game(game_url)
-        if table:
-            play_data = extract_inning_info(table)
+    csv_file, writer, next_idx = open_play_by_play_csv()
+    rows_written = 0
+
+    # Download and parse the pending games in worker threads (paced by the shared rate limiter) while the
+    # results are written here in schedule order; a game is only marked processed once its rows are on disk
+    with csv_file, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = executor.map(scrape_game_plays, [game_url for _, game_url in pending_games])
+
+        for (i, game_url), play_data in zip(pending_games, results):
+            print(f"{i}. Scraping play-by-play data from {game_url}")  # Added counter to the print statement
             if play_data:
-                all_play_data.extend(play_data)  # Add data from each game to the overall list
+                next_idx = write_game_rows(writer, play_data, next_idx)
+                csv_file.flush()
+                rows_written += len(play_data)
                 mark_url_as_processed(game_url)
             else:
                 print(f"No play-by-play data found for {game_url}")
-        else:
-            print(f"No play-by-play data found for {game_url}")
-
-        time.sleep(5)  # Delay to avoid getting blocked by Baseball Reference
 
-    if all_play_data:
-        write_to_csv(all_play_data)
-    else:
+    if not rows_written:
         print("No play-by-play data to write.")
 
 # Example league schedule URL (2023 season)
@@ -21,10 +21,10 @@ $ python launchAngleOnlyLinear.py all2024.csv
 """
 
 import sys
-import pandas as pd
 import matplotlib.pyplot as plt
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error
+from launch_data import load_batted_balls
 
 # Setting to False disables plots
 display_plots = False
@@ -33,14 +33,9 @@ def main(filename='all2024.csv'):
     # Print the filename being processed
     print(f"Processing file: {filename}")
 
-    # Load the data
-    data = pd.read_csv(filename)
-
-    # Filter data to extract relevant columns
-    data = data[['launch_angle', 'hit_distance_sc']]
-
-    # Drop rows with missing values in 'launch_angle' or 'hit_distance_sc'
-    data = data.dropna(subset=['launch_angle', 'hit_distance_sc'])
+    # Load only the relevant columns (from the parquet cache after the first run) and drop rows with a missing
+    # value in any of them
+    data = load_batted_balls(filename, ['launch_angle', 'hit_distance_sc']).dropna()
 
     # Extract features (launch_angle) and target (hit_distance_sc)
     X = data[['launch_angle']]  # Use launch angle as the only feature
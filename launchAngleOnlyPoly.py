@@ -21,43 +21,27 @@ $ python launchAngleOnlyPoly.py all2024.csv
 """
 
 import sys
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
 from sklearn.metrics import mean_squared_error
+from launch_data import load_batted_balls
 
 # Setting to False disables plots
 display_plots = False
 
-def main(filename='all2024.csv'):
-    # Print the filename being processed
-    print(f"Processing file: {filename}")
-
-    # Load the data
-    data = pd.read_csv(filename)
-
-    # Filter data to extract relevant columns
-    data = data[['launch_angle', 'hit_distance_sc']]
-
-    # Drop rows with missing values in 'launch_angle' or 'hit_distance_sc'
-    data = data.dropna(subset=['launch_angle', 'hit_distance_sc'])
-
-    # Extract features (launch_angle) and target (hit_distance_sc)
-    X = data[['launch_angle']]  # Use launch angle as the only feature
-    y = data['hit_distance_sc']  # Target (hit distance)
+# Fit the polynomial regression on NumPy arrays of launch angle and hit distance and report the results
+def fit_angle_poly(launch_angle, hit_distance):
+    X = launch_angle  # Use launch angle as the only feature
+    y = hit_distance  # Target (hit distance)
 
-    # Generate polynomial features (degree 2)
-    poly = PolynomialFeatures(degree=2)
-    X_poly = poly.fit_transform(X)
+    # Build the degree 2 design matrix [1, launch_angle, launch_angle^2] directly
+    X_poly = np.column_stack([np.ones_like(X), X, X * X])
 
-    # Initialize and fit the polynomial regression model
-    model = LinearRegression()
-    model.fit(X_poly, y)
+    # Fit the polynomial regression by solving the normal equations (X^T X) beta = X^T y on the 3x3 Gram matrix
+    beta = np.linalg.solve(X_poly.T @ X_poly, X_poly.T @ y)
 
     # Predict the target using the model
-    y_pred = model.predict(X_poly)
+    y_pred = X_poly @ beta
 
     # Calculate mean squared error
     mse = mean_squared_error(y, y_pred)
@@ -68,25 +52,36 @@ def main(filename='all2024.csv'):
 
     # Print better labeled coefficients
     print("\nModel Coefficients:")
-    print(f"Intercept: {model.intercept_}")
-    print(f"Coefficient for Linear Term (launch_angle): {model.coef_[1]}")
-    print(f"Coefficient for Quadratic Term (launch_angle^2): {model.coef_[2]}")
+    print(f"Intercept: {beta[0]}")
+    print(f"Coefficient for Linear Term (launch_angle): {beta[1]}")
+    print(f"Coefficient for Quadratic Term (launch_angle^2): {beta[2]}")
 
     # Conditionally display the plot
     if display_plots:
         plt.scatter(X, y, color='blue', label='Actual data')
 
-        # Sort X and y_pred for a smooth curve
-        X_sorted = np.sort(X, axis=0)
-        y_pred_sorted = model.predict(poly.fit_transform(X_sorted))
+        # Evaluate the fitted polynomial on an evenly spaced grid for a smooth curve (no need to sort every sample)
+        X_grid = np.linspace(X.min(), X.max(), 200)
+        y_pred_grid = beta[0] + beta[1] * X_grid + beta[2] * X_grid ** 2
 
-        plt.plot(X_sorted, y_pred_sorted, color='red', label='Polynomial regression curve')
+        plt.plot(X_grid, y_pred_grid, color='red', label='Polynomial regression curve')
         plt.title('Launch Angle vs Hit Distance (Polynomial)')
         plt.xlabel('Launch Angle')
         plt.ylabel('Hit Distance')
         plt.legend()
         plt.show()
 
+def main(filename='all2024.csv'):
+    # Print the filename being processed
+    print(f"Processing file: {filename}")
+
+    # Load only the relevant columns (from the parquet cache after the first run) and drop rows with a missing
+    # value in any of them
+    data = load_batted_balls(filename, ['launch_angle', 'hit_distance_sc']).dropna()
+
+    # Extract features (launch_angle) and target (hit_distance_sc), then fit and report the model
+    fit_angle_poly(data['launch_angle'].to_numpy(dtype=np.float64), data['hit_distance_sc'].to_numpy(dtype=np.float64))
+
 if __name__ == "__main__":
     filename = sys.argv[1] if len(sys.argv) > 1 else 'all2024.csv'
     main(filename)
\ No newline at end of file
@@ -19,30 +19,19 @@ $ python launchDistLinear.py all2024.csv
 """
 
 import sys
-import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error
+from launch_data import load_batted_balls
 
 # Setting to False disables plots
 display_plots = False
 
-def main(filename='all2024.csv'):
-    # Print the filename being processed
-    print(f"Processing file: {filename}")
-
-    # Load the data
-    data = pd.read_csv(filename)
-
-    # Filter data to extract relevant columns
-    data = data[['launch_speed', 'launch_angle', 'hit_distance_sc']]
-
-    # Drop rows with missing values
-    data = data.dropna(subset=['launch_speed', 'launch_angle', 'hit_distance_sc'])
-
-    # Extract features (launch_speed, launch_angle) and target (hit_distance_sc)
-    X = data[['launch_speed', 'launch_angle']]
-    y = data['hit_distance_sc']
+# Fit the linear regression on NumPy arrays of launch speed, launch angle and hit distance and report the results
+def fit_dist_linear(launch_speed, launch_angle, hit_distance):
+    X = np.asfortranarray(np.column_stack([launch_speed, launch_angle]))  # Column-major, as the DataFrame columns were
+    y = hit_distance
 
     # Initialize and fit the linear regression model
     model = LinearRegression()
@@ -72,6 +61,18 @@ def main(filename='all2024.csv'):
         plt.legend()
         plt.show()
 
+def main(filename='all2024.csv'):
+    # Print the filename being processed
+    print(f"Processing file: {filename}")
+
+    # Load only the relevant columns (from the parquet cache after the first run) and drop rows with a missing
+    # value in any of them
+    data = load_batted_balls(filename, ['launch_speed', 'launch_angle', 'hit_distance_sc']).dropna()
+
+    # Extract features (launch_speed, launch_angle) and target (hit_distance_sc), then fit and report the model
+    fit_dist_linear(data['launch_speed'].to_numpy(dtype=np.float64), data['launch_angle'].to_numpy(dtype=np.float64),
+                    data['hit_distance_sc'].to_numpy(dtype=np.float64))
+
 if __name__ == "__main__":
     filename = sys.argv[1] if len(sys.argv) > 1 else 'all2024.csv'
     main(filename)
\ No newline at end of file
@@ -19,42 +19,27 @@ $ python launchDistPoly.py all2024.csv
 """
 
 import sys
-import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
 from sklearn.metrics import mean_squared_error
+from launch_data import load_batted_balls
 
 # Setting to False disables plots
 display_plots = False
 
-def main(filename='all2024.csv'):
-    # Print the filename being processed
-    print(f"Processing file: {filename}")
-
-    # Load the data
-    data = pd.read_csv(filename)
-
-    # Filter data to extract relevant columns
-    data = data[['launch_speed', 'launch_angle', 'hit_distance_sc']]
-
-    # Drop rows with missing values
-    data = data.dropna(subset=['launch_speed', 'launch_angle', 'hit_distance_sc'])
-
-    # Extract features (launch_speed, launch_angle) and target (hit_distance_sc)
-    X = data[['launch_speed', 'launch_angle']]
-    y = data['hit_distance_sc']
+# Fit the polynomial regression on NumPy arrays of launch speed, launch angle and hit distance and report the results
+def fit_dist_poly(launch_speed, launch_angle, hit_distance):
+    y = hit_distance
 
-    # Generate polynomial features (degree 2)
-    poly = PolynomialFeatures(degree=2)
-    X_poly = poly.fit_transform(X)
+    # Build the degree 2 design matrix [1, speed, angle, speed^2, speed*angle, angle^2] directly
+    X_poly = np.column_stack([np.ones_like(launch_speed), launch_speed, launch_angle, launch_speed * launch_speed,
+                              launch_speed * launch_angle, launch_angle * launch_angle])
 
-    # Initialize and fit the polynomial regression model
-    model = LinearRegression()
-    model.fit(X_poly, y)
+    # Fit the polynomial regression by solving the normal equations (X^T X) beta = X^T y on the 6x6 Gram matrix
+    beta = np.linalg.solve(X_poly.T @ X_poly, X_poly.T @ y)
 
     # Predict the target using the model
-    y_pred = model.predict(X_poly)
+    y_pred = X_poly @ beta
 
     # Calculate mean squared error
     mse = mean_squared_error(y, y_pred)
@@ -65,8 +50,8 @@ def main(filename='all2024.csv'):
 
     # Print coefficients
     print("\nModel Coefficients:")
-    print(f"Intercept: {model.intercept_}")
-    for i, coef in enumerate(model.coef_[1:], 1):  # Skip intercept
+    print(f"Intercept: {beta[0]}")
+    for i, coef in enumerate(beta[1:], 1):  # Skip intercept
         print(f"Coefficient for Polynomial Feature {i}: {coef}")
 
     # Conditionally display the plot
@@ -78,6 +63,18 @@ def main(filename='all2024.csv'):
         plt.legend()
         plt.show()
 
+def main(filename='all2024.csv'):
+    # Print the filename being processed
+    print(f"Processing file: {filename}")
+
+    # Load only the relevant columns (from the parquet cache after the first run) and drop rows with a missing
+    # value in any of them
+    data = load_batted_balls(filename, ['launch_speed', 'launch_angle', 'hit_distance_sc']).dropna()
+
+    # Extract features (launch_speed, launch_angle) and target (hit_distance_sc), then fit and report the model
+    fit_dist_poly(data['launch_speed'].to_numpy(dtype=np.float64), data['launch_angle'].to_numpy(dtype=np.float64),
+                  data['hit_distance_sc'].to_numpy(dtype=np.float64))
+
 if __name__ == "__main__":
     filename = sys.argv[1] if len(sys.argv) > 1 else 'all2024.csv'
     main(filename)
\ No newline at end of file
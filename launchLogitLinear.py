@@ -24,17 +24,34 @@ $ python launchLogitLinear.py all2024.csv
 """
 
 import sys
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.linear_model import LogisticRegression
+from scipy.special import expit
 from sklearn.metrics import mean_squared_error
 from matplotlib.colors import ListedColormap
+from launch_data import load_batted_balls
 
 # Setting to False disables plots
 display_plots = False
 
-def plot_decision_boundary(X, y, model):
+def fit_logistic_regression(X, y, C=1.0, max_iter=50, tol=1e-10):
+    # Fit an L2-regularized logistic regression (the same objective as sklearn's LogisticRegression(C=C), with the
+    # intercept unpenalized) by Newton-Raphson / IRLS steps on the small (n_features + 1) x (n_features + 1) system
+    X1 = np.column_stack([np.ones(len(X)), X])
+    penalty = np.full(X1.shape[1], 1.0 / C)
+    penalty[0] = 0.0  # Leave the intercept unregularized
+    beta = np.zeros(X1.shape[1])
+    for _ in range(max_iter):
+        p = expit(X1 @ beta)
+        grad = X1.T @ (y - p) - penalty * beta
+        H = X1.T @ (X1 * (p * (1 - p))[:, None]) + np.diag(penalty)
+        step = np.linalg.solve(H, grad)
+        beta += step
+        if np.max(np.abs(step)) < tol:
+            break
+    return beta[0], beta[1:]
+
+def plot_decision_boundary(X, y, intercept, coef):
     # Define range for the grid
     x_min, x_max = X[:, 0].min() - 1, X[:, 0].max() + 1
     y_min, y_max = X[:, 1].min() - 1, X[:, 1].max() + 1
@@ -42,7 +59,7 @@ def plot_decision_boundary(X, y, model):
                          np.arange(y_min, y_max, 0.1))
 
     # Predict class for every point in the grid
-    Z = model.predict(np.c_[xx.ravel(), yy.ravel()])
+    Z = (np.c_[xx.ravel(), yy.ravel()] @ coef + intercept > 0).astype(int)
     Z = Z.reshape(xx.shape)
 
     # Create contour plot
@@ -57,28 +74,24 @@ def main(filename='all2024.csv'):
     # Print the filename being processed
     print(f"Processing file: {filename}")
 
-    # Load the data
-    data = pd.read_csv(filename)
-
-    # Filter data to extract relevant columns
-    data = data[['launch_speed', 'launch_angle', 'events']]
+    # Load only the relevant columns (from the parquet cache after the first run)
+    data = load_batted_balls(filename, ['launch_speed', 'launch_angle', 'events'])
 
     # Drop rows with missing values in 'launch_speed' or 'launch_angle'
     data = data.dropna(subset=['launch_speed', 'launch_angle'])
 
     # Convert the 'events' column to a binary target: 1 for 'home_run', 0 otherwise
-    data['result'] = data['events'].apply(lambda x: 1 if x == 'home_run' else 0)
+    data['result'] = data['events'].eq('home_run').astype(np.int8)  # Vectorized compare on the category codes
 
     # Extract features and target
-    X = data[['launch_speed', 'launch_angle']].values  # Use launch speed and launch angle as features
-    y = data['result'].values  # Target (whether the batted ball is a home run)
+    X = data[['launch_speed', 'launch_angle']].to_numpy(dtype=np.float64)  # Use launch speed and launch angle as features
+    y = data['result'].to_numpy(dtype=np.float64)  # Target (whether the batted ball is a home run)
 
-    # Initialize and fit the logistic regression model
-    model = LogisticRegression()
-    model.fit(X, y)
+    # Fit the logistic regression model
+    intercept, coef = fit_logistic_regression(X, y)
 
-    # Predict the target using the model
-    y_pred = model.predict(X)
+    # Predict the target using the model (home run when the log-odds are positive)
+    y_pred = (X @ coef + intercept > 0).astype(int)
 
     # Calculate mean squared error
     mse = mean_squared_error(y, y_pred)
@@ -88,8 +101,8 @@ def main(filename='all2024.csv'):
     print(mse)
 
     print("\nCoefficients:")
-    for coef in model.coef_[0]:
-        print(coef)
+    for c in coef:
+        print(c)
 
     # Conditionally display the plots based on the toggle
     if display_plots:
@@ -102,7 +115,7 @@ def main(filename='all2024.csv'):
         plt.show()
 
         # Plot 2: Decision boundary plot
-        plot_decision_boundary(X, y, model)
+        plot_decision_boundary(X, y, intercept, coef)
 
 if __name__ == "__main__":
     filename = sys.argv[1] if len(sys.argv) > 1 else 'all2024.csv'
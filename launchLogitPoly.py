@@ -24,13 +24,13 @@ $ python launchLogitPoly.py all2024.csv
 """
 
 import sys
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import PolynomialFeatures
 from sklearn.metrics import mean_squared_error
 from matplotlib.colors import ListedColormap
+from launch_data import load_batted_balls
 
 # Setting to False disables plots
 display_plots = False
@@ -61,17 +61,14 @@ def main(filename='all2024.csv'):
     # Print the filename being processed
     print(f"Processing file: {filename}")
 
-    # Load the data
-    data = pd.read_csv(filename)
-
-    # Filter data to extract relevant columns
-    data = data[['launch_speed', 'launch_angle', 'events']]
+    # Load only the relevant columns (from the parquet cache after the first run)
+    data = load_batted_balls(filename, ['launch_speed', 'launch_angle', 'events'])
 
     # Drop rows with missing values in 'launch_speed' or 'launch_angle'
     data = data.dropna(subset=['launch_speed', 'launch_angle'])
 
     # Convert the 'events' column to a binary target: 1 for 'home_run', 0 otherwise
-    data['result'] = data['events'].apply(lambda x: 1 if x == 'home_run' else 0)
+    data['result'] = data['events'].eq('home_run').astype(np.int8)  # Vectorized compare on the category codes
 
     # Extract features and target
     X = data[['launch_speed', 'launch_angle']].values  # Use launch speed and launch angle as features
@@ -21,29 +21,19 @@ $ python launchSpeedOnlyLinear.py all2024.csv
 """
 
 import sys
-import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error
+from launch_data import load_batted_balls
 
 # Setting to False disables plots
 display_plots = False
 
-def main(filename='all2024.csv'):
-    # Print the filename being processed
-    print(f"Processing file: {filename}")
-
-    # Load the data
-    data = pd.read_csv(filename)
-    # Filter data to extract relevant columns
-    data = data[['launch_speed', 'hit_distance_sc']]
-
-    # Drop rows with missing values in 'launch_speed' or 'hit_distance_sc'
-    data = data.dropna(subset=['launch_speed', 'hit_distance_sc'])
-
-    # Extract features (launch_speed) and target (hit_distance_sc)
-    X = data[['launch_speed']]  # Use launch speed as the only feature
-    y = data['hit_distance_sc']  # Target (hit distance)
+# Fit the linear regression on NumPy arrays of launch speed and hit distance and report the results
+def fit_speed_only(launch_speed, hit_distance):
+    X = launch_speed.reshape(-1, 1)  # Use launch speed as the only feature
+    y = hit_distance  # Target (hit distance)
 
     # Initialize and fit the linear regression model
     model = LinearRegression()
@@ -72,6 +62,17 @@ def main(filename='all2024.csv'):
         plt.legend()
         plt.show()
 
+def main(filename='all2024.csv'):
+    # Print the filename being processed
+    print(f"Processing file: {filename}")
+
+    # Load only the relevant columns (from the parquet cache after the first run) and drop rows with a missing
+    # value in any of them
+    data = load_batted_balls(filename, ['launch_speed', 'hit_distance_sc']).dropna()
+
+    # Extract features (launch_speed) and target (hit_distance_sc), then fit and report the model
+    fit_speed_only(data['launch_speed'].to_numpy(dtype=np.float64), data['hit_distance_sc'].to_numpy(dtype=np.float64))
+
 if __name__ == "__main__":
     filename = sys.argv[1] if len(sys.argv) > 1 else 'all2024.csv'
     main(filename)
\ No newline at end of file
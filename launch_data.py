@@ -0,0 +1,41 @@
+"""
+launch_data.py
+Homework 4: Shared Batted Ball Data Loader
+
+Author: Christopher Reid
+Course: 496 Sports Analytics, Fall 2024
+
+Loads the batted ball columns used by the Homework 4 regression scripts (launch*.py and launch_fit.py).
+The first run parses the CSV once for every column any of the scripts needs and caches it next to the CSV as a
+parquet file (e.g. 'all2024.csv' -> 'all2024.parquet'); later runs read just the requested columns from the
+parquet file instead of parsing the CSV again. The cache is rebuilt whenever the CSV is newer than it.
+
+Requirements:
+    - pandas
+    - pyarrow (install with `pip install pyarrow`)
+"""
+
+import os
+import pandas as pd
+
+# Every column used by any of the launch scripts, with the type it is read as
+BATTED_BALL_DTYPES = {
+    'launch_speed': 'float64',
+    'launch_angle': 'float64',
+    'hit_distance_sc': 'float64',
+    'events': 'category',
+}
+
+def load_batted_balls(filename, columns):
+    # Build the parquet cache from the CSV if it is missing or older than the CSV
+    cache_file = os.path.splitext(filename)[0] + '.parquet'
+    if not os.path.exists(cache_file) or os.path.getmtime(cache_file) < os.path.getmtime(filename):
+        header = pd.read_csv(filename, nrows=0).columns
+        cached_columns = [column for column in BATTED_BALL_DTYPES if column in header]
+        # Parse with the C engine and its default float conversion, as the scripts did before the cache, so every
+        # measurement keeps exactly the same bits (the pyarrow engine rounds some values differently)
+        data = pd.read_csv(filename, engine='c', usecols=cached_columns, dtype=BATTED_BALL_DTYPES)
+        data.to_parquet(cache_file, engine='pyarrow', compression='zstd', index=False)
+
+    # Decode only the requested columns from the cached file
+    return pd.read_parquet(cache_file, engine='pyarrow', columns=columns)
@@ -0,0 +1,68 @@
+"""
+launch_fit.py
+Homework 4: Predicting Batted Ball Distance (All Regression Models in One Run)
+
+Author: Christopher Reid
+Course: 496 Sports Analytics, Fall 2024
+
+This script runs the four batted ball distance regressions from Homework 4 in a single process:
+1. Linear regression on launch speed only (launchSpeedOnlyLinear.py)
+2. Polynomial regression on launch angle only (launchAngleOnlyPoly.py)
+3. Linear regression on launch speed and launch angle (launchDistLinear.py)
+4. Polynomial regression on launch speed and launch angle (launchDistPoly.py)
+
+The CSV file is parsed once for the union of the columns the models need, and each model is fit on the NumPy
+arrays of the rows where its own columns are present (the same rows its standalone script keeps), so the output
+of each model matches running its script on its own.
+
+Usage:
+1. Ensure the CSV file containing batted ball data (with columns: 'launch_speed', 'launch_angle', 'hit_distance_sc') is available.
+2. Run the script with the CSV filename as a command-line argument.
+3. If no filename is provided, 'all2024.csv' will be used as the default.
+4. The script will output the mean squared error and the regression coefficients of each model.
+
+Example command:
+$ python launch_fit.py all2024.csv
+"""
+
+import sys
+import numpy as np
+from launchSpeedOnlyLinear import fit_speed_only
+from launchAngleOnlyPoly import fit_angle_poly
+from launchDistLinear import fit_dist_linear
+from launchDistPoly import fit_dist_poly
+from launch_data import load_batted_balls
+
+def main(filename='all2024.csv'):
+    # Print the filename being processed
+    print(f"Processing file: {filename}")
+
+    # Load the columns used by any of the models once (from the parquet cache after the first run)
+    data = load_batted_balls(filename, ['launch_speed', 'launch_angle', 'hit_distance_sc'])
+    launch_speed = data['launch_speed'].to_numpy()
+    launch_angle = data['launch_angle'].to_numpy()
+    hit_distance = data['hit_distance_sc'].to_numpy()
+
+    # Rows with each measurement present; every model keeps the rows where all of its own columns are present
+    has_speed = ~np.isnan(launch_speed)
+    has_angle = ~np.isnan(launch_angle)
+    has_distance = ~np.isnan(hit_distance)
+
+    print("\n=== Launch Speed Only (Linear) ===")
+    rows = has_speed & has_distance
+    fit_speed_only(launch_speed[rows], hit_distance[rows])
+
+    print("\n=== Launch Angle Only (Polynomial) ===")
+    rows = has_angle & has_distance
+    fit_angle_poly(launch_angle[rows], hit_distance[rows])
+
+    rows = has_speed & has_angle & has_distance
+    print("\n=== Launch Speed and Launch Angle (Linear) ===")
+    fit_dist_linear(launch_speed[rows], launch_angle[rows], hit_distance[rows])
+
+    print("\n=== Launch Speed and Launch Angle (Polynomial) ===")
+    fit_dist_poly(launch_speed[rows], launch_angle[rows], hit_distance[rows])
+
+if __name__ == "__main__":
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'all2024.csv'
+    main(filename)
@@ -18,12 +18,15 @@ independent_vars = ['1B', '2B', '3B', 'HR', 'BB', 'HBP', 'SB', 'CS']
 X = data[independent_vars]
 y = data['R']
 
-# Add a column of ones to X for the intercept term (bias)
-X = np.column_stack([np.ones(X.shape[0]), X])
+# Add a column of ones to X for the intercept term (bias), as a float64 matrix
+X = np.column_stack([np.ones(X.shape[0]), X]).astype(np.float64)
+y = y.to_numpy(dtype=np.float64)
 
 # Perform the normal equation to compute the coefficients
-# beta = (X^T X)^(-1) X^T y
-beta = np.linalg.inv(X.T @ X) @ X.T @ y
+# (X^T X) beta = X^T y, solved directly (LU) instead of forming the inverse of X^T X
+XtX = X.T @ X
+Xty = X.T @ y
+beta = np.linalg.solve(XtX, Xty)
 
 # Print the coefficients
 print("Multiple Regression Model Coefficients:")
@@ -15,7 +15,7 @@ Usage:
     python nomentum.py <directory> <min_time_remaining> <yard_line> <max_score_diff> <possession_change_type>
 
 Command-line Parameters:
-    - directory: The directory containing play-by-play CSV files.
+    - directory: The directory containing play-by-play CSV or parquet files (e.g., createPBP.py output).
     - min_time_remaining: Minimum time remaining in the half for a drive to be considered (in seconds).
     - yard_line: Yard line threshold (distance from the end zone for the team with possession).
     - max_score_diff: Maximum score differential for a drive to be considered.
@@ -31,17 +31,66 @@ Date: [Date]
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+import pyarrow.parquet as pq
+
+# The only play-by-play columns filter_drives and analyze_drive_results use
+DRIVE_COLUMNS = [
+    'play_id', 'drive_play_id_started', 'half_seconds_remaining', 'yardline_100',
+    'score_differential', 'drive_start_transition', 'fixed_drive_result'
+]
+
+def read_play_by_play_file(file_path):
+    """
+    Reads the drive columns of one CSV (with the multi-threaded pyarrow parser) or parquet play-by-play file.
+    Returns None for a file without all of the drive columns (e.g. createCSV.py's win probability CSVs, which share
+    the NFLCSV directory); none of its plays could pass filter_drives anyway.
+    """
+    if file_path.endswith(".csv"):
+        header = pd.read_csv(file_path, nrows=0).columns
+    else:
+        header = pq.read_schema(file_path).names
+    if not set(DRIVE_COLUMNS).issubset(header):
+        return None
+
+    if file_path.endswith(".csv"):
+        return pd.read_csv(file_path, engine='pyarrow', usecols=DRIVE_COLUMNS)
+    return pd.read_parquet(file_path, engine='pyarrow', columns=DRIVE_COLUMNS)
+
+def list_play_by_play_files(directory):
+    """
+    Lists the game files in the directory, one per game: when a game has both an older createPBP CSV and a newer
+    parquet file ('2014_1001.csv' and '2014_1001.parquet'), only the parquet file is read so no drive is counted twice.
+    """
+    files_by_game = {}
+    for filename in sorted(os.listdir(directory)):
+        game, extension = os.path.splitext(filename)
+        if extension == ".parquet" or (extension == ".csv" and game not in files_by_game):
+            files_by_game[game] = os.path.join(directory, filename)
+    return list(files_by_game.values())
 
 def load_play_by_play_files(directory):
-    """Loads all CSV files from the specified directory and concatenates them into a single DataFrame."""
-    all_data = []
-    for filename in os.listdir(directory):
-        if filename.endswith(".csv"):
-            file_path = os.path.join(directory, filename)
-            game_data = pd.read_csv(file_path)
-            all_data.append(game_data)
-    return pd.concat(all_data, ignore_index=True)
+    """
+    Loads the CSV and parquet game files from the specified directory and concatenates them into a single DataFrame.
+    The combined drive columns are cached as '<directory>_drives.parquet' next to the directory and reused for as
+    long as no game file (and no change to the directory listing) is newer than the cache.
+    """
+    file_paths = list_play_by_play_files(directory)
+
+    # Reuse the consolidated cache unless a game file was written (or one was added or removed) after it
+    cache_file = os.path.normpath(directory) + "_drives.parquet"
+    newest_change = max([os.path.getmtime(directory), *map(os.path.getmtime, file_paths)])
+    if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= newest_change:
+        return pd.read_parquet(cache_file, engine='pyarrow')
+
+    # Read the game files in parallel threads (pyarrow releases the GIL while parsing); map keeps directory order
+    with ThreadPoolExecutor() as executor:
+        all_data = [game_data for game_data in executor.map(read_play_by_play_file, file_paths)
+                    if game_data is not None]
+    data = pd.concat(all_data, ignore_index=True) if all_data else pd.DataFrame(columns=DRIVE_COLUMNS)
+    data.to_parquet(cache_file, engine='pyarrow', compression='zstd', index=False)
+    return data
 
 
 def filter_drives(data, min_time, yard_line, max_score_diff, possession_change_type):
@@ -53,14 +102,15 @@ def filter_drives(data, min_time, yard_line, max_score_diff, possession_change_t
     - Drive start method matches possession_change_type (e.g., "PUNT")
     - Drive start identified by play_id == drive_play_id_started
     """
-    # Filter drives based on specified criteria, considering only drive start rows
-    filtered_data = data[
-        (data['play_id'] == data['drive_play_id_started']) &  # Identifies drive starts
-        (data['half_seconds_remaining'] >= min_time) &
-        (data['yardline_100'] >= yard_line) &
-        (data['score_differential'] <= max_score_diff) &
-        (data['drive_start_transition'] == possession_change_type)
-    ]
+    # Filter drives based on specified criteria, considering only drive start rows. The mask starts from the most
+    # selective test (drive starts) and each remaining test on the NumPy arrays is folded into it in place, instead
+    # of building a boolean Series per condition and per '&'
+    mask = data['play_id'].to_numpy() == data['drive_play_id_started'].to_numpy()  # Identifies drive starts
+    mask &= data['drive_start_transition'].eq(possession_change_type).to_numpy()
+    mask &= data['half_seconds_remaining'].to_numpy() >= min_time
+    mask &= data['yardline_100'].to_numpy() >= yard_line
+    mask &= data['score_differential'].to_numpy() <= max_score_diff
+    filtered_data = data[mask]
     return filtered_data
 
 
@@ -69,18 +119,13 @@ def analyze_drive_results(filtered_data):
     Analyzes the results of each considered drive and calculates the frequency and percentage
     of each unique result.
     """
-    # Count each drive result
-    results = filtered_data['fixed_drive_result'].value_counts()
+    # Count each drive result, ordered alphabetically by drive result (value_counts' own sort by count is skipped)
+    results = filtered_data['fixed_drive_result'].value_counts(sort=False).sort_index()
     total_drives = results.sum()
 
-    # Prepare a sorted list of results with counts and percentages
-    result_percentages = [
-        (result, count, (count / total_drives) * 100)
-        for result, count in results.items()
-    ]
-
-    # Sort alphabetically by drive result
-    result_percentages.sort(key=lambda x: x[0])
+    # Percentages for all results in one vectorized division, zipped into (result, count, percentage) rows
+    percentages = results / total_drives * 100
+    result_percentages = list(zip(results.index, results.to_numpy(), percentages.to_numpy()))
 
     return result_percentages, total_drives
 
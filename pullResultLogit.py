@@ -24,87 +24,90 @@ $ python pullResultLogit.py ./relative_directory_path
 """
 
 import pandas as pd
+import numpy as np
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 
-# Helper function to determine the number of bases earned from the 'events' field
-def get_total_bases(event):
-    if event == 'single':
-        return 1
-    elif event == 'double':
-        return 2
-    elif event == 'triple':
-        return 3
-    elif event == 'home_run':
-        return 4
-    else:
-        return 0  # For events like field_out, ground_out, etc.
+# Number of bases earned for each hit in the 'events' field (every other event, e.g. field_out, earns 0)
+TOTAL_BASES = {'single': 1, 'double': 2, 'triple': 3, 'home_run': 4}
+
+# The only Statcast columns the OPS calculation uses, both low-cardinality strings read as categoricals
+STATCAST_DTYPES = {'events': 'category', 'stand': 'category'}
+
+# Function to load just the needed columns of a Statcast CSV (the parser skips every other column)
+def load_statcast_csv(filepath):
+    return pd.read_csv(filepath, usecols=list(STATCAST_DTYPES), dtype=STATCAST_DTYPES)
 
 # Function to compute OBP (On-base Percentage)
-def calculate_obp(data):
-    hits = data['hits'].sum()
-    plate_appearances = data.shape[0]  # Each row is one plate appearance
+def calculate_obp(hits, plate_appearances):
     return hits / plate_appearances if plate_appearances > 0 else 0
 
 # Function to compute SLG (Slugging Percentage)
-def calculate_slg(data):
-    total_bases = data['total_bases'].sum()
-    plate_appearances = data.shape[0]
+def calculate_slg(total_bases, plate_appearances):
     return total_bases / plate_appearances if plate_appearances > 0 else 0
 
-# Function to compute OPS (OBP + SLG)
-def calculate_ops(data):
-    obp = calculate_obp(data)
-    slg = calculate_slg(data)
+# Function to compute OPS (OBP + SLG) from the total bases of a group of plate appearances (one element each)
+def calculate_ops(total_bases):
+    plate_appearances = total_bases.size
+    obp = calculate_obp(np.count_nonzero(total_bases), plate_appearances)  # A hit is any event earning bases
+    slg = calculate_slg(total_bases.sum(), plate_appearances)
     return obp + slg
 
-# Function to parse events and add 'hits' and 'total_bases' columns
+# Function to parse events into a NumPy array of the total bases earned on each plate appearance
 def process_data(data):
-    # Determine if the event was a hit and the corresponding total bases
-    data['hits'] = data['events'].apply(lambda x: 1 if x in ['single', 'double', 'triple', 'home_run'] else 0)
-    data['total_bases'] = data['events'].apply(get_total_bases)
-    return data
-
-# Function to calculate and print OPS for all, left-handed, and right-handed hitters
-def compute_and_print_ops(data, filename):
-    # Parse the data to add hits and total_bases columns
-    data = process_data(data)
+    # 'events' is categorical, so look up the bases once per distinct event and gather them by category code;
+    # the trailing 0 is what the -1 code of a missing event picks up
+    events = data['events'].cat
+    bases_by_code = np.array([TOTAL_BASES.get(event, 0) for event in events.categories] + [0], dtype=np.int8)
+    return bases_by_code[events.codes.to_numpy()]
+
+# Function to calculate OPS for all, left-handed, and right-handed hitters
+def compute_ops(data):
+    # Parse the events into total bases per plate appearance
+    total_bases = process_data(data)
+
+    # Split by batter stance with boolean masks ('stand' refers to batter stance: L for left, R for right)
+    ops_all = calculate_ops(total_bases)
+    ops_lefties = calculate_ops(total_bases[(data['stand'] == 'L').to_numpy()])
+    ops_righties = calculate_ops(total_bases[(data['stand'] == 'R').to_numpy()])
+    return ops_all, ops_lefties, ops_righties
+
+# Function to load one CSV file and calculate its OPS values (run in a worker process for directory input)
+def compute_file_ops(filepath):
+    return compute_ops(load_statcast_csv(filepath))
+
+# Function to print OPS for all, left-handed, and right-handed hitters
+def print_ops(ops, filename):
+    ops_all, ops_lefties, ops_righties = ops
 
     print(f"--- OPS Results for {filename} ---")
-
-    # OPS for all hitters
-    ops_all = calculate_ops(data)
     print(f"OPS for all hitters: {ops_all:.3f}")
-
-    # OPS for left-handed hitters
-    left_handed = data[data['stand'] == 'L']  # 'stand' refers to batter stance (L for left, R for right)
-    ops_lefties = calculate_ops(left_handed)
     print(f"OPS for left-handed hitters: {ops_lefties:.3f}")
-
-    # OPS for right-handed hitters
-    right_handed = data[data['stand'] == 'R']
-    ops_righties = calculate_ops(right_handed)
     print(f"OPS for right-handed hitters: {ops_righties:.3f}")
 
-# Alternative main function that processes all CSV files in the same directory as the Python script
-def main_directory():
-    # Get the current directory where the script is located
-    directory_path = os.getcwd()
+# Function to calculate and print OPS for all, left-handed, and right-handed hitters
+def compute_and_print_ops(data, filename):
+    print_ops(compute_ops(data), filename)
+
+# Alternative main function that processes all CSV files in a directory (the current directory by default)
+def main_directory(directory_path=None):
+    if directory_path is None:
+        directory_path = os.getcwd()
 
     # Print the directory being used
     print(f"Processing all CSV files in directory: {directory_path}")
 
-    # Iterate through all files in the current directory
-    for filename in os.listdir(directory_path):
-        if filename.endswith(".csv"):
-            filepath = os.path.join(directory_path, filename)
+    # Each file is independent, so load them and compute their OPS values in parallel worker processes;
+    # map returns the results in directory order and they are printed here as they arrive
+    filenames = [filename for filename in os.listdir(directory_path) if filename.endswith(".csv")]
+    filepaths = [os.path.join(directory_path, filename) for filename in filenames]
+    with ProcessPoolExecutor() as executor:
+        for filename, filepath, ops in zip(filenames, filepaths, executor.map(compute_file_ops, filepaths)):
             print(f"\nProcessing file: {filepath}")
 
-            # Load the data from the CSV file
-            data = pd.read_csv(filepath)
-
-            # Compute and print the OPS values with better labeling
-            compute_and_print_ops(data, filename)
+            # Print the OPS values with better labeling
+            print_ops(ops, filename)
 
 # Original main function for single CSV file input
 def main_single_file():
@@ -123,7 +126,7 @@ def main_single_file():
     else:
         # Process the single file
         print(f"Processing file: {path}")
-        data = pd.read_csv(path)
+        data = load_statcast_csv(path)
         compute_and_print_ops(data, path)
 
 if __name__ == "__main__":
@@ -1,111 +1,104 @@
 import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
-from collections import defaultdict
 
-# Step 1: Initialize an empty dictionary to store the data for each team
-teams_data = defaultdict(list)
-
-# Step 2: Read the file and parse the data
+# Step 1: Read the game log with the multi-threaded pyarrow parser, keeping only the team and score fields
 filename = 'gl2023.txt'
-
-with open(filename, 'r') as file:
-    for line in file:
-        # Split each line by commas to get the fields
-        fields = line.strip().split(',')
-
-        # Extract relevant fields
-        visiting_team = fields[3]
-        home_team = fields[6]
-        visiting_team_runs = int(fields[9])
-        home_team_runs = int(fields[10])
-
-        # Store runs scored by the visiting team and the home team
-        teams_data[visiting_team].append(visiting_team_runs)
-        teams_data[home_team].append(home_team_runs)
-
-# Step 3: Calculate required statistics for each team
-teams_stats = []
-
-for team, runs in teams_data.items():
-    avg_runs = np.mean(runs)
-    std_dev_runs = np.std(runs)
-    games_less_than_2 = sum(1 for run in runs if run < 2)
-    games_less_than_3 = sum(1 for run in runs if run < 3)
-
-    teams_stats.append((team, avg_runs, std_dev_runs, games_less_than_2, games_less_than_3))
+games = pd.read_csv(filename, engine='pyarrow', header=None, usecols=[3, 6, 9, 10],
+                    names=['visiting_team', 'home_team', 'visiting_team_runs', 'home_team_runs'],
+                    dtype={'visiting_team_runs': np.int16, 'home_team_runs': np.int16})
+
+# Step 2: Reshape to one row per team per game, visiting team first, so teams keep their game-log order
+teams_data = pd.DataFrame({
+    'team': games[['visiting_team', 'home_team']].to_numpy().ravel(),
+    'runs': games[['visiting_team_runs', 'home_team_runs']].to_numpy().ravel(),
+})
+
+# Step 3: Calculate required statistics for each team in one grouped pass over the runs
+teams_data['less_than_2'] = teams_data['runs'] < 2
+teams_data['less_than_3'] = teams_data['runs'] < 3
+grouped = teams_data.groupby('team', sort=False)
+teams_stats = grouped.agg(avg_runs=('runs', 'mean'), games_less_than_2=('less_than_2', 'sum'),
+                          games_less_than_3=('less_than_3', 'sum'))
+teams_stats.insert(1, 'std_dev_runs', grouped['runs'].std(ddof=0))  # Population std dev, as np.std computes
 
 # Step 4: Sort teams by average runs scored per game
-teams_stats.sort(key=lambda x: x[1], reverse=True)
+teams_stats = teams_stats.sort_values('avg_runs', ascending=False, kind='stable')
 
 # Step 5: Print the results in the specified format
-for team, avg_runs, std_dev_runs, games_less_than_2, games_less_than_3 in teams_stats:
+for team, avg_runs, std_dev_runs, games_less_than_2, games_less_than_3 in teams_stats.itertuples():
     print(f"{team}, avg {avg_runs:.2f}, std dev {std_dev_runs:.2f}, <=2: {games_less_than_2}, <=3: {games_less_than_3}")
 
 # Step 6: Prepare data for plotting
-avg_runs_list = [x[1] for x in teams_stats]
-games_less_than_2_list = [x[3] for x in teams_stats]
-games_less_than_3_list = [x[4] for x in teams_stats]
-std_dev_runs_list = [x[2] for x in teams_stats]
-teams = [x[0] for x in teams_stats]
+avg_runs_list = teams_stats['avg_runs'].to_numpy()
+games_less_than_2_list = teams_stats['games_less_than_2'].to_numpy()
+games_less_than_3_list = teams_stats['games_less_than_3'].to_numpy()
+std_dev_runs_list = teams_stats['std_dev_runs'].to_numpy()
+teams = teams_stats.index.to_list()
+
+# Fit the three trend lines and correlation coefficients against average runs in one call each
+# (column i of trend_coefs is the slope and intercept for plot i)
+y_series = np.column_stack([games_less_than_3_list, games_less_than_2_list, std_dev_runs_list])
+trend_coefs = np.polyfit(avg_runs_list, y_series, 1)
+corr_coefs = np.corrcoef(avg_runs_list, y_series, rowvar=False)[0, 1:]
+
+# Function to label each team's point on a subplot
+def annotate_teams(ax, xs, ys, labels):
+    for x, y, label in zip(xs, ys, labels):
+        ax.annotate(label, (x, y), fontsize=8, ha='right')
 
 # Step 7: Plotting the data
 plt.figure(figsize=(18, 6))
 
 # Plot 1: Avg Runs vs Games with < 3 Runs
-plt.subplot(1, 3, 1)
+ax = plt.subplot(1, 3, 1)
 plt.scatter(avg_runs_list, games_less_than_3_list, color='blue', label='Data Points')
 # Add trend line
-z = np.polyfit(avg_runs_list, games_less_than_3_list, 1)
-p = np.poly1d(z)
+p = np.poly1d(trend_coefs[:, 0])
 plt.plot(avg_runs_list, p(avg_runs_list), color='blue', linestyle='dashed', label='Trend Line')
 # Calculate and display correlation coefficient
-corr_coef = np.corrcoef(avg_runs_list, games_less_than_3_list)[0, 1]
-plt.text(1, 1.05, f'Corr Coef: {corr_coef:.2f}', transform=plt.gca().transAxes, fontsize=10, verticalalignment='top',
+corr_coef = corr_coefs[0]
+plt.text(1, 1.05, f'Corr Coef: {corr_coef:.2f}', transform=ax.transAxes, fontsize=10, verticalalignment='top',
          horizontalalignment='right')
 plt.title('Avg Runs vs Games with < 3 Runs')
 plt.xlabel('Average Runs Scored')
 plt.ylabel('Games with < 3 Runs')
 # Add team annotations
-for i, team in enumerate(teams):
-    plt.text(avg_runs_list[i], games_less_than_3_list[i], team, fontsize=8, ha='right')
+annotate_teams(ax, avg_runs_list, games_less_than_3_list, teams)
 plt.legend(loc='upper right')
 
 # Plot 2: Avg Runs vs Games with < 2 Runs
-plt.subplot(1, 3, 2)
+ax = plt.subplot(1, 3, 2)
 plt.scatter(avg_runs_list, games_less_than_2_list, color='green', label='Data Points')
 # Add trend line
-z = np.polyfit(avg_runs_list, games_less_than_2_list, 1)
-p = np.poly1d(z)
+p = np.poly1d(trend_coefs[:, 1])
 plt.plot(avg_runs_list, p(avg_runs_list), color='green', linestyle='dashed', label='Trend Line')
 # Calculate and display correlation coefficient
-corr_coef = np.corrcoef(avg_runs_list, games_less_than_2_list)[0, 1]
-plt.text(1, 1.05, f'Corr Coef: {corr_coef:.2f}', transform=plt.gca().transAxes, fontsize=10, verticalalignment='top',
+corr_coef = corr_coefs[1]
+plt.text(1, 1.05, f'Corr Coef: {corr_coef:.2f}', transform=ax.transAxes, fontsize=10, verticalalignment='top',
          horizontalalignment='right')
 plt.title('Avg Runs vs Games with < 2 Runs')
 plt.xlabel('Average Runs Scored')
 plt.ylabel('Games with < 2 Runs')
 # Add team annotations
-for i, team in enumerate(teams):
-    plt.text(avg_runs_list[i], games_less_than_2_list[i], team, fontsize=8, ha='right')
+annotate_teams(ax, avg_runs_list, games_less_than_2_list, teams)
 plt.legend(loc='upper right')
 
 # Plot 3: Avg Runs vs Std Dev of Runs Scored
-plt.subplot(1, 3, 3)
+ax = plt.subplot(1, 3, 3)
 plt.scatter(avg_runs_list, std_dev_runs_list, color='red', label='Data Points')
 # Add trend line
-z = np.polyfit(avg_runs_list, std_dev_runs_list, 1)
-p = np.poly1d(z)
+p = np.poly1d(trend_coefs[:, 2])
 plt.plot(avg_runs_list, p(avg_runs_list), color='red', linestyle='dashed', label='Trend Line')
 # Calculate and display correlation coefficient
-corr_coef = np.corrcoef(avg_runs_list, std_dev_runs_list)[0, 1]
-plt.text(1, 1.05, f'Corr Coef: {corr_coef:.2f}', transform=plt.gca().transAxes, fontsize=10, verticalalignment='top',
+corr_coef = corr_coefs[2]
+plt.text(1, 1.05, f'Corr Coef: {corr_coef:.2f}', transform=ax.transAxes, fontsize=10, verticalalignment='top',
          horizontalalignment='right')
 plt.title('Avg Runs vs Std Dev of Runs Scored')
 plt.xlabel('Average Runs Scored')
 plt.ylabel('Standard Deviation of Runs Scored')
 # Add team annotations
-for i, team in enumerate(teams):
-    plt.text(avg_runs_list[i], std_dev_runs_list[i], team, fontsize=8, ha='right')
+annotate_teams(ax, avg_runs_list, std_dev_runs_list, teams)
 plt.legend(loc='upper right')
 
 # Show the plots
@@ -23,8 +23,11 @@ Note that for simplicity, you should assume the following:
 """
 
 import pandas as pd
+import numpy as np
 import os
 import glob
+import re
+from concurrent.futures import ThreadPoolExecutor
 
 
 def write_to_file(filename, content):
@@ -37,6 +40,39 @@ def write_to_file(filename, content):
         # Adding more information to debug
         print(f"Content to write: {content[:500]}...")  # Only show first 500 characters for debugging
 
+# The only play-by-play columns the bunt analysis uses
+PLAY_BY_PLAY_COLUMNS = ['inning', 'outs', 'runners', 'description']
+
+# Outcome patterns shared by the bunt analyses, precompiled once and matched against the lowercased descriptions
+BUNT_OUTCOME_PATTERNS = {
+    'missed': re.compile(r'missed|foul|strikeout'),
+    'unsuccessful_sacrifice': re.compile(r"forceout|fielder's choice|double play"),
+    'successful_sacrifice': re.compile(r'groundout.*sacrifice|advances'),
+    'bunt_hit': re.compile(r'single|bunt hit|safe'),
+    'late_successful': re.compile(r'sacrifice|groundout'),
+    'late_unsuccessful': re.compile(r'missed|foul|unsuccessful'),
+    'late_bunt_hit': re.compile(r'single|bunt hit'),
+}
+
+# Parquet cache of those columns for every CSV in 'Files', kept next to the directory
+PLAY_BY_PLAY_CACHE = os.path.normpath('Files') + '_play_by_play.parquet'
+
+# Function to read the bunt analysis columns of one play-by-play CSV with the multi-threaded pyarrow parser
+# (the pyarrow engine needs an explicit column list, so the header is read first to skip absent columns)
+def read_play_by_play_file(file):
+    header = pd.read_csv(file, nrows=0).columns
+    return pd.read_csv(file, engine='pyarrow', usecols=[col for col in PLAY_BY_PLAY_COLUMNS if col in header])
+
+# Function to save the combined play-by-play columns as the parquet cache for later runs
+def cache_play_by_play_data(all_data):
+    try:
+        all_data.to_parquet(PLAY_BY_PLAY_CACHE, engine='pyarrow', compression='zstd', index=False)
+    except (OSError, TypeError, ValueError) as e:
+        # e.g. a column read as numbers from some files and as text from others has no single parquet type
+        if os.path.exists(PLAY_BY_PLAY_CACHE):
+            os.remove(PLAY_BY_PLAY_CACHE)
+        print(f"Could not cache play-by-play data: {e}")
+
 # Function to load and aggregate data from all CSV files in the 'Files' directory with error handling
 def load_all_play_by_play_data():
     print("\n--- Loading and Aggregating Play-by-Play Data ---")
@@ -46,7 +82,20 @@ def load_all_play_by_play_data():
             print("No CSV files found in 'Files' directory.")
             return pd.DataFrame()  # Return an empty DataFrame if no files are found.
 
-        all_data = pd.concat([pd.read_csv(file, low_memory=False) for file in csv_files], ignore_index=True)
+        # Reuse the parquet cache unless a CSV was written (or one was added or removed) after it
+        newest_change = max([os.path.getmtime('Files'), *map(os.path.getmtime, csv_files)])
+        if os.path.exists(PLAY_BY_PLAY_CACHE) and os.path.getmtime(PLAY_BY_PLAY_CACHE) >= newest_change:
+            all_data = pd.read_parquet(PLAY_BY_PLAY_CACHE, engine='pyarrow')
+        else:
+            # Parse the files concurrently; pyarrow releases the GIL while it tokenizes
+            with ThreadPoolExecutor() as executor:
+                all_data = pd.concat(executor.map(read_play_by_play_file, csv_files), ignore_index=True)
+            cache_play_by_play_data(all_data)
+        # Lowercase the descriptions once for every analysis below, instead of each case-insensitive match
+        # lowercasing the column again
+        if 'description' in all_data.columns:
+            all_data['description_lower'] = all_data['description'].str.lower()
+
         log = "\n".join([f"Loaded file: {file}" for file in csv_files])
         write_to_file("play_by_play_log.txt", log)  # Writing log to a file
         return all_data
@@ -105,50 +154,51 @@ def categorize_and_log_bunt_situations(play_by_play_data):
     print("--- Categorizing and Logging Bunt Situations ---")
 
     # Required columns
-    required_columns = ['inning', 'outs', 'runners', 'description']
-    if not all(col in play_by_play_data.columns for col in required_columns):
+    if not all(col in play_by_play_data.columns for col in PLAY_BY_PLAY_COLUMNS):
         print("Missing one or more required columns in play-by-play data.")
         return 0, 0  # Return zero if columns are missing
 
     # Filter for bunt data (less than 2 outs and runners on base)
-    bunt_data = play_by_play_data.query(
-        'outs < 2 and runners != "---" and description.str.contains("Bunt", case=False, na=False)', engine='python')
+    # (vectorized boolean masks; "Bunt" is matched as a literal substring, skipping the regex engine)
+    is_bunt = play_by_play_data['description_lower'].str.contains('bunt', na=False, regex=False)
+    bunt_data = play_by_play_data.loc[(play_by_play_data['outs'] < 2) & play_by_play_data['runners'].ne('---') & is_bunt]
 
     if bunt_data.empty:
         print("No bunt data found.")
         return 0, 0  # Return zero if no bunt data
 
-    # Initialize counters and lists for uncategorized bunts
-    uncategorized_bunts = []
     total_bunts = len(bunt_data)
 
-    # Start logging specific bunt situations
-    log = ""
-    for _, row in bunt_data.iterrows():
-        description = row['description'].lower()
-        category = "Uncategorized"
-        if 'missed' in description or 'foul' in description or 'strikeout' in description:
-            category = "Missed Bunt"
-        elif 'forceout' in description or 'fielder\'s choice' in description or 'double play' in description:
-            category = "Unsuccessful Sacrifice"
-        elif ('groundout' in description and 'sacrifice' in description) or ('advances' in description):
-            category = "Successful Sacrifice"
-        elif 'single' in description or 'bunt hit' in description or 'safe' in description:
-            category = "Bunt Hit"
-        else:
-            uncategorized_bunts.append(row)
+    # Categorize every bunt at once from its lowercased description; np.select keeps the first matching category
+    description = bunt_data['description_lower']
 
-        log += f"Inning: {row['inning']}, Outs: {row['outs']}, Runners: {row['runners']}, Description: {row['description']}, Category: {category}\n"
+    def mentions(term):
+        return description.str.contains(term, regex=False)
+
+    category = np.select(
+        [mentions('missed') | mentions('foul') | mentions('strikeout'),
+         mentions('forceout') | mentions('fielder\'s choice') | mentions('double play'),
+         (mentions('groundout') & mentions('sacrifice')) | mentions('advances'),
+         mentions('single') | mentions('bunt hit') | mentions('safe')],
+        ["Missed Bunt", "Unsuccessful Sacrifice", "Successful Sacrifice", "Bunt Hit"],
+        default="Uncategorized")
+    uncategorized_bunts = bunt_data[category == "Uncategorized"]
+
+    # Start logging specific bunt situations, building every line with vectorized string concatenation and
+    # collecting the pieces in a list that is joined once
+    log_parts = list("Inning: " + bunt_data['inning'].astype(str) + ", Outs: " + bunt_data['outs'].astype(str) +
+                     ", Runners: " + bunt_data['runners'].astype(str) + ", Description: " + bunt_data['description'] +
+                     ", Category: " + category + "\n")
 
     # Log total bunt situations
-    log += f"\n--- Total Specific Bunt Situations: {total_bunts} ---\n"
+    log_parts.append(f"\n--- Total Specific Bunt Situations: {total_bunts} ---\n")
 
     # Handle uncategorized bunt situations
     total_uncategorized = len(uncategorized_bunts)
-    log += f"\n--- Total Uncategorized Bunt Situations: {total_uncategorized} ---\n"
+    log_parts.append(f"\n--- Total Uncategorized Bunt Situations: {total_uncategorized} ---\n")
 
     # Write specific bunt situations to file
-    write_to_file("bunt_situations.txt", log)
+    write_to_file("bunt_situations.txt", "".join(log_parts))
 
     # Handle categorizing uncategorized bunt situations
     categorize_uncategorized_bunts(uncategorized_bunts)
@@ -159,81 +209,74 @@ def categorize_and_log_bunt_situations(play_by_play_data):
 
     return total_bunts, total_uncategorized
 
+# Keyword identifying each kind of uncategorized bunt, in the order they are checked
+UNCATEGORIZED_BUNT_KEYWORDS = {
+    "errors_e1": 'reached on e1',
+    "popflies": 'popfly',
+    "lineouts": 'lineout',
+    "interference": 'interference',
+    "groundouts": 'groundout',
+    "doubles": 'double'
+}
+
 # Helper function to categorize and log uncategorized bunt situations
 def categorize_uncategorized_bunts(uncategorized_bunts):
-    log = ""
-
-    # Grouping by categories using a dictionary for simplicity
-    categories = {
-        "errors_e1": [],
-        "popflies": [],
-        "lineouts": [],
-        "interference": [],
-        "groundouts": [],
-        "doubles": []
-    }
-
-    # Categorizing each uncategorized bunt situation
-    for row in uncategorized_bunts:
-        description = row['description'].lower()
-        if 'reached on e1' in description:
-            categories['errors_e1'].append(row)
-        elif 'popfly' in description:
-            categories['popflies'].append(row)
-        elif 'lineout' in description:
-            categories['lineouts'].append(row)
-        elif 'interference' in description:
-            categories['interference'].append(row)
-        elif 'groundout' in description:
-            categories['groundouts'].append(row)
-        elif 'double' in description:
-            categories['doubles'].append(row)
-
-    # Writing categorized situations to the log with explanations
+    # Categorize every uncategorized bunt at once: np.select labels each row with the first category whose
+    # keyword appears in its lowercased description (rows matching none are left out of the log)
+    description = uncategorized_bunts['description_lower']
+    category = np.select(
+        [description.str.contains(keyword, regex=False) for keyword in UNCATEGORIZED_BUNT_KEYWORDS.values()],
+        list(UNCATEGORIZED_BUNT_KEYWORDS), default="")
+    categories = {name: uncategorized_bunts[category == name] for name in UNCATEGORIZED_BUNT_KEYWORDS}
+
+    # Writing categorized situations to the log with explanations, collecting the pieces in a list and joining
+    # them once (each category's lines are built with vectorized string concatenation)
     total_uncategorized = len(uncategorized_bunts)
-    log += f"\nTotal Uncategorized Bunt Situations: {total_uncategorized}\n"
+    log_parts = [f"\nTotal Uncategorized Bunt Situations: {total_uncategorized}\n"]
 
     for category, rows in categories.items():
-        if rows:
-            log += f"\nCategory: {category} ({len(rows)} situations)\n"
-            for row in rows:
-                log += f"Inning: {row['inning']}, Outs: {row['outs']}, Runners: {row['runners']}, Description: {row['description']}\n"
+        if not rows.empty:
+            log_parts.append(f"\nCategory: {category} ({len(rows)} situations)\n")
+            log_parts.extend("Inning: " + rows['inning'].astype(str) + ", Outs: " + rows['outs'].astype(str) +
+                             ", Runners: " + rows['runners'].astype(str) + ", Description: " + rows['description'] +
+                             "\n")
 
     # Write uncategorized bunt situations to file
-    write_to_file("uncategorized_bunt_situations.txt", log)
+    write_to_file("uncategorized_bunt_situations.txt", "".join(log_parts))
 
 # Function to calculate the bunt outcome probabilities (X, Y, Z, W)
 def calculate_bunt_probabilities_with_assumptions(play_by_play_data):
     print("\n--- Calculating Bunt Outcome Probabilities (X, Y, Z, W) ---")
 
-    bunt_data = play_by_play_data.query('outs < 2 and runners != "---"')
+    bunt_data = play_by_play_data.loc[(play_by_play_data['outs'] < 2) & play_by_play_data['runners'].ne('---')]
 
     if bunt_data.empty:
         print("No bunt data found.")
         return 0, 0, 0, 0, pd.DataFrame()
 
+    # Every outcome mask below is a plain case-sensitive scan of the lowercased descriptions
+    description = bunt_data['description_lower']
+
     # X: Missed bunt, foul bunt, or strikeout treated as first pitch miss
-    missed_bunts = bunt_data['description'].str.contains('missed|foul|strikeout', case=False, na=False).sum()
+    missed = description.str.contains(BUNT_OUTCOME_PATTERNS['missed'], na=False)
+    missed_bunts = missed.sum()
     total_bunts = len(bunt_data)
 
     X = missed_bunts / total_bunts if total_bunts else 0
 
-    # If bunt is in play (1 - X)
-    bunt_in_play_data = bunt_data[~bunt_data['description'].str.contains('missed|foul|strikeout', case=False, na=False)]
+    # If bunt is in play (1 - X), reusing the missed-bunt mask
+    in_play_description = description[~missed]
 
     # Y: Unsuccessful sacrifice (runner out at second, batter safe at first)
-    unsuccessful_sacrifice = bunt_in_play_data['description'].str.contains('forceout|fielder\'s choice|double play',
-                                                                           case=False,
-                                                                           na=False).sum()
+    unsuccessful_sacrifice = in_play_description.str.contains(BUNT_OUTCOME_PATTERNS['unsuccessful_sacrifice'], na=False).sum()
 
     # Z: Successful sacrifice (runner advances to second, batter out at first)
-    successful_sacrifice = bunt_in_play_data['description'].str.contains('groundout.*sacrifice|advances', case=False,
-                                                                         na=False).sum()
+    successful_sacrifice = in_play_description.str.contains(BUNT_OUTCOME_PATTERNS['successful_sacrifice'], na=False).sum()
 
     # W: Bunt hit (runner advances, batter safe at first)
-    bunt_hit = bunt_in_play_data['description'].str.contains('single|bunt hit|safe', case=False, na=False).sum()
+    bunt_hit = in_play_description.str.contains(BUNT_OUTCOME_PATTERNS['bunt_hit'], na=False).sum()
 
-    total_in_play_bunts = len(bunt_in_play_data)
+    total_in_play_bunts = len(in_play_description)
 
     Y = unsuccessful_sacrifice / total_in_play_bunts if total_in_play_bunts else 0
     Z = successful_sacrifice / total_in_play_bunts if total_in_play_bunts else 0
@@ -247,14 +290,15 @@ def optimistic_upper_bound_bunt_strategy(play_by_play_data):
     print("\n--- Calculating Optimistic Upper Bound for Bunt Strategy ---")
 
     # Set X to zero and calculate W based on bunts with no runners on base
-    no_runner_bunts = play_by_play_data.query('runners == "---" and description.str.contains("Bunt", case=False, na=False)')
+    is_bunt = play_by_play_data['description_lower'].str.contains('bunt', na=False, regex=False)
+    no_runner_bunts = play_by_play_data.loc[play_by_play_data['runners'].eq('---') & is_bunt]
     if no_runner_bunts.empty:
         print("No bunt data found with no runners on base.")
         return 0, 0, 0, 0
 
     # W is based on bunts with no runners on base
     total_no_runner_bunts = len(no_runner_bunts)
-    bunt_hits_no_runners = no_runner_bunts['description'].str.contains('single|bunt hit|safe', case=False, na=False).sum()
+    bunt_hits_no_runners = no_runner_bunts['description_lower'].str.contains(BUNT_OUTCOME_PATTERNS['bunt_hit'], na=False).sum()
 
     W = bunt_hits_no_runners / total_no_runner_bunts if total_no_runner_bunts else 0
     X = 0
@@ -282,17 +326,21 @@ def analyze_bunt_run_probability(play_by_play_data, run_expectancy_data):
     # Convert 'inning' column to numeric (integer), errors='coerce' will handle any invalid values
     play_by_play_data['inning_numeric'] = pd.to_numeric(play_by_play_data['inning'], errors='coerce')
 
+    # The bunt filter and the outcome masks below all scan the lowercased descriptions
+    description = play_by_play_data['description_lower']
+
     # Filter data for runners on 2nd or on 1st and 2nd, no outs, and 8th inning or later
-    relevant_bunt_data = play_by_play_data[(play_by_play_data['outs'] == 0) &
-                                           (play_by_play_data['runners'].str.contains('2|12')) &
-                                           (play_by_play_data['inning_numeric'] >= 8) &
-                                           play_by_play_data['description'].str.contains('Bunt', case=False, na=False)]
+    relevant_bunts = ((play_by_play_data['outs'] == 0) &
+                      (play_by_play_data['runners'].str.contains('2|12')) &
+                      (play_by_play_data['inning_numeric'] >= 8) &
+                      description.str.contains('bunt', regex=False, na=False))
+    relevant_description = description[relevant_bunts]
 
     # Initialize counters for each outcome in the late-inning bunt data
-    total_bunts = len(relevant_bunt_data)
-    successful_bunts = relevant_bunt_data['description'].str.contains('sacrifice|groundout', case=False, na=False).sum()
-    unsuccessful_bunts = relevant_bunt_data['description'].str.contains('missed|foul|unsuccessful', case=False, na=False).sum()
-    bunt_hits = relevant_bunt_data['description'].str.contains('single|bunt hit', case=False, na=False).sum()
+    total_bunts = len(relevant_description)
+    successful_bunts = relevant_description.str.contains(BUNT_OUTCOME_PATTERNS['late_successful'], na=False).sum()
+    unsuccessful_bunts = relevant_description.str.contains(BUNT_OUTCOME_PATTERNS['late_unsuccessful'], na=False).sum()
+    bunt_hits = relevant_description.str.contains(BUNT_OUTCOME_PATTERNS['late_bunt_hit'], na=False).sum()
 
     # Calculate probabilities of each outcome
     Y = unsuccessful_bunts / total_bunts if total_bunts > 0 else 0
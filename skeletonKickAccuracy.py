@@ -1,45 +1,33 @@
 import nfl_data_py as nfl
-from collections import defaultdict
-import math
+import numpy as np
 
-# Create a defaultdict for field goal success rates, indexed by distance range
-fgDict = defaultdict(lambda: (0, 0))
+# Field goals are grouped into 5-yard distance ranges from 20-24 up to 60-64 (kicks of 20-60 yards)
+MIN_DISTANCE, MAX_DISTANCE, GROUP_SIZE = 20, 60, 5
+NUM_GROUPS = MAX_DISTANCE // GROUP_SIZE - MIN_DISTANCE // GROUP_SIZE + 1
 
 # Import play-by-play data for multiple years
 years = [2021, 2022, 2023]  # Adjust the range according to your dataset
 pbp = nfl.import_pbp_data(years, downcast=True, cache=False, alt_path=None)
 
-# Iterate through every play to find field goal attempts and track success rates by distance range
-for index, row in pbp.iterrows():
-    playType = row.get("play_type", None)
-    if playType != "field_goal":  # Only consider field goals
-        continue
+# Keep only field goal attempts with a recorded result and a valid distance
+field_goals = pbp[pbp["play_type"].eq("field_goal") & pbp["field_goal_result"].isin(["made", "missed"]) &
+                  pbp["kick_distance"].notna()]
 
-    distance = row.get("kick_distance", None)
-    result = row.get("field_goal_result", None)
+# Convert distance to integer and filter reasonable range (e.g., 20-60 yards)
+distance = field_goals["kick_distance"].to_numpy().astype(np.int64)
+made = field_goals["field_goal_result"].eq("made").to_numpy()
+in_range = (distance >= MIN_DISTANCE) & (distance <= MAX_DISTANCE)
 
-    # Ensure valid distance and result data
-    if distance is None or math.isnan(distance) or result not in ["made", "missed"]:
-        continue
-
-    # Convert distance to integer and filter reasonable range (e.g., 20-60 yards)
-    distance = int(distance)
-    if distance < 20 or distance > 60:
-        continue
-
-    # Group by 5-yard distance increments (e.g., 20-24, 25-29, etc.)
-    distance_group = (distance // 5) * 5
-    oldTuple = fgDict[distance_group]
-
-    if result == "made":
-        fgDict[distance_group] = (oldTuple[0] + 1, oldTuple[1] + 1)
-    else:
-        fgDict[distance_group] = (oldTuple[0] + 1, oldTuple[1])
+# Group by 5-yard distance increments (e.g., 20-24, 25-29, etc.) and count attempts and makes per group
+group_index = distance[in_range] // GROUP_SIZE - MIN_DISTANCE // GROUP_SIZE
+attempts_by_group = np.bincount(group_index, minlength=NUM_GROUPS)
+makes_by_group = np.bincount(group_index[made[in_range]], minlength=NUM_GROUPS)
 
 # Output the results for each distance group
 print("Field Goal Accuracy by Distance Range")
-for distance_group, (attempts, makes) in sorted(fgDict.items()):
+for group, (attempts, makes) in enumerate(zip(attempts_by_group, makes_by_group)):
     if attempts > 0:  # Only display ranges with attempts
+        distance_group = MIN_DISTANCE + group * GROUP_SIZE
         accuracy = (makes / attempts) * 100
         print(
-            f"{distance_group}-{distance_group + 4}: {makes} made out of {attempts} attempts ({accuracy:.2f}% accuracy)")
\ No newline at end of file
+            f"{distance_group}-{distance_group + 4}: {makes} made out of {attempts} attempts ({accuracy:.2f}% accuracy)")
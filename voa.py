@@ -17,8 +17,8 @@ Data Source:
     Uses nfl_data_py to fetch NFL play-by-play data for the 2023 season.
 
 Key Functions:
-    - get_yardline_group(yardline): Determines the field position group based on yardline.
-    - calculate_success_points(play): Calculates success points for a play based on yards gained,
+    - get_yardline_group(yardline): Determines the field position group of each play based on yardline.
+    - calculate_success_points(plays): Calculates success points for every play at once based on yards gained,
       down, and turnover status.
 
 Output:
@@ -30,162 +30,111 @@ Requirements:
     - pandas
     - nfl_data_py
     - numpy
+    - pyarrow (for the local parquet copy of the play-by-play data)
 
 """
 
 import sys
+import os
 import pandas as pd
 import nfl_data_py as nfl
-from collections import defaultdict
 import numpy as np
 
 
-def get_yardline_group(yardline):
-    if 1 <= yardline <= 20:
-        return 1  # Deep in own territory
-    elif 21 <= yardline <= 39:
-        return 2  # Own territory
-    elif 40 <= yardline <= 59:
-        return 3  # Midfield
-    elif 60 <= yardline <= 79:
-        return 4  # Opponent territory
-    elif 80 <= yardline <= 99:
-        return 5  # Red zone
-    else:
-        return None  # Invalid yardline
-
-
-def calculate_success_points(play):
-    # Check for turnovers first
-    if play['interception'] == 1:
-        return -3
-    if play['fumble'] == 1:
-        return -1.5
-
-    yards_gained = play['yards_gained']
-    down = play['down']
-    ydstogo = play['ydstogo']
-
-    # Calculate base success points
-    # Handle special cases first
-    if yards_gained <= -3:
-        base_points = -1
-    elif yards_gained >= 40:
-        base_points = 5
-    elif 20 <= yards_gained <= 39:
-        base_points = 4
-    elif 11 <= yards_gained <= 19:
-        base_points = 3
-    elif yards_gained < -2:
-        base_points = -1
-    # Handle the smooth function case (-2 to 10 yards)
-    elif -2 <= yards_gained <= 10:
-        # Different thresholds based on down
-        if down == 1:
-            threshold = 0.40 * ydstogo
-        elif down == 2:
-            threshold = 0.65 * ydstogo
-        else:  # down 3 or 4
-            threshold = ydstogo
-
-        if yards_gained >= threshold:
-            # Linear interpolation between threshold (1 point) and 10 yards (3 points)
-            if yards_gained <= 10:
-                # Handle case where threshold equals 10
-                if threshold >= 10:
-                    base_points = 3  # Already reached the maximum for this range
-                else:
-                    base_points = 1 + 2 * (yards_gained - threshold) / (10 - threshold)
-            else:
-                base_points = 3
-        else:
-            # Linear interpolation between -2 (0 points) and threshold (1 point)
-            denominator = threshold + 2
-            if denominator == 0:  # Just in case, though this shouldn't happen
-                base_points = 0
-            else:
-                base_points = (yards_gained + 2) / denominator
-    else:
-        base_points = 0  # Fallback case
-
-    # Add touchdown bonus
-    if play['touchdown'] == 1:
-        base_points += 1
-
-    return base_points
-
-# Load play-by-play data
-pbp = nfl.import_pbp_data([2023], downcast=True, cache=False, alt_path=None)
-
-# Initialize dictionaries
-play_dict = defaultdict(list)
-success_averages = defaultdict(float)
-play_counts = defaultdict(int)
-team_success_diff = defaultdict(float)
-
-# First pass: Process each play and calculate success points
-for _, play in pbp.iterrows():
-    # Skip incomplete or buggy plays
-    if pd.isna(play['yardline_100']) or pd.isna(play['down']) or \
-       pd.isna(play['ydstogo']) or pd.isna(play['yards_gained']) or \
-       pd.isna(play['play_type']) or pd.isna(play['posteam']) or \
-       pd.isna(play['interception']) or pd.isna(play['fumble']) or \
-       pd.isna(play['touchdown']):
-        continue
-
-    # Get yardline group
-    yardline_group = get_yardline_group(play['yardline_100'])
+# Parquet copy of the downloaded play-by-play data, read on later runs instead of downloading it again. It holds only
+# REQUIRED_COLUMNS, so it is kept apart from the full-season 'pbp_<season>.parquet' caches of createCSV.py/createPBP.py
+PBP_CACHE_FILE = 'voa_pbp_2023.parquet'
 
-    # Skip if yardline group is None
-    if yardline_group is None:
-        continue
+# Columns every play needs; plays missing any of them are incomplete or buggy and are skipped
+REQUIRED_COLUMNS = ['yardline_100', 'down', 'ydstogo', 'yards_gained', 'play_type', 'posteam',
+                    'interception', 'fumble', 'touchdown']
 
-    # Get down and distance information
-    down = play['down']
-    ydstogo = play['ydstogo']
 
-    # Calculate success points for the play
-    success_points = calculate_success_points(play)
-
-    # Store play information in play_dict for the team and yardline group
-    team = play['posteam']
-    play_dict[(team, yardline_group)].append(success_points)
-
-    # Update play counts and cumulative success points for averages
-    play_counts[yardline_group] += 1
-    success_averages[yardline_group] += success_points
-
-# Calculate averages for each yardline group
-for yardline_group, total_points in success_averages.items():
-    if play_counts[yardline_group] > 0:
-        success_averages[yardline_group] = total_points / play_counts[yardline_group]
-
-# Second pass: Calculate team differences from the average
-for (team, yardline_group), points_list in play_dict.items():
-    # Calculate the team's average success points for this yardline group
-    team_average = sum(points_list) / len(points_list)
-
-    # Get the league average success points for this yardline group
-    league_average = success_averages[yardline_group]
+def get_yardline_group(yardline):
+    # 1: Deep in own territory (1-20), 2: Own territory (21-39), 3: Midfield (40-59),
+    # 4: Opponent territory (60-79), 5: Red zone (80-99); NaN for an invalid yardline
+    return pd.cut(yardline, bins=[0, 20, 39, 59, 79, 99], labels=[1, 2, 3, 4, 5])
+
+
+def calculate_success_points(plays):
+    yards_gained = plays['yards_gained'].to_numpy(dtype=np.float64)
+    down = plays['down'].to_numpy()
+    ydstogo = plays['ydstogo'].to_numpy(dtype=np.float64)
+
+    # Different thresholds based on down (down 3 or 4 needs the full distance)
+    threshold = np.select([down == 1, down == 2], [0.40 * ydstogo, 0.65 * ydstogo], default=ydstogo)
+
+    # Smooth function case (-2 to 10 yards): linear interpolation between -2 (0 points) and the threshold
+    # (1 point), then between the threshold and 10 yards (3 points, already reached when the threshold is 10+).
+    # Both sides are computed for every play, so silence the divisions np.where then discards
+    with np.errstate(divide='ignore', invalid='ignore'):
+        above_threshold = np.where(threshold >= 10, 3, 1 + 2 * (yards_gained - threshold) / (10 - threshold))
+        below_threshold = np.where(threshold + 2 == 0, 0, (yards_gained + 2) / (threshold + 2))
+    smooth_points = np.where(yards_gained >= threshold, above_threshold, below_threshold)
+
+    # Calculate base success points, handling the special cases first (np.select takes the first match)
+    base_points = np.select(
+        [yards_gained <= -3,
+         yards_gained >= 40,
+         (yards_gained >= 20) & (yards_gained <= 39),
+         (yards_gained >= 11) & (yards_gained <= 19),
+         yards_gained < -2,
+         (yards_gained >= -2) & (yards_gained <= 10)],
+        [-1, 5, 4, 3, -1, smooth_points],
+        default=0)  # Fallback case
 
-    # Calculate the differential and add it to the team's total
-    team_success_diff[team] += team_average - league_average
+    # Add touchdown bonus
+    base_points = base_points + (plays['touchdown'].to_numpy() == 1)
+
+    # Turnovers replace the yardage score entirely
+    return np.select([plays['interception'].to_numpy() == 1, plays['fumble'].to_numpy() == 1], [-3, -1.5],
+                     default=base_points)
+
+# Load play-by-play data, from the local parquet copy when an earlier run saved one
+if os.path.exists(PBP_CACHE_FILE):
+    pbp = pd.read_parquet(PBP_CACHE_FILE, engine='pyarrow', columns=REQUIRED_COLUMNS)
+else:
+    # Keep only the columns the analysis uses (a few hundred come back) before saving the copy
+    pbp = nfl.import_pbp_data([2023], downcast=True, cache=False, alt_path=None)[REQUIRED_COLUMNS]
+    pbp.to_parquet(PBP_CACHE_FILE, engine='pyarrow', compression='zstd', index=False)
+
+# Skip incomplete or buggy plays (one null-check pass over the required columns), then store the down and the
+# 0/1 turnover and touchdown flags as int8 so their comparisons don't run on floats, and the team as a categorical
+# so grouping by team works on its integer codes (yards and yardlines are already float32 from downcast=True)
+pbp = pbp.dropna(subset=REQUIRED_COLUMNS)
+pbp = pbp.astype({'down': np.int8, 'interception': np.int8, 'fumble': np.int8, 'touchdown': np.int8,
+                  'posteam': 'category'})
+
+# Calculate success points for every play, alongside its team and yardline group, then skip plays whose
+# yardline group is invalid
+plays = pd.DataFrame({
+    'posteam': pbp['posteam'],
+    'yardline_group': get_yardline_group(pbp['yardline_100']),
+    'success_points': calculate_success_points(pbp),
+}).dropna(subset=['yardline_group'])
+
+# League average success points and play counts for each yardline group
+league_groups = plays.groupby('yardline_group', observed=True)['success_points']
+success_averages = league_groups.mean()
+play_counts = league_groups.size()
+
+# Each team's average success points in each yardline group, minus the league average for that group,
+# summed into the team's total differential
+team_averages = plays.groupby(['posteam', 'yardline_group'], sort=False, observed=True)['success_points'].mean()
+team_differentials = team_averages.sub(success_averages, level='yardline_group')
+team_success_diff = team_differentials.groupby(level='posteam', sort=False).sum()
 
 # Output results sorted by success differential
-sorted_teams = sorted(team_success_diff.items(), key=lambda x: x[1], reverse=True)
+sorted_teams = team_success_diff.sort_values(ascending=False, kind='stable')
 print("\nTeam Success Point Differentials:")
 print("=" * 40)
 print(f"{'Team':<5} {'Differential':>15}")
 print("-" * 40)
-for team, diff in sorted_teams:
+for team, diff in sorted_teams.items():
     print(f"{team:<5} {diff:>15.2f}")
 
 # Optional: Print statistics about the groupings
 print("\nPlays per field position group:")
-group_counts = defaultdict(int)
-for key in play_counts:
-    yardline_group = key[0]
-    group_counts[yardline_group] += play_counts[key]
 
 print("\nField Position Groups:")
 print("1: Own 1-20  (Deep)")
@@ -194,5 +143,5 @@ print("3: 40-59     (Midfield)")
 print("4: 60-79     (Opponent territory)")
 print("5: 80-99     (Red zone)")
 print("\nPlay counts by group:")
-for group in sorted(group_counts.keys()):
-    print(f"Group {group}: {group_counts[group]} plays")
\ No newline at end of file
+for group, count in play_counts.items():
+    print(f"Group {group}: {count} plays")